@@ -0,0 +1,218 @@
+"""Benchmarks of the overhead of dmlx itself.
+
+Usage: `python -m benchmark [--output results.json] [--baseline baseline.json]`
+"""
+
+import json
+import platform
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from timeit import Timer
+
+import click
+
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from dmlx.component import Component, compile_locator, parse_locator  # noqa: E402
+from dmlx.experiment import Experiment  # noqa: E402
+from dmlx.property import component  # noqa: E402
+
+Case = Callable[[Path], Callable[[], object]]
+CASES: dict[str, Case] = {}
+
+
+def case(function: Case) -> Case:
+    CASES[function.__name__] = function
+    return function
+
+
+def run_experiment(experiment: Experiment, cli_args: list[str]) -> None:
+    assert experiment.command is not None
+    experiment.command.main(cli_args, standalone_mode=False)
+
+
+@case
+def declare_params(_work_dir: Path) -> Callable[[], object]:
+    def declare() -> None:
+        experiment = Experiment()
+        for index in range(200):
+            experiment.option(f"--param-{index}", type=int, default=index)
+
+        @experiment.main()
+        def main(**args) -> None: ...
+
+    return declare
+
+
+LONG_LOCATOR = "model.transformer:Model?" + ";".join(
+    f'param_{index} = {{"values": [{index}, {index + 1}], "name": "p{index}"}}'
+    for index in range(100)
+)
+
+
+@case
+def parse_locator_cold(_work_dir: Path) -> Callable[[], object]:
+    def parse() -> None:
+        compile_locator.cache_clear()
+        parse_locator(LONG_LOCATOR)
+
+    return parse
+
+
+@case
+def parse_locator_warm(_work_dir: Path) -> Callable[[], object]:
+    return lambda: parse_locator(LONG_LOCATOR)
+
+
+@case
+def parse_locator_uncached(_work_dir: Path) -> Callable[[], object]:
+    # Reference for the cases above: parsing without memoization.
+    def parse() -> None:
+        _path, _, params_str = LONG_LOCATOR.partition("?")
+        for param_str in params_str.split(";"):
+            key, value = param_str.split("=", 1)
+            json.loads(value)
+
+    return parse
+
+
+@case
+def parse_locator_scalars_warm(_work_dir: Path) -> Callable[[], object]:
+    locator = "model?" + ";".join(f"param_{index}={index}" for index in range(100))
+    return lambda: parse_locator(locator)
+
+
+@case
+def component_resolution(_work_dir: Path) -> Callable[[], object]:
+    model_component = Component("test_module.model", "Model")
+    return lambda: model_component("foo?threshold=0.5")
+
+
+@case
+def init_and_dump_meta(work_dir: Path) -> Callable[[], object]:
+    Experiment.BASE_DIR = work_dir / "init"
+
+    def init() -> None:
+        experiment = Experiment()
+
+        @experiment.main()
+        @click.option("--epochs", type=int, default=1)
+        def main(**args) -> None:
+            experiment.init()
+
+        run_experiment(experiment, [])
+
+    return init
+
+
+@case
+def load_many(work_dir: Path) -> Callable[[], object]:
+    Experiment.BASE_DIR = work_dir / "archives"
+    for index in range(500):
+        experiment = Experiment(f"{index // 50}/{index}")
+
+        @experiment.main()
+        @click.option("--index", type=int)
+        def main(**args) -> None:
+            experiment.init()
+
+        run_experiment(experiment, ["--index", str(index)])
+
+    return lambda: sum(1 for _ in Experiment.load_many("*/*"))
+
+
+@case
+def component_property_access(_work_dir: Path) -> Callable[[], object]:
+    class Approach:
+        model = component("model_locator", "test_module.model", "Model")
+        model_locator = "bar"
+
+    approach = Approach()
+
+    def access() -> None:
+        for _ in range(1000):
+            approach.model
+
+    return access
+
+
+def measure(
+    statement: Callable[[], object], repeat: int, min_time: float
+) -> dict[str, float]:
+    timer = Timer(statement)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [time / number for time in timer.repeat(repeat, number)]
+    return {"min": min(times), "median": median(times), "number": number}
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    regressions: list[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        click.echo(f"{name:32} {ratio:6.2f}x baseline{flag}")
+    return regressions
+
+
+@click.command()
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Result file.")
+@click.option("-b", "--baseline", type=click.Path(exists=True, dir_okay=False))
+@click.option("-t", "--tolerance", type=float, default=0.25, show_default=True)
+@click.option("-r", "--repeat", type=int, default=5, show_default=True)
+@click.option("--min-time", type=float, default=0.2, show_default=True)
+@click.option("-k", "--select", multiple=True, help="Only run the given cases.")
+def main(
+    output: str | None,
+    baseline: str | None,
+    tolerance: float,
+    repeat: int,
+    min_time: float,
+    select: tuple[str, ...],
+) -> None:
+    """Run dmlx overhead benchmarks and optionally compare against a baseline."""
+    results: dict[str, dict[str, float]] = {}
+    base_dir = Experiment.BASE_DIR
+    with TemporaryDirectory() as work_dir:
+        for name, create_statement in CASES.items():
+            if select and name not in select:
+                continue
+            try:
+                result = measure(
+                    create_statement(Path(work_dir, name)), repeat, min_time
+                )
+            finally:
+                Experiment.BASE_DIR = base_dir
+            results[name] = result
+            click.echo(f"{name:32} {result['median'] * 1e6:12.2f} us/op")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=4)
+
+    if baseline:
+        with open(baseline) as file:
+            regressions = compare(results, json.load(file)["results"], tolerance)
+        if regressions:
+            raise SystemExit(f"Regressions: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,20 @@
-from . import component as component
-from . import context as context
-from . import experiment as experiment
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import component as component
+    from . import context as context
+    from . import experiment as experiment
+
+# Submodules are imported lazily on first access to keep `import dmlx` cheap.
+SUBMODULES = ("component", "context", "experiment")
+
+
+def __getattr__(name: str) -> object:
+    if name in SUBMODULES:
+        return import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *SUBMODULES])
@@ -0,0 +1,199 @@
+import click
+
+
+@click.group()
+def cli() -> None:
+    """Command line tools of dmlx."""
+
+
+@cli.command()
+@click.argument("script", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-g",
+    "--grid",
+    multiple=True,
+    help="Parameter grid in JSON, e.g. '{\"--epochs\": [100, 500]}'.",
+)
+@click.option(
+    "-a",
+    "--arg-set",
+    multiple=True,
+    help="Command args of a single run, split like shell args.",
+)
+@click.option("-j", "--max-workers", type=int, help="Number of worker processes.")
+@click.option("-p", "--preload", multiple=True, help="Modules to import once.")
+@click.option("--base-dir", type=click.Path(file_okay=False), help="Archive dir.")
+@click.option("--no-pin-cpus", is_flag=True, help="Do not pin workers to CPUs.")
+@click.option(
+    "-s",
+    "--summary",
+    "summary_path",
+    type=click.Path(dir_okay=False),
+    default="sweep.json",
+    show_default=True,
+    help="Path to the summary file.",
+)
+def sweep(
+    script: str,
+    grid: tuple[str, ...],
+    arg_set: tuple[str, ...],
+    max_workers: int | None,
+    preload: tuple[str, ...],
+    base_dir: str | None,
+    no_pin_cpus: bool,
+    summary_path: str,
+) -> None:
+    """Run SCRIPT once per arg set on a local process pool."""
+    from .sweep import load_arg_sets
+    from .sweep import sweep as run_sweep
+
+    summary = run_sweep(
+        script,
+        load_arg_sets(grid, arg_set),
+        max_workers=max_workers,
+        preload=preload,
+        base_dir=base_dir,
+        pin_cpus=not no_pin_cpus,
+        summary_path=summary_path,
+    )
+    failed_count = sum(run["status"] != "succeeded" for run in summary["runs"])
+    click.echo(
+        f"{len(summary['runs']) - failed_count} succeeded, {failed_count} failed "
+        f"in {summary['duration']:.2f}s (summary: {summary_path})"
+    )
+    if failed_count:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("base_dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "-l",
+    "--layout",
+    type=click.Choice(["flat", "hash-prefix"]),
+    default="hash-prefix",
+    show_default=True,
+    help="Target layout.",
+)
+@click.option("--levels", type=int, default=2, show_default=True, help="Hash levels.")
+@click.option("--width", type=int, default=2, show_default=True, help="Hash width.")
+@click.option(
+    "-m", "--meta-file-path", help="Meta file path (default: meta.json or meta.bin)."
+)
+@click.option("-n", "--dry-run", is_flag=True, help="Only print planned moves.")
+def migrate(
+    base_dir: str,
+    layout: str,
+    levels: int,
+    width: int,
+    meta_file_path: str | None,
+    dry_run: bool,
+) -> None:
+    """Move archives under BASE_DIR into another directory layout."""
+    from .layout import FlatLayout, HashPrefixLayout
+    from .layout import migrate as run_migration
+
+    moves = run_migration(
+        base_dir,
+        FlatLayout() if layout == "flat" else HashPrefixLayout(levels, width),
+        meta_file_path=meta_file_path,
+        dry_run=dry_run,
+    )
+    for source, target in moves:
+        click.echo(f"{source} -> {target}")
+    click.echo(f"{'Planned' if dry_run else 'Moved'} {len(moves)} archive(s).")
+
+
+@cli.command("pack")
+@click.argument("base_dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "-p",
+    "--period-format",
+    default="%Y-%m",
+    show_default=True,
+    help="strftime format of birth times naming packs.",
+)
+@click.option(
+    "--min-age",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Seconds since the last modification before packing.",
+)
+@click.option(
+    "-m", "--meta-file-path", help="Meta file path (default: meta.json or meta.bin)."
+)
+@click.option("-n", "--dry-run", is_flag=True, help="Only print planned packs.")
+def pack_archives(
+    base_dir: str,
+    period_format: str,
+    min_age: float,
+    meta_file_path: str | None,
+    dry_run: bool,
+) -> None:
+    """Pack finished archives under BASE_DIR into one zip file per period."""
+    from .pack import pack
+
+    packed = pack(
+        base_dir,
+        meta_file_path=meta_file_path,
+        period_format=period_format,
+        min_age=min_age,
+        dry_run=dry_run,
+    )
+    for pack_name, names in packed.items():
+        for name in names:
+            click.echo(f"{name} -> {pack_name}")
+    count = sum(map(len, packed.values()))
+    click.echo(f"{'Planned' if dry_run else 'Packed'} {count} archive(s).")
+
+
+@cli.command()
+@click.argument("script", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default="dmlx.sock",
+    show_default=True,
+    help="Path to the Unix domain socket.",
+)
+@click.option("-p", "--preload", multiple=True, help="Modules to import once.")
+def serve(script: str, socket_path: str, preload: tuple[str, ...]) -> None:
+    """Serve runs of SCRIPT over a Unix domain socket."""
+    import signal
+
+    from .server import ExperimentServer
+
+    # Stop serving gracefully on SIGTERM as well.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with ExperimentServer(script, socket_path, preload) as server:
+        server.listen()
+        click.echo(f"Serving {server.script} on {socket_path}", err=True)
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+
+
+@cli.command(context_settings=dict(ignore_unknown_options=True))
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default="dmlx.sock",
+    show_default=True,
+    help="Path to the Unix domain socket.",
+)
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+def call(socket_path: str, args: tuple[str, ...]) -> None:
+    """Run the script served on a socket with ARGS."""
+    from .server import call as call_server
+
+    raise SystemExit(call_server(socket_path, args))
+
+
+if __name__ == "__main__":
+    cli()
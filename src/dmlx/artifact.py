@@ -0,0 +1,188 @@
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from hashlib import _Hash
+
+CHUNK_SIZE = 1 << 20
+# Attributes of files giving access to lower levels, through which data can be
+# written without passing through `HashingFile.write()`.
+UNHASHED_ACCESS_ATTRIBUTES = frozenset(("fileno", "raw", "buffer", "detach"))
+
+
+class HashingFile:
+    """A writable binary file that hashes data while it is written. (Other
+    attributes are forwarded to the underlying file. If the file is seeked or
+    truncated, or its file descriptor or raw stream is accessed, `rehash` is
+    set, and the digest will be computed from the whole file instead.)
+    """
+
+    file: BinaryIO
+    hash: "_Hash"
+    rehash: bool
+
+    def __init__(self, file: BinaryIO) -> None:
+        from hashlib import sha256
+
+        self.file = file
+        self.hash = sha256()
+        self.rehash = False
+
+    def __getattr__(self, name: str) -> Any:
+        if name in UNHASHED_ACCESS_ATTRIBUTES:
+            self.rehash = True
+        return getattr(self.file, name)
+
+    def __enter__(self) -> "HashingFile":
+        return self
+
+    def __exit__(self, _exception_type, _exception, _traceback) -> None:
+        self.file.close()
+
+    def write(self, data: Any) -> int:
+        self.hash.update(data)
+        return self.file.write(data)
+
+    def writelines(self, lines: Iterable[Any]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self.rehash = True
+        return self.file.seek(offset, whence)
+
+    def truncate(self, size: int | None = None) -> int:
+        self.rehash = True
+        return self.file.truncate(size)
+
+
+def hash_file(path: Path | str) -> str:
+    """Compute the SHA-256 hex digest of the file at `path`."""
+    from hashlib import sha256
+
+    digest = sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GarbageCollectionResult(NamedTuple):
+    removed_objects: int
+    freed_bytes: int
+
+
+class ArtifactStore:
+    """A content-addressed store of artifact files shared by experiments.
+    Stored objects are hard-linked into experiment directories, so identical
+    files are stored only once, and the hard link count of an object serves as
+    its reference count. (When hard-linking is impossible, e.g. across file
+    systems, objects are copied instead.)
+    """
+
+    root: Path
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def object_path(self, digest: str) -> Path:
+        """Get the path to the object with the given digest."""
+        return self.root / digest[:2] / digest[2:]
+
+    def __make_temp_path(self) -> Path:
+        temp_dir = self.root / "tmp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        return temp_dir / os.urandom(8).hex()
+
+    def __commit(self, temp_path: Path, digest: str) -> Path:
+        object_path = self.object_path(digest)
+        if object_path.exists():
+            temp_path.unlink()
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, object_path)
+        return object_path
+
+    def link(self, digest: str, target: Path | str) -> None:
+        """Link the object with the given digest to `target`, replacing
+        existing files there.
+        """
+        import shutil
+
+        object_path = self.object_path(digest)
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_target = target.with_name(f".{target.name}.{os.urandom(4).hex()}")
+        try:
+            os.link(object_path, temp_target)
+        except OSError:
+            shutil.copyfile(object_path, temp_target)
+        os.replace(temp_target, target)
+
+    @contextmanager
+    def open(self, target: Path | str) -> Iterator[HashingFile]:
+        """Open a binary file for writing an artifact that will be stored and
+        linked to `target` once the context exits without errors.
+        """
+        temp_path = self.__make_temp_path()
+        try:
+            with HashingFile(temp_path.open("xb")) as file:
+                yield file
+            digest = hash_file(temp_path) if file.rehash else file.hash.hexdigest()
+            self.__commit(temp_path, digest)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        self.link(digest, target)
+
+    def add(self, source: Path | str, target: Path | str | None = None) -> str:
+        """Store the file at `source` and link it to `target`. (If `target`
+        is omitted, `source` itself will be replaced by the link.)
+
+        Returns:
+            digest (str): The digest of the stored object.
+        """
+        import shutil
+
+        temp_path = self.__make_temp_path()
+        try:
+            with open(source, "rb") as source_file:
+                with HashingFile(temp_path.open("xb")) as file:
+                    shutil.copyfileobj(source_file, file, CHUNK_SIZE)
+            digest = file.hash.hexdigest()
+            self.__commit(temp_path, digest)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        self.link(digest, source if target is None else target)
+        return digest
+
+    def collect_garbage(self, temp_max_age: float = 86400.0) -> GarbageCollectionResult:
+        """Remove objects that are no longer linked by any experiment, as well
+        as temporary files older than `temp_max_age` seconds.
+
+        Returns:
+            result (GarbageCollectionResult): The number of removed objects
+                and freed bytes.
+        """
+        from time import time
+
+        removed_objects = 0
+        freed_bytes = 0
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.parent.name == "tmp":
+                if time() - stat.st_mtime > temp_max_age:
+                    path.unlink(missing_ok=True)
+            elif stat.st_nlink <= 1:
+                path.unlink(missing_ok=True)
+                removed_objects += 1
+                freed_bytes += stat.st_size
+        return GarbageCollectionResult(removed_objects, freed_bytes)
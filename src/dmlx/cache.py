@@ -0,0 +1,214 @@
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Generic, NamedTuple, TypeVar
+from weakref import ref
+
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class InstanceCache(Generic[T]):
+    """A cache keyed by instance identity. Instances are only weakly
+    referenced, so their entries are dropped as soon as they are garbage
+    collected, and at most `maxsize` entries are kept, evicting the least
+    recently cached ones. (Set `maxsize` to `None` for an unbounded cache.)
+    Hits are looked up without locking, so hit counts are approximate under
+    concurrent access.
+    """
+
+    maxsize: int | None
+
+    __entries: "OrderedDict[int, tuple[ref, T]]"
+    __lock: Lock
+    __pending_removals: list[tuple[int, ref]]
+    __hits: int
+    __misses: int
+
+    def __init__(self, maxsize: int | None = 128) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("Cache size cannot be negative!")
+        self.maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.__pending_removals = []
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        with self.__lock:
+            self.__purge()
+            return len(self.__entries)
+
+    def __purge(self) -> None:
+        # Drop entries of collected instances. (Must be called with the lock
+        # held.)
+        while self.__pending_removals:
+            key, instance_ref = self.__pending_removals.pop()
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] is instance_ref:
+                del self.__entries[key]
+
+    def get(self, instance: Any, compute: Callable[[Any], T]) -> T:
+        """Get the cached value of `instance`, or compute and cache it with
+        `compute(instance)` on miss.
+        """
+        key = id(instance)
+        entry = self.__entries.get(key)
+        if entry is not None and entry[0]() is instance:
+            self.__hits += 1
+            return entry[1]
+        with self.__lock:
+            self.__misses += 1
+
+        value = compute(instance)
+        if self.maxsize == 0:
+            return value
+
+        def remove(instance_ref: ref) -> None:
+            # The garbage collector may call this on a thread holding the lock,
+            # so the removal is deferred to `__purge()` (like what
+            # `WeakValueDictionary` does).
+            self.__pending_removals.append((key, instance_ref))
+
+        with self.__lock:
+            self.__purge()
+            self.__entries[key] = (ref(instance, remove), value)
+            self.__entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self.__entries) > self.maxsize:
+                    self.__entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, instance: object) -> bool:
+        """Drop the cached value of `instance`.
+
+        Returns:
+            dropped (bool): Whether there was a cached value.
+        """
+        with self.__lock:
+            self.__purge()
+            entry = self.__entries.get(id(instance))
+            if entry is None or entry[0]() is not instance:
+                return False
+            del self.__entries[id(instance)]
+            return True
+
+    def clear(self) -> None:
+        """Drop all cached values and reset statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__pending_removals.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def info(self) -> CacheInfo:
+        """Get cache statistics."""
+        with self.__lock:
+            self.__purge()
+            return CacheInfo(
+                self.__hits, self.__misses, self.maxsize, len(self.__entries)
+            )
+
+
+class DiskCache:
+    """A persistent cache of pickled objects stored in `directory`. Entries not
+    used for more than `max_age` seconds are evicted, and least recently used
+    entries are evicted when the total size exceeds `max_bytes`.
+    """
+
+    directory: Path
+    max_bytes: int | None
+    max_age: float | None
+
+    SUFFIX = ".pickle"
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Make an entry key from the given strings."""
+        from hashlib import sha256
+
+        digest = sha256()
+        for part in parts:
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str, create: Callable[[], T]) -> T:
+        """Get the cached object of `key`, or create and cache it with
+        `create()` on miss.
+        """
+        import pickle
+
+        from .writer import write_atomically
+
+        entry_path = self.directory / (key + self.SUFFIX)
+        try:
+            with entry_path.open("rb") as file:
+                value = pickle.load(file)
+        except Exception:
+            pass  # missing or unreadable entries are treated as misses
+        else:
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+            return value
+
+        value = create()
+        # (Entries get the default mode of new files, so that a cache directory
+        # can be shared according to the umask.)
+        write_atomically(
+            entry_path, lambda file: pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+        )
+        self.evict()
+        return value
+
+    def evict(self) -> None:
+        """Evict expired entries and least recently used entries according to
+        `max_age` and `max_bytes`.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        for entry_path in self.directory.glob("*" + self.SUFFIX):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        entries.sort(reverse=True)
+
+        now = time()
+        total_bytes = 0
+        for mtime, size, entry_path in entries:
+            total_bytes += size
+            if (self.max_age is not None and now - mtime > self.max_age) or (
+                self.max_bytes is not None and total_bytes > self.max_bytes
+            ):
+                entry_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for entry_path in self.directory.glob("*" + self.SUFFIX):
+            entry_path.unlink(missing_ok=True)
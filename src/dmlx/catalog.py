@@ -0,0 +1,238 @@
+import json
+import os
+import sqlite3
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from .metafile import get_meta_file_paths, read_meta
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .experiment import Experiment
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    birth_timestamp REAL NOT NULL,
+    mtime REAL NOT NULL,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS experiments_name ON experiments (name);
+CREATE INDEX IF NOT EXISTS experiments_birth ON experiments (birth_timestamp);
+CREATE TABLE IF NOT EXISTS args (
+    path TEXT NOT NULL REFERENCES experiments (path) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (path, key)
+);
+CREATE INDEX IF NOT EXISTS args_key_value ON args (key, value);
+CREATE TABLE IF NOT EXISTS unreadable (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+def encode_value(value: object) -> str:
+    """Encode an arg value into its canonical JSON form used by the catalog."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class CatalogEntry(NamedTuple):
+    path: Path
+    name: str
+    birth_timestamp: float
+    meta: "Experiment.Meta"
+
+
+class Catalog:
+    """A persistent SQLite index of experiment archives, which supports
+    looking up experiments by name, birth time and args without walking
+    the archive tree and parsing every meta file.
+    """
+
+    file_path: Path
+    connection: sqlite3.Connection
+
+    def __init__(self, file_path: Path | str, *, timeout: float = 30.0) -> None:
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.file_path, timeout=timeout)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, _exception_type, _exception, _traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add(
+        self,
+        meta: "Experiment.Meta",
+        path: Path | str,
+        mtime: float | None = None,
+    ) -> None:
+        """Add or update the entry of the experiment archive at `path`.
+        (`mtime` defaults to the current time.)
+        """
+        if mtime is None:
+            mtime = time()
+        with self.connection:
+            self.__insert(str(Path(path).resolve()), meta, mtime)
+
+    def __insert(self, key: str, meta: "Experiment.Meta", mtime: float) -> None:
+        # Replace the entry at `key` within the current transaction.
+        self.connection.execute("DELETE FROM experiments WHERE path = ?", (key,))
+        self.connection.execute(
+            "INSERT INTO experiments VALUES (?, ?, ?, ?, ?)",
+            (key, meta["name"], meta["birth_timestamp"], mtime, json.dumps(meta)),
+        )
+        self.connection.executemany(
+            "INSERT INTO args VALUES (?, ?, ?)",
+            (
+                (key, arg_name, encode_value(arg_value))
+                for arg_name, arg_value in meta["args"].items()
+            ),
+        )
+
+    def remove(self, path: Path | str) -> None:
+        """Remove the entry of the experiment archive at `path`."""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM experiments WHERE path = ?",
+                (str(Path(path).resolve()),),
+            )
+
+    def scan(
+        self,
+        base_dir: Path | str,
+        meta_file_path: Path | str | None = None,
+        *,
+        prune: bool = True,
+    ) -> int:
+        """Incrementally index the experiment archives under `base_dir` (with
+        meta files at `meta_file_path`, or, by default, in either format) in a
+        single transaction. Only meta files whose modification time differs
+        from the indexed (or, for unreadable meta files, the recorded) one are
+        parsed, and directories containing a meta file are not descended into.
+        If `prune` is set, entries under `base_dir` whose meta files no longer
+        exist are removed.
+
+        Returns:
+            count (int): The number of (re)indexed archives.
+        """
+        base_dir = Path(base_dir).resolve()
+        meta_file_paths = get_meta_file_paths(meta_file_path)
+        prefix = str(base_dir) + os.sep
+
+        def select_mtimes(table: str) -> dict[str, float]:
+            return dict(
+                cast(
+                    list[tuple[str, float]],
+                    self.connection.execute(
+                        f"SELECT path, mtime FROM {table} "
+                        "WHERE substr(path, 1, length(?)) = ?",
+                        (prefix, prefix),
+                    ).fetchall(),
+                )
+            )
+
+        known_mtimes = select_mtimes("experiments")
+        unreadable_mtimes = select_mtimes("unreadable")
+
+        count = 0
+        with self.connection:
+            # (Directories walked under the resolved `base_dir` are resolved.)
+            for dir_path, dir_names, _file_names in os.walk(base_dir):
+                for candidate_path in meta_file_paths:
+                    meta_path = Path(dir_path, candidate_path)
+                    try:
+                        mtime = meta_path.stat().st_mtime
+                        break
+                    except OSError:
+                        pass
+                else:
+                    continue
+                dir_names.clear()
+                if known_mtimes.pop(dir_path, None) == mtime:
+                    continue
+                unreadable_mtime = unreadable_mtimes.pop(dir_path, None)
+                if unreadable_mtime == mtime:
+                    continue
+                try:
+                    meta = read_meta(meta_path)
+                except (OSError, ValueError):
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO unreadable VALUES (?, ?)",
+                        (dir_path, mtime),
+                    )
+                    continue
+                if unreadable_mtime is not None:
+                    self.connection.execute(
+                        "DELETE FROM unreadable WHERE path = ?", (dir_path,)
+                    )
+                self.__insert(dir_path, meta, mtime)
+                count += 1
+
+            if prune:
+                self.connection.executemany(
+                    "DELETE FROM experiments WHERE path = ?",
+                    ((path,) for path in known_mtimes),
+                )
+                self.connection.executemany(
+                    "DELETE FROM unreadable WHERE path = ?",
+                    ((path,) for path in unreadable_mtimes),
+                )
+
+        return count
+
+    def query(
+        self,
+        *,
+        name: str | None = None,
+        born_after: float | None = None,
+        born_before: float | None = None,
+        args: Mapping[str, object] | None = None,
+    ) -> Iterator[CatalogEntry]:
+        """Query indexed experiments, ordered by birth time.
+
+        - `name` is matched as a SQLite GLOB pattern (e.g. `"2025/01/*"`)
+        - `born_after`/`born_before` are inclusive timestamp bounds
+        - `args` values are compared for equality with the recorded args
+
+        Returns:
+            entries (Iterator[CatalogEntry]): The matched entries.
+        """
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        if name is not None:
+            conditions.append("name GLOB ?")
+            parameters.append(name)
+        if born_after is not None:
+            conditions.append("birth_timestamp >= ?")
+            parameters.append(born_after)
+        if born_before is not None:
+            conditions.append("birth_timestamp <= ?")
+            parameters.append(born_before)
+        for arg_name, arg_value in (args or {}).items():
+            conditions.append(
+                "EXISTS (SELECT 1 FROM args WHERE args.path = experiments.path "
+                "AND args.key = ? AND args.value = ?)"
+            )
+            parameters.extend((arg_name, encode_value(arg_value)))
+
+        statement = "SELECT path, name, birth_timestamp, meta FROM experiments"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " ORDER BY birth_timestamp"
+
+        for path, name_, birth_timestamp, meta in self.connection.execute(
+            statement, parameters
+        ):
+            yield CatalogEntry(Path(path), name_, birth_timestamp, json.loads(meta))
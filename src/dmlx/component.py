@@ -1,21 +1,43 @@
 import json
-from collections.abc import Callable
+import marshal
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache, partial
+from hashlib import sha256
+from importlib import import_module
 from pkgutil import resolve_name
-from types import ModuleType
-from typing import Any
+from types import MappingProxyType, ModuleType
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import DiskCache
 
-def parse_locator(locator: str) -> tuple[str, dict[str, object]]:
-    """Parse a component locator string into path and parameters.
 
-    - Format: `<path>?<key_0>=<value_0>;<key_1>=<value_1>;...`
-    - Excessive whitespace characters will be ignored
-    - Pairs with keys starting with "#" will also be ignored
-    - `<key_*>` can be any string
-    - `<value_*>` will be converted by `json.loads()`
+class Locator(NamedTuple):
+    """A parsed component locator (see `parse_locator()`), which is shared by
+    all users of the memoized result, so its params (including nested lists
+    and dicts) must not be mutated. Use `kwargs()` for a copy.
+    """
 
-    Returns:
-        A tuple of (path, params).
+    path: str
+    params: Mapping[str, object]
+    # List and dict params marshaled for fast deep copies, if any.
+    marshaled_containers: bytes | None = None
+
+    def kwargs(self) -> dict[str, object]:
+        """Get a fresh copy of the params that is safe to mutate. (Only list
+        and dict values are copied, as other JSON values are immutable.)
+        """
+        kwargs = dict(self.params)
+        if self.marshaled_containers is not None:
+            kwargs.update(marshal.loads(self.marshaled_containers))
+        return kwargs
+
+
+@lru_cache(maxsize=1024)
+def compile_locator(locator: str) -> Locator:
+    """Parse a component locator string into an immutable `Locator`.
+    (Results are memoized, so repeated locators are only parsed once.)
     """
     path, _, params_str = locator.partition("?")
     path = path.strip()
@@ -27,36 +49,175 @@ def parse_locator(locator: str) -> tuple[str, dict[str, object]]:
             if not param_str or param_str.startswith("#"):
                 continue
             key, value = param_str.split("=", 1)
-            params[key.strip()] = json.loads(value)
+            key = key.strip()
+            params[key] = json.loads(value)
 
-    return path, params
+    containers = {
+        key: value for key, value in params.items() if isinstance(value, (list, dict))
+    }
+    return Locator(
+        path,
+        MappingProxyType(params),
+        marshal.dumps(containers) if containers else None,
+    )
+
+
+def normalize_locator(locator: str) -> str:
+    """Normalize a component locator string, so that locators with the same
+    path and params (regardless of whitespace, comments and param order) are
+    normalized to the same string.
+    """
+    path, params, _ = compile_locator(locator)
+    if not params:
+        return path
+    return (
+        path
+        + "?"
+        + ";".join(
+            f"{key}={json.dumps(params[key], sort_keys=True)}" for key in sorted(params)
+        )
+    )
+
+
+def parse_locator(locator: str) -> tuple[str, dict[str, object]]:
+    """Parse a component locator string into path and parameters.
+
+    - Format: `<path>?<key_0>=<value_0>;<key_1>=<value_1>;...`
+    - Excessive whitespace characters will be ignored
+    - Pairs with keys starting with "#" will also be ignored
+    - `<key_*>` can be any string
+    - `<value_*>` will be converted by `json.loads()`
+
+    Returns:
+        A tuple of (path, params).
+    """
+    compiled_locator = compile_locator(locator)
+    return compiled_locator.path, compiled_locator.kwargs()
+
+
+@lru_cache(maxsize=1024)
+def resolve_factory(
+    factory_path: str, default_factory_name: str | None = None
+) -> Callable[..., object]:
+    """Resolve a factory by its path. If the path points to a module, the
+    attribute named `default_factory_name` of that module will be used.
+    (Results are memoized.)
+    """
+    factory = resolve_name(factory_path)
+    if isinstance(factory, ModuleType):
+        if not default_factory_name:
+            raise RuntimeError("Factory name is neither provided nor set!")
+        factory = getattr(factory, default_factory_name)
+    return factory
+
+
+def resolve_locators(
+    locators: Iterable[str],
+    module_base: str = "",
+    default_factory_name: str | None = None,
+) -> dict[str, Callable[..., object]]:
+    """Resolve the factories of many locators at once. Locators are grouped by
+    module so that each module is imported once before resolving its factories.
+
+    Returns:
+        factories (dict[str, Callable[..., object]]): A dict mapping each
+            locator to its factory.
+    """
+    groups: dict[str, list[tuple[str, str]]] = {}
+    for locator in locators:
+        factory_path = compile_locator(locator).path
+        if module_base:
+            factory_path = module_base + "." + factory_path
+        module_name = factory_path.partition(":")[0]
+        groups.setdefault(module_name, []).append((locator, factory_path))
+
+    factories: dict[str, Callable[..., object]] = {}
+    for module_name, group in groups.items():
+        try:
+            import_module(module_name)
+        except ImportError:
+            pass  # not a module path, e.g. "module.factory" without ":"
+        for locator, factory_path in group:
+            factories[locator] = resolve_factory(factory_path, default_factory_name)
+    return factories
+
+
+def get_code_hash(factory: Callable) -> str:
+    """Get the hash of the source file of the module defining `factory` (or
+    the function wrapped by `factory`, if it is a `functools.partial`).
+    (Falls back to the hash of the factory's bytecode, if any, when the source
+    file is unavailable.)
+    """
+    while isinstance(factory, partial):
+        factory = factory.func
+    module = sys.modules.get(getattr(factory, "__module__", None) or "")
+    source_path = getattr(module, "__file__", None)
+    if source_path:
+        try:
+            with open(source_path, "rb") as file:
+                return sha256(file.read()).hexdigest()
+        except OSError:
+            pass
+    code = getattr(factory, "__code__", None)
+    return sha256(code.co_code if code else b"").hexdigest()
 
 
 def Component(
     module_base: str = "",
     default_factory_name: str | None = None,
     postprocessor: Callable[[Any], object] | None = None,
+    disk_cache: "DiskCache | None" = None,
+    prefetch: int | None = None,
+    batch_size: int | None = None,
 ) -> Callable[[str], object]:
     """Create a component factory loads the component according to the factory
     locator. (The locator string will be passed to `parse_locator()` to extract
-    factory path and parameters.)
+    factory path and parameters.) If `disk_cache` is given, factory results
+    will be cached in it, keyed by the resolved factory path, the parameters and
+    the code hash of the factory, and the postprocessor will be applied to the
+    cached results.
+
+    If `prefetch` is given, (postprocessed) components will be wrapped in
+    `dmlx.prefetch.Prefetcher`s buffering that many items (or batches of
+    `batch_size` items, if given) ahead. Both options can also be overridden by
+    the reserved locator params "@prefetch" and "@batch_size", which are not
+    passed to factories.
     """
 
     def component(locator: str) -> object:
-        factory_path, factory_kwargs = parse_locator(locator)
+        compiled_locator = compile_locator(locator)
+        factory_path = compiled_locator.path
         if module_base:
             factory_path = module_base + "." + factory_path
 
-        factory = resolve_name(factory_path)
-        if isinstance(factory, ModuleType):
-            if not default_factory_name:
-                raise RuntimeError("Factory name is neither provided nor set!")
-            factory = getattr(factory, default_factory_name)
-        component = factory(**factory_kwargs)
+        factory = resolve_factory(factory_path, default_factory_name)
+        factory_kwargs = compiled_locator.kwargs()
+        prefetch_size = factory_kwargs.pop("@prefetch", prefetch)
+        prefetch_batch_size = factory_kwargs.pop("@batch_size", batch_size)
+        if disk_cache is None:
+            component = factory(**factory_kwargs)
+        else:
+            # (Factories are identified by their resolved paths, as partials and
+            # lambdas have no distinctive qualified names.)
+            key = disk_cache.make_key(
+                factory_path,
+                default_factory_name or "",
+                json.dumps(factory_kwargs, sort_keys=True),
+                get_code_hash(factory),
+            )
+            component = disk_cache.get(key, lambda: factory(**factory_kwargs))
 
         if postprocessor:
-            return postprocessor(component)
-        else:
-            return component
+            component = postprocessor(component)
+
+        if prefetch_size:
+            from .prefetch import Prefetcher
+
+            component = Prefetcher(
+                cast(Iterable[Any], component),
+                cast(int, prefetch_size),
+                batch_size=cast("int | None", prefetch_batch_size),
+            )
+        return component
 
     return component
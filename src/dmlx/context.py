@@ -1,5 +1,3 @@
-from inspect import cleandoc
-
 from .experiment import Experiment
 
 
@@ -27,6 +25,8 @@ class ExperimentContext:
 def get_current_experiment() -> Experiment:
     """Get the currently active experiment."""
     if ExperimentContext._current_experiment is None:
+        from inspect import cleandoc
+
         raise RuntimeError(
             cleandoc(
                 """
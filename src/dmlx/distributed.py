@@ -0,0 +1,68 @@
+import os
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from time import monotonic, sleep
+from typing import NamedTuple
+
+RUN_ID_VARIABLES = ("DMLX_RUN_ID", "TORCHELASTIC_RUN_ID", "SLURM_JOB_ID")
+# Restarted runs (e.g. requeued SLURM jobs) keep their run IDs, but these count
+# the attempts.
+RESTART_COUNT_VARIABLES = ("TORCHELASTIC_RESTART_COUNT", "SLURM_RESTART_COUNT")
+
+
+class DistributedInfo(NamedTuple):
+    rank: int
+    world_size: int
+    run_id: str | None
+    attempt: int = 0
+
+
+SINGLE_PROCESS = DistributedInfo(0, 1, None)
+
+
+def get_distributed_info(
+    environ: Mapping[str, str] = os.environ,
+    run_id_variables: Sequence[str] = RUN_ID_VARIABLES,
+    restart_count_variables: Sequence[str] = RESTART_COUNT_VARIABLES,
+) -> DistributedInfo:
+    """Get the rank and world size of the current process from the `RANK` and
+    `WORLD_SIZE` environment variables (as set by `torchrun` and similar
+    launchers), the ID shared by all ranks of the run from the first set
+    variable in `run_id_variables`, and the attempt (i.e. restart count) of
+    the run from the first set variable in `restart_count_variables`.
+
+    Returns:
+        info (DistributedInfo): The rank, world size, run ID and attempt.
+    """
+    world_size = int(environ.get("WORLD_SIZE", 1))
+    rank = int(environ.get("RANK", 0))
+    if world_size < 1 or not 0 <= rank < world_size:
+        raise ValueError(f"Invalid rank {rank} of world size {world_size}!")
+    run_id = next(
+        (environ[name] for name in run_id_variables if environ.get(name)), None
+    )
+    attempt = next(
+        (int(environ[name]) for name in restart_count_variables if environ.get(name)),
+        0,
+    )
+    return DistributedInfo(rank, world_size, run_id, attempt)
+
+
+def wait_for_path(
+    path: Path, timeout: float, poll_interval: tuple[float, float] = (0.01, 1.0)
+) -> bool:
+    """Poll until `path` exists, with the interval growing from
+    `poll_interval[0]` to `poll_interval[1]` seconds.
+
+    Returns:
+        exists (bool): Whether `path` exists before `timeout` seconds pass.
+    """
+    deadline = monotonic() + timeout
+    interval, max_interval = poll_interval
+    while not path.exists():
+        remaining_time = deadline - monotonic()
+        if remaining_time <= 0:
+            return False
+        sleep(min(interval, remaining_time))
+        interval = min(interval * 2, max_interval)
+    return True
@@ -1,15 +1,10 @@
-from inspect import cleandoc
+COMMAND_DEFINING_DOC = """\
+Consider defining the experiment command using the `@experiment.main()` decorator:
 
-COMMAND_DEFINING_DOC = cleandoc(
-    """
-    Consider defining the experiment command using the `@experiment.main()` decorator:
-
-    ```python
-    @experiment.main()
-    def main(**args): ...
-    ```
-    """
-)
+```python
+@experiment.main()
+def main(**args): ...
+```"""
 
 META_FROZEN_DOC = (
     "The experiment meta has been frozen, which means its path has been accessed, "
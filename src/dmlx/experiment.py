@@ -1,27 +1,61 @@
-import json
-from collections.abc import Callable
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import AbstractContextManager, ExitStack
 from datetime import datetime
-from functools import cache, wraps
+from functools import wraps
+from os import getpid, urandom
 from pathlib import Path
-from secrets import token_hex
-from sys import orig_argv
-from typing import TYPE_CHECKING, Any, TypedDict, cast
-
-import click
+from time import monotonic, perf_counter, perf_counter_ns
+from typing import TYPE_CHECKING, Any, BinaryIO, TypedDict, cast
 
+from .distributed import RUN_ID_VARIABLES, DistributedInfo, get_distributed_info
 from .docs import COMMAND_DEFINING_DOC, META_FROZEN_DOC
+from .layout import FlatLayout, Layout
+from .trace import Tracer
 
 if TYPE_CHECKING:  # pragma: no cover
+    import click
+    import numpy
+    import numpy.typing
+
+    from .artifact import ArtifactStore, HashingFile
     from .context import ExperimentContext
+    from .journal import Event, Journal, JournalState
+    from .metrics import MetricsWriter
+    from .pack import PackedArchive
+    from .sampler import ResourceSampler, ResourceSummary
+    from .trace import SpanSummary
+    from .writer import BackgroundWriter, Snapshot
 
 
 class Experiment:
     BASE_DIR: Path = Path("./experiments")
+    LAYOUT: Layout = FlatLayout()
     DEFAULT_NAME_TEMPLATE: str = (
         "{year}/{month:02}/{day:02}/{hour:02}{minute:02}{second:02}-{hex}"
     )
     DEFAULT_META_FILE_PATH: Path | str = "meta.json"
     DEFAULT_META_JSON_OPTIONS: dict[str, Any] = dict(indent=4)
+    COMPACT_META: bool = False
+    COMPACT_META_FILE_PATH: Path | str = "meta.bin"
+    CATALOG_FILE_PATH: Path | str | None = None
+    METRICS_FILE_SUFFIX: str = ".metrics"
+    ARTIFACT_STORE_DIR: Path | str = ".artifacts"
+    ARRAY_FILE_SUFFIX: str = ".npy"
+    ENABLE_TRACING: bool = False
+    TRACE_FILE_PATH: Path | str = "trace.json"
+    RESOURCE_SAMPLING_INTERVAL: float | None = None
+    RESOURCES_FILE_PATH: Path | str = "resources.metrics"
+    MEMO_DIR: Path | str = ".memo"
+    COMPLETION_MARKER_FILE_PATH: Path | str = "COMPLETED"
+    SEQUENCE_FILE_PATH: Path | str = ".sequence"
+    CLAIM_ATTEMPTS: int = 16
+    RUN_ID_VARIABLES: Sequence[str] = RUN_ID_VARIABLES
+    RENDEZVOUS_DIR: Path | str = ".rendezvous"
+    RENDEZVOUS_TIMEOUT: float = 600.0
+    RANK_DIR_TEMPLATE: str = "rank{rank}"
+    JOURNAL_FILE_PATH: Path | str = "journal.jsonl"
+    PACK_DIR: Path | str = ".packs"
 
     class NameTemplateVariables(TypedDict):
         year: int
@@ -43,25 +77,53 @@ class Experiment:
             minute=now.minute,
             second=now.second,
             microsecond=now.microsecond,
-            hex=token_hex(4),
+            hex=urandom(4).hex(),
         )
 
-    class Meta(TypedDict):
+    class RequiredMeta(TypedDict):
         name: str
         birth: str
         birth_timestamp: float
         orig_argv: list[str]
         args: dict[str, object]
 
+    class Meta(RequiredMeta, total=False):
+        spans: "dict[str, SpanSummary]"
+        resources: "ResourceSummary"
+        rank: int
+        world_size: int
+        ranks: dict[str, dict[str, object]]
+
     __hook_before_main: Callable[..., None] | None
-    __command: click.Command | None
+    __command: "click.Command | None"
     __birth: datetime
-    __name: str
-    __meta_file_path: Path
+    __name: str | None
+    __meta_file_path: Path | None
+    __path: Path | None
     __args: dict[str, object] | None
     __meta_frozen: bool
     __meta: Meta | None
-    __pending_params: list[click.Parameter]
+    __pending_params: "list[click.Parameter]"
+    __exit_stack: ExitStack
+    __metrics_writers: "dict[str, MetricsWriter]"
+    __background_writer: "BackgroundWriter | None"
+    __tracer: Tracer
+    __run_start_ns: int | None
+    __initialized: bool
+    __meta_json_options: dict[str, Any]
+    __resource_sampling_interval: float | None
+    __resource_summary: "ResourceSummary | None"
+    __args_digest: str | None
+    __memoized: bool
+    __name_template: str
+    __generated_name: str | None
+    __distributed: DistributedInfo | None
+    __resource_sampler: "ResourceSampler | None"
+    __init_counter: float | None
+    __loaded: bool
+    __state_replayed: bool
+    __state: "JournalState | None"
+    __packed_archive: "PackedArchive | None"
 
     def __init__(
         self,
@@ -69,21 +131,81 @@ class Experiment:
         *,
         name_template_variables: NameTemplateVariables | None = None,
         meta_file_path: Path | str | None = None,
+        tracing: bool | None = None,
+        resource_sampling_interval: float | None = None,
+        distributed: DistributedInfo | None = None,
     ) -> None:
         self.__hook_before_main = None
         self.__command = None
         self.__birth = datetime.now()
-        self.__meta_file_path = Path(meta_file_path or self.DEFAULT_META_FILE_PATH)
+        self.__meta_file_path = None if meta_file_path is None else Path(meta_file_path)
+        self.__path = None
         self.__args = None
         self.__meta_frozen = False
         self.__meta = None
         self.__pending_params = []
+        self.__exit_stack = ExitStack()
+        self.__metrics_writers = {}
+        self.__background_writer = None
+        self.__tracer = Tracer(self.ENABLE_TRACING if tracing is None else tracing)
+        self.__run_start_ns = None
+        self.__initialized = False
+        self.__meta_json_options = {}
+        self.__resource_sampling_interval = (
+            resource_sampling_interval or self.RESOURCE_SAMPLING_INTERVAL
+        )
+        self.__resource_summary = None
+        self.__resource_sampler = None
+        self.__init_counter = None
+        self.__loaded = False
+        self.__state_replayed = False
+        self.__state = None
+        self.__packed_archive = None
+        self.__distributed = distributed
+        self.__args_digest = None
+        self.__memoized = False
 
         if name_template is None:
             name_template = self.DEFAULT_NAME_TEMPLATE
+        self.__name_template = name_template
+        self.__generated_name = None
         if name_template_variables is None:
-            name_template_variables = self.get_name_template_variables(self.__birth)
-        self.__name = name_template.format_map(name_template_variables)
+            # Generated on first use (see `name`), so that experiments that
+            # are only loaded never allocate sequence numbers.
+            self.__name = None
+        else:
+            self.__name = name_template.format_map(name_template_variables)
+
+    def __generate_name(self, now: datetime) -> str:
+        variables: dict[str, object] = dict(self.get_name_template_variables(now))
+        if "{seq" in self.__name_template:
+            variables["seq"] = self.next_sequence_number()
+        return self.__name_template.format_map(variables)
+
+    @classmethod
+    def next_sequence_number(cls) -> int:
+        """Allocate the next number of the monotonic sequence stored at
+        `SEQUENCE_FILE_PATH` relative to `BASE_DIR`, which is safe across
+        processes sharing the file. (Name templates containing `{seq}` get
+        sequence numbers allocated by this method. Requires `fcntl`.)
+        """
+        import fcntl
+        import os
+
+        sequence_path = cls.BASE_DIR / cls.SEQUENCE_FILE_PATH
+        sequence_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor = os.open(sequence_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+            content = os.read(file_descriptor, 32)
+            number = int(content) if content.strip() else 0
+            os.lseek(file_descriptor, 0, os.SEEK_SET)
+            os.ftruncate(file_descriptor, 0)
+            os.write(file_descriptor, str(number + 1).encode())
+            os.fsync(file_descriptor)
+            return number
+        finally:
+            os.close(file_descriptor)  # also releases the lock
 
     @property
     def hook_before_main(self) -> Callable[..., None] | None:
@@ -112,11 +234,11 @@ class Experiment:
         return decorator
 
     @property
-    def command(self) -> click.Command | None:
+    def command(self) -> "click.Command | None":
         return self.__command
 
     @command.setter
-    def command(self, command: click.Command) -> None:
+    def command(self, command: "click.Command") -> None:
         if self.__command:
             raise ValueError("Experiment command cannot be set twice!")
         if len(self.__pending_params) > 0:
@@ -124,14 +246,67 @@ class Experiment:
             self.__pending_params.clear()
         self.__command = command
 
+    @property
+    def tracer(self) -> Tracer:
+        """The tracer recording timing spans of the experiment. (Enabled by the
+        `tracing` argument of the constructor or `ENABLE_TRACING`.)
+        """
+        return self.__tracer
+
+    def span(self, name: str, **args: object) -> AbstractContextManager[None]:
+        """Get a context that records a timing span named `name` around its body
+        if tracing is enabled. Recorded spans are exported to `TRACE_FILE_PATH`
+        in the experiment directory and summarized in meta when the experiment
+        command exits.
+        """
+        return self.__tracer.span(name, **args)
+
     @property
     def birth(self) -> datetime:
         """The creation time of the experiment object."""
         return self.__birth
 
+    @property
+    def rank(self) -> int:
+        """The rank of the current process in a distributed run. (See the
+        `distributed` argument of the constructor, which defaults to
+        `dmlx.distributed.get_distributed_info()`, resolved on first use.)
+        """
+        return self.__get_distributed().rank
+
+    def __get_distributed(self) -> DistributedInfo:
+        # Resolve distributed info from the environment only when needed, so
+        # that experiments can be constructed and loaded regardless of it.
+        if self.__distributed is None:
+            self.__distributed = get_distributed_info(
+                run_id_variables=self.RUN_ID_VARIABLES
+            )
+        return self.__distributed
+
+    @property
+    def world_size(self) -> int:
+        """The number of processes in a distributed run."""
+        return self.__get_distributed().world_size
+
+    @property
+    def rank_path(self) -> Path:
+        """Path to the directory of the current rank, i.e. the subdirectory
+        named by `RANK_DIR_TEMPLATE` in a distributed run, or the experiment
+        directory otherwise. (Metrics, traces and resource samples are written
+        here.)
+        """
+        if self.world_size == 1:
+            return self.path
+        return self.path / self.RANK_DIR_TEMPLATE.format(rank=self.rank)
+
     @property
     def name(self) -> str:
-        """Experiment name."""
+        """Experiment name. (Names generated from the name template, including
+        sequence numbers, are generated on first access.)
+        """
+        if self.__name is None:
+            self.__name = self.__generate_name(self.__birth)
+            self.__generated_name = self.__name
         return self.__name
 
     @name.setter
@@ -142,8 +317,15 @@ class Experiment:
 
     @property
     def meta_file_path(self) -> Path:
-        """Path to the meta file, relative to the experiment directory."""
-        return Path(self.__meta_file_path)
+        """Path to the meta file, relative to the experiment directory.
+        (Defaults to `COMPACT_META_FILE_PATH` if `COMPACT_META` is set, or
+        `DEFAULT_META_FILE_PATH` otherwise, while loading detects either.)
+        """
+        if self.__meta_file_path is not None:
+            return Path(self.__meta_file_path)
+        if self.COMPACT_META:
+            return Path(self.COMPACT_META_FILE_PATH)
+        return Path(self.DEFAULT_META_FILE_PATH)
 
     @meta_file_path.setter
     def meta_file_path(self, path: Path | str) -> None:
@@ -164,80 +346,392 @@ class Experiment:
         return self.__args
 
     @property
-    @cache
     def path(self) -> Path:
         """Path to the experiment directory."""
-        self.__meta_frozen = True
-        return self.BASE_DIR / self.__name
+        if self.__path is None:
+            self.__meta_frozen = True
+            self.__path = self.locate(self.name)
+        return self.__path
+
+    @classmethod
+    def locate(cls, name: str) -> Path:
+        """Get the path to the directory of the experiment named `name`
+        according to `LAYOUT`.
+        """
+        return cls.BASE_DIR / cls.LAYOUT.locate(name)
 
     @property
     def meta(self) -> Meta:
         if self.__meta is None:
             self.__meta = self.Meta(
-                name=self.__name,
+                name=self.name,
                 birth=str(self.__birth),
                 birth_timestamp=self.__birth.timestamp(),
-                orig_argv=orig_argv,
+                # (Read when meta is built, as runners like `dmlx.sweep`
+                # execute scripts with their own command lines.)
+                orig_argv=list(sys.orig_argv),
                 args=self.args,
             )
+            if self.world_size > 1:
+                self.__meta["rank"] = self.rank
+                self.__meta["world_size"] = self.world_size
         self.__meta_frozen = True
         return self.__meta
 
     def dump_meta(self, **json_options: Any) -> Meta:
-        """Dump experiment meta to JSON file.
+        """Dump experiment meta to JSON file atomically, so that readers never
+        see a partially written file. (If `COMPACT_META` is set, the meta file
+        will be written in the compact format of `dmlx.metafile` instead,
+        ignoring `DEFAULT_META_JSON_OPTIONS`, and named `COMPACT_META_FILE_PATH`
+        by default. If `CATALOG_FILE_PATH` is set, the experiment will also be
+        indexed in the catalog located at that path relative to `BASE_DIR`. In
+        a distributed run, ranks other than 0 dump meta into their own
+        directories instead, to be merged on exit.)
 
         Returns:
             meta (Experiment.Meta): The dumped meta.
         """
-        for key, value in self.DEFAULT_META_JSON_OPTIONS.items():
-            json_options.setdefault(key, value)
+        from .writer import write_atomically
+
+        self.__check_meta_file_path()
+        if self.COMPACT_META:
+            from .metafile import encode_meta
+
+            data = encode_meta(self.meta, **json_options)
+        else:
+            import json
 
-        with (self.path / self.meta_file_path).open("w") as file:
-            json.dump(self.meta, file, **json_options)
+            for key, value in self.DEFAULT_META_JSON_OPTIONS.items():
+                json_options.setdefault(key, value)
+            data = json.dumps(self.meta, **json_options).encode()
+
+        meta_path = (self.path if self.rank == 0 else self.rank_path) / (
+            self.meta_file_path
+        )
+        write_atomically(meta_path, data)
+
+        if self.CATALOG_FILE_PATH is not None and self.rank == 0:
+            from .catalog import Catalog
+
+            with Catalog(self.BASE_DIR / self.CATALOG_FILE_PATH) as catalog:
+                catalog.add(self.meta, self.path, meta_path.stat().st_mtime)
 
         return self.meta
 
+    def __check_meta_file_path(self) -> None:
+        if self.COMPACT_META and self.meta_file_path.suffix == ".json":
+            raise ValueError(
+                f"Cannot write compact meta to a JSON file: {self.meta_file_path}"
+            )
+
     def init(
         self,
         meta_json_options: dict[str, Any] | None = None,
     ) -> None:
-        """Initialize the experiment directory."""
-        path = self.path
-        path.mkdir(parents=True, exist_ok=False)
+        """Initialize the experiment directory. The directory is claimed by an
+        atomic `mkdir()`, and if it already exists and the experiment name is
+        generated from the name template, a new name is generated and claimed
+        instead, for at most `CLAIM_ATTEMPTS` attempts.
+
+        In a distributed run, only rank 0 claims the directory and dumps meta,
+        and then publishes the experiment name in a rendezvous file named by
+        the run ID and attempt under `RENDEZVOUS_DIR`, which other ranks wait
+        for (for at most `RENDEZVOUS_TIMEOUT` seconds) to adopt the name, and
+        which is removed when the run finishes. Each rank then creates its own
+        directory (see `rank_path`).
+        """
+        with self.span("init"):
+            # Check before claiming the directory to avoid leaving it behind.
+            self.__check_meta_file_path()
+            self.__meta_json_options = meta_json_options or {}
+            distributed = self.__get_distributed()
+            if distributed.world_size > 1 and distributed.run_id is None:
+                raise RuntimeError(
+                    "A run ID shared by all ranks is required in distributed runs! "
+                    f"Set one of {', '.join(self.RUN_ID_VARIABLES)}."
+                )
+            if distributed.rank == 0:
+                self.__claim_directory()
+                self.dump_meta(**self.__meta_json_options)
+            else:
+                self.__join_rendezvous()
+            if distributed.world_size > 1:
+                self.rank_path.mkdir(parents=True, exist_ok=True)
+                if distributed.rank == 0:
+                    self.__publish_rendezvous()
+            resources_path = self.rank_path / self.RESOURCES_FILE_PATH
+            sampler = self.__resource_sampler
+            if sampler is not None and sampler.path != resources_path:
+                sampler.relocate(resources_path)
+            self.__initialized = True
+            self.__init_counter = perf_counter()
+            self.record("started", pid=getpid())
 
-        self.dump_meta(**(meta_json_options or {}))
+    def __get_rendezvous_path(self) -> Path:
+        # Attempts of a restarted run share the run ID, but must not join the
+        # archive of a previous attempt.
+        distributed = self.__get_distributed()
+        assert distributed.run_id is not None
+        file_name = f"{distributed.run_id}.{distributed.attempt}"
+        return self.BASE_DIR / self.RENDEZVOUS_DIR / file_name
+
+    def __publish_rendezvous(self) -> None:
+        import json
+
+        from .writer import write_atomically
+
+        rendezvous = {"name": self.name, "world_size": self.world_size}
+        write_atomically(self.__get_rendezvous_path(), json.dumps(rendezvous).encode())
+
+    def __join_rendezvous(self) -> None:
+        import json
+
+        from .distributed import wait_for_path
+
+        rendezvous_path = self.__get_rendezvous_path()
+        if not wait_for_path(rendezvous_path, self.RENDEZVOUS_TIMEOUT):
+            raise TimeoutError(f"Rendezvous timed out: {rendezvous_path}")
+        rendezvous = json.loads(rendezvous_path.read_text())
+        if rendezvous["world_size"] != self.world_size:
+            raise RuntimeError(
+                f"World size {self.world_size} mismatches world size "
+                f"{rendezvous['world_size']} of rank 0!"
+            )
+        self.__name = rendezvous["name"]
+        self.__path = None
+        if self.__meta is not None:
+            self.__meta["name"] = self.__name
+
+    def __merge_rank_metas(self) -> None:
+        from .distributed import wait_for_path
+        from .metafile import read_meta
+
+        deadline = monotonic() + self.RENDEZVOUS_TIMEOUT
+        common_keys = {"name", "orig_argv", "args", "world_size"}
+        ranks: dict[str, dict[str, object]] = {}
+        for rank in range(1, self.world_size):
+            rank_meta_path = (
+                self.path
+                / self.RANK_DIR_TEMPLATE.format(rank=rank)
+                / self.meta_file_path
+            )
+            if not wait_for_path(rank_meta_path, max(deadline - monotonic(), 0)):
+                continue
+            try:
+                rank_meta = read_meta(rank_meta_path)
+            except (OSError, ValueError):
+                continue
+            ranks[str(rank)] = {
+                key: value for key, value in rank_meta.items() if key not in common_keys
+            }
+        self.meta["ranks"] = ranks
+
+    @staticmethod
+    def get_args_digest(args: dict[str, object], command_identity: str = "") -> str:
+        """Compute a digest of normalized command args, together with
+        `command_identity` (see `get_command_identity()`), if given, so that
+        different commands never share digests. (String args containing "?"
+        are normalized as component locators by `normalize_locator()`.)
+        """
+        import json
+        from hashlib import sha256
+
+        from .component import normalize_locator
+
+        def normalize(value: object) -> object:
+            if isinstance(value, str) and "?" in value:
+                try:
+                    return normalize_locator(value)
+                except ValueError:
+                    return value
+            if isinstance(value, (list, tuple)):
+                return [normalize(item) for item in value]
+            return value
+
+        normalized_args = {key: normalize(value) for key, value in args.items()}
+        encoded_args = json.dumps(
+            {"command": command_identity, "args": normalized_args},
+            sort_keys=True,
+            default=str,
+        )
+        return sha256(encoded_args.encode()).hexdigest()
+
+    @staticmethod
+    def get_command_identity(command_name: str | None, callback: Callable) -> str:
+        """Get the identity of a command, consisting of its name and where its
+        callback is defined, i.e. the resolved path of the script for commands
+        defined in `__main__`, or the module name otherwise.
+        """
+        module_name = getattr(callback, "__module__", None) or "__main__"
+        if module_name == "__main__":
+            code = getattr(callback, "__code__", None)
+            if code is not None:
+                module_name = str(Path(code.co_filename).resolve())
+        qualified_name = getattr(callback, "__qualname__", "")
+        return f"{command_name}:{module_name}:{qualified_name}"
+
+    @property
+    def memoized(self) -> bool:
+        """Whether the experiment command was short-circuited by memoization,
+        in which case the experiment was loaded from the matched archive.
+        """
+        return self.__memoized
+
+    def __find_memoized_archive(self, args_digest: str) -> str | None:
+        memo_path = self.BASE_DIR / self.MEMO_DIR / args_digest
+        try:
+            name = memo_path.read_text()
+        except OSError:
+            return None
+        marker_path = self.locate(name) / self.COMPLETION_MARKER_FILE_PATH
+        try:
+            if marker_path.read_text() != args_digest:
+                return None
+        except OSError:
+            return None
+        return name
+
+    def __mark_completed(self) -> None:
+        from .writer import write_atomically
+
+        assert self.__args_digest is not None
+        write_atomically(
+            self.path / self.COMPLETION_MARKER_FILE_PATH, self.__args_digest.encode()
+        )
+        write_atomically(
+            self.BASE_DIR / self.MEMO_DIR / self.__args_digest, self.name.encode()
+        )
+
+    def __claim_directory(self) -> None:
+        for _ in range(self.CLAIM_ATTEMPTS - 1):
+            try:
+                self.path.mkdir(parents=True, exist_ok=False)
+                return
+            except FileExistsError:
+                if self.name != self.__generated_name:
+                    raise
+                name = self.__generate_name(datetime.now())
+                if name == self.__name:
+                    raise  # the name template has no varying fields
+            self.__name = name
+            self.__generated_name = name
+            self.__path = None
+            if self.__meta is not None:
+                self.__meta["name"] = self.__name
+        self.path.mkdir(parents=True, exist_ok=False)
 
     def main(
-        self, *command_args, **command_kwargs
-    ) -> Callable[[Callable], click.Command]:
+        self, *command_args, memoize: bool = False, **command_kwargs
+    ) -> "Callable[[Callable], click.Command]":
         """Creates the click command and use the decorated function as callback.
         (Additional command arguments and options can be declared with corresponding
         click functions.)
 
+        If `memoize` is set, the digest of command args and the command identity
+        (see `get_args_digest()` and `get_command_identity()`) is recorded when
+        an initialized experiment completes without errors, and later
+        invocations with matching args load the completed archive instead of
+        invoking the callback (and return `None`).
+
         Returns:
             decorator (Callable[[Callable], click.Command]):
                 The decorator for the callback.
         """
+        import click
 
         def decorator(callback: Callable) -> click.Command:
+            command_identity = ""
+
             @wraps(callback)
             def wrapper(*args, **kwargs) -> Any:
                 if self.__args is not None:
                     raise RuntimeError("The experiment has been run or loaded!")
+                if self.__run_start_ns is not None:
+                    self.__tracer.record(
+                        "parse_args", self.__run_start_ns, perf_counter_ns()
+                    )
                 if self.__hook_before_main is not None:
-                    self.__hook_before_main(*args, **kwargs)
+                    with self.span("hook_before_main"):
+                        self.__hook_before_main(*args, **kwargs)
+                if memoize:
+                    self.__args_digest = self.get_args_digest(kwargs, command_identity)
+                    name = self.__find_memoized_archive(self.__args_digest)
+                    if name is not None:
+                        self.__name = name
+                        self.__path = None
+                        self.__load_meta()
+                        self.__memoized = True
+                        return None
                 self.__args = kwargs
                 self.__meta_frozen = True
-                return callback(*args, **kwargs)
+                with self.__exit_stack:
+                    self.__exit_stack.push(self.__finalize)
+                    if self.__resource_sampling_interval:
+                        self.__start_resource_sampler(self.__resource_sampling_interval)
+                    with self.span("main"):
+                        return callback(*args, **kwargs)
 
             click_decorator = click.command(*command_args, **command_kwargs)
             command = cast(click.Command, click_decorator(wrapper))
+            command_identity = self.get_command_identity(command.name, callback)
             self.command = command
             return command
 
         return decorator
 
-    def param(self, cls: type[click.Parameter], *args, **kwargs) -> property:
+    def __start_resource_sampler(self, interval: float) -> None:
+        from .sampler import ResourceSampler
+
+        sampler = ResourceSampler(self.rank_path / self.RESOURCES_FILE_PATH, interval)
+        sampler.start()
+        self.__resource_sampler = sampler
+
+        def stop_resource_sampler() -> None:
+            self.__resource_summary = sampler.stop()
+
+        self.__exit_stack.callback(stop_resource_sampler)
+
+    def __finalize(self, exception_type, exception, _traceback) -> None:
+        if not self.__initialized:
+            return
+        if self.__args_digest is not None and exception_type is None and self.rank == 0:
+            self.__mark_completed()
+        meta_updated = self.rank > 0
+        if self.__tracer.enabled:
+            self.__tracer.export(self.rank_path / self.TRACE_FILE_PATH)
+            self.meta["spans"] = self.__tracer.summarize()
+            meta_updated = True
+        if self.__resource_summary is not None:
+            self.meta["resources"] = self.__resource_summary
+            meta_updated = True
+        if self.rank == 0 and self.world_size > 1:
+            self.__merge_rank_metas()
+            # All ranks have joined once their metas are merged (or timed out).
+            self.__get_rendezvous_path().unlink(missing_ok=True)
+            meta_updated = True
+        if meta_updated:
+            self.dump_meta(**self.__meta_json_options)
+
+        assert self.__init_counter is not None
+        duration = perf_counter() - self.__init_counter
+        if exception_type is None:
+            self.record("finished", exit_code=0, duration=duration)
+        elif issubclass(exception_type, SystemExit) and not exception.code:
+            self.record("finished", exit_code=0, duration=duration)
+        else:
+            if issubclass(exception_type, SystemExit):
+                code = exception.code
+                exit_code = code if isinstance(code, int) else 1
+            else:
+                exit_code = 1
+            self.record(
+                "failed",
+                exit_code=exit_code,
+                duration=duration,
+                error=f"{exception_type.__name__}: {exception}",
+            )
+
+    def param(self, cls: "type[click.Parameter]", *args, **kwargs) -> property:
         """Create a param property that is to be read from the experiment command.
         (All arguments will be forwarded to the constructor.)
 
@@ -275,6 +769,8 @@ class Experiment:
         Returns:
             argument (click.Argument): The created argument.
         """
+        import click
+
         return self.param(click.Argument, *args, **kwargs)
 
     def option(self, *args, **kwargs) -> property:
@@ -284,8 +780,216 @@ class Experiment:
         Returns:
             option (click.Option): The created option.
         """
+        import click
+
         return self.param(click.Option, *args, **kwargs)
 
+    def metrics(
+        self,
+        name: str = "metrics",
+        columns: Sequence[str] | None = None,
+        **options: Any,
+    ) -> "MetricsWriter":
+        """Get the metrics writer of the metrics file named `name` in the
+        directory of the current rank (see `rank_path`). (Writers are created
+        on first use, with extra options forwarded to `MetricsWriter`, and
+        closed when the experiment command returns or raises.)
+
+        Returns:
+            writer (MetricsWriter): The metrics writer.
+        """
+        writer = self.__metrics_writers.get(name)
+        if writer is None:
+            from .metrics import MetricsWriter
+
+            writer = MetricsWriter(
+                self.rank_path / (name + self.METRICS_FILE_SUFFIX), columns, **options
+            )
+            self.__metrics_writers[name] = writer
+            self.__exit_stack.push(writer)
+        return writer
+
+    def read_metrics(
+        self, name: str = "metrics", rank: int | None = None
+    ) -> "dict[str, numpy.ndarray]":
+        """Read the metrics file named `name` in the directory of the current
+        rank (or of `rank`, if given) into NumPy arrays. (See
+        `dmlx.metrics.read_metrics()`.)
+        """
+        from .metrics import read_metrics
+
+        if rank is None:
+            directory = self.rank_path
+        else:
+            directory = self.path / self.RANK_DIR_TEMPLATE.format(rank=rank)
+        path = directory / (name + self.METRICS_FILE_SUFFIX)
+        return read_metrics(*self.__locate_file(path.relative_to(self.path)))
+
+    @property
+    def background_writer(self) -> "BackgroundWriter":
+        """The background writer of the experiment, which is created on first
+        access and flushed and closed when the experiment command returns or
+        raises.
+        """
+        if self.__background_writer is None:
+            from .writer import BackgroundWriter
+
+            self.__background_writer = BackgroundWriter()
+            self.__exit_stack.push(self.__background_writer)
+        return self.__background_writer
+
+    def write_async(self, name: Path | str, snapshot: "Snapshot") -> None:
+        """Write a snapshot (bytes or a function writing to a binary file) to
+        the file named `name` in the experiment directory atomically in the
+        background. (See `dmlx.writer.BackgroundWriter`.)
+        """
+        self.background_writer.submit(self.path / name, snapshot)
+
+    def save_array(self, name: str, array: "numpy.typing.ArrayLike") -> Path:
+        """Save an array named `name` into the experiment directory in the
+        NumPy `.npy` format, i.e. raw data after a small header, so that it can
+        be reopened as a memory map by `open_array()`.
+
+        Returns:
+            path (Path): Path to the array file.
+        """
+        import numpy
+
+        path = self.path / (name + self.ARRAY_FILE_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            numpy.save(file, numpy.asanyarray(array), allow_pickle=False)
+        return path
+
+    def open_array(self, name: str) -> "numpy.ndarray":
+        """Open an array saved by `save_array()` as a read-only memory map, so
+        that only accessed slices are read from disk.
+        """
+        import numpy
+
+        file_name = name + self.ARRAY_FILE_SUFFIX
+        path, offset, _ = self.__locate_file(file_name)
+        if offset == 0:
+            return numpy.load(path, mmap_mode="r", allow_pickle=False)
+
+        from numpy.lib import format as npy_format
+
+        with self.open_file(file_name) as file:
+            version = npy_format.read_magic(file)
+            if version == (1, 0):
+                header = npy_format.read_array_header_1_0(file)
+            elif version == (2, 0):
+                header = npy_format.read_array_header_2_0(file)
+            else:
+                raise ValueError(f"Unsupported .npy format version: {version}")
+            shape, fortran_order, dtype = header
+            data_offset = file.tell()
+        return numpy.memmap(
+            path,
+            dtype=dtype,
+            mode="r",
+            offset=offset + data_offset,
+            shape=shape,
+            order="F" if fortran_order else "C",
+        )
+
+    @property
+    def packed_archive(self) -> "PackedArchive | None":
+        """The packed archive the experiment was loaded from, if its directory
+        has been packed by `dmlx.pack.pack()`. (None otherwise.)
+        """
+        return self.__packed_archive
+
+    def open_file(self, name: Path | str) -> BinaryIO:
+        """Open the file named `name` in the experiment directory for reading,
+        or, if the experiment was loaded from a pack, the packed file (as a
+        seekable file read in place).
+        """
+        path = self.path / name
+        if self.__packed_archive is None or path.exists():
+            return path.open("rb")
+        return cast(BinaryIO, self.__packed_archive.open(name))
+
+    def __locate_file(self, name: Path | str) -> tuple[Path, int, int | None]:
+        # Locate a file as (path, offset, size), with the size being None if
+        # the file is not packed.
+        path = self.path / name
+        if self.__packed_archive is None or path.exists():
+            return path, 0, None
+        offset, size = self.__packed_archive.locate(name)
+        return self.__packed_archive.pack_path, offset, size
+
+    @property
+    def artifact_store(self) -> "ArtifactStore":
+        """The artifact store shared by experiments, located at
+        `ARTIFACT_STORE_DIR` relative to `BASE_DIR`.
+        """
+        from .artifact import ArtifactStore
+
+        return ArtifactStore(self.BASE_DIR / self.ARTIFACT_STORE_DIR)
+
+    def open_artifact(self, name: Path | str) -> "AbstractContextManager[HashingFile]":
+        """Open a binary file for writing an artifact named `name` in the
+        experiment directory. The file is deduplicated through the artifact
+        store once the context exits.
+        """
+        return self.artifact_store.open(self.path / name)
+
+    def add_artifact(self, name: Path | str, source: Path | str) -> str:
+        """Store the file at `source` as an artifact named `name` in the
+        experiment directory, deduplicated through the artifact store.
+
+        Returns:
+            digest (str): The digest of the artifact.
+        """
+        return self.artifact_store.add(source, self.path / name)
+
+    @property
+    def journal(self) -> "Journal":
+        """The append-only event journal at `JOURNAL_FILE_PATH` next to the
+        meta file (in the directory of the current rank for ranks other than 0
+        in a distributed run). "started", "finished" and "failed" events are
+        recorded by the experiment itself.
+        """
+        from .journal import Journal
+
+        directory = self.path if self.rank == 0 else self.rank_path
+        return Journal(directory / self.JOURNAL_FILE_PATH)
+
+    def record(self, event: str, **fields: object) -> "Event":
+        """Append an event (e.g. progress or intermediate results) to the
+        journal, without rewriting the meta file.
+
+        Returns:
+            event (Event): The recorded event.
+        """
+        return self.journal.record(event, **fields)
+
+    @property
+    def state(self) -> "JournalState | None":
+        """The state reconstructed by replaying the journal (see
+        `dmlx.journal.replay()`), which is read once on first access if the
+        experiment is loaded, or on each access otherwise. (None if there is
+        no journal.)
+        """
+        if self.__loaded:
+            if not self.__state_replayed:
+                from .journal import parse_lines, replay
+
+                try:
+                    with self.open_file(
+                        self.journal.path.relative_to(self.path)
+                    ) as file:
+                        self.__state = replay(parse_lines(file.read()))
+                except FileNotFoundError:
+                    self.__state = None
+                self.__state_replayed = True
+            return self.__state
+        try:
+            return self.journal.replay()
+        except FileNotFoundError:
+            return None
+
     def context(self) -> "ExperimentContext":
         """Get an experiment context for the experiment."""
         from .context import ExperimentContext
@@ -304,17 +1008,141 @@ class Experiment:
             )
         if self.__args is not None:
             raise RuntimeError("The experiment has been run or loaded!")
+        self.__run_start_ns = perf_counter_ns()
         with self.context():
             return self.command(*args, **kwargs)
 
     def load(self, **json_options: Any) -> None:
-        """Load the experiment from an existing archive."""
+        """Load the experiment from its existing archive located by `LAYOUT`,
+        or from the pack in `PACK_DIR` (relative to `BASE_DIR`) holding it if
+        the archive has been packed.
+        """
         if self.__args is not None:
             raise RuntimeError("The experiment has already been run or loaded!")
 
-        with (self.path / self.meta_file_path).open("r") as file:
-            meta = cast(Experiment.Meta, json.load(file, **json_options))
+        if not any(
+            (self.path / meta_file_path).exists()
+            for meta_file_path in self.__get_meta_file_paths()
+        ):
+            from .pack import find_packed_archive
+
+            self.__packed_archive = find_packed_archive(
+                self.BASE_DIR / self.PACK_DIR, self.name
+            )
+        self.__load_meta(**json_options)
+
+    def load_from(self, path: Path | str, **json_options: Any) -> None:
+        """Load the experiment from the archive at `path`, which may not be
+        where `LAYOUT` locates it (e.g. a copied archive).
+        """
+        if self.__args is not None:
+            raise RuntimeError("The experiment has already been run or loaded!")
+
+        self.__path = Path(path)
+        self.__meta_frozen = True
+        self.__load_meta(**json_options)
+
+    def __get_meta_file_paths(self) -> list[Path]:
+        # Candidate meta file paths to load from, i.e. the given one, or the
+        # default ones of both formats (the configured format first).
+        if self.__meta_file_path is not None:
+            return [self.__meta_file_path]
+        meta_file_paths = [
+            Path(self.DEFAULT_META_FILE_PATH),
+            Path(self.COMPACT_META_FILE_PATH),
+        ]
+        if self.COMPACT_META:
+            meta_file_paths.reverse()
+        return meta_file_paths
+
+    def __load_meta(self, **json_options: Any) -> None:
+        from .metafile import read_meta_file
+
+        for meta_file_path in self.__get_meta_file_paths():
+            try:
+                file = self.open_file(meta_file_path)
+            except FileNotFoundError:
+                continue
+            with file:
+                meta = read_meta_file(file, **json_options)
+            self.__meta_file_path = meta_file_path
+            break
+        else:
+            raise FileNotFoundError(f"Meta file not found in {self.path}!")
 
         self.__meta = meta
+        self.__name = meta["name"]
         self.__birth = datetime.fromtimestamp(meta["birth_timestamp"])
         self.__args = meta["args"]
+        self.__distributed = DistributedInfo(
+            meta.get("rank", 0), meta.get("world_size", 1), None
+        )
+        # The journal is replayed lazily (see `state`).
+        self.__loaded = True
+
+    @classmethod
+    def load_many(
+        cls,
+        paths: Iterable[Path | str] | str,
+        *,
+        meta_file_path: Path | str | None = None,
+        max_workers: int | None = None,
+        on_error: Callable[[Path, Exception], None] | None = None,
+        **json_options: Any,
+    ) -> Iterator["Experiment"]:
+        """Load experiments from existing archives in parallel. Meta files are
+        read by a thread pool, and loaded experiments are yielded in completion
+        order, with at most `2 * max_workers` archives pending at a time.
+        Archives that cannot be loaded are skipped and reported to `on_error`.
+
+        Args:
+            paths: Paths to experiment directories, or a glob pattern
+                relative to `BASE_DIR` matching experiment directories.
+                (Loaded experiments are named as recorded in their meta.)
+
+        Returns:
+            experiments (Iterator[Experiment]): The loaded experiments.
+        """
+        from concurrent.futures import (
+            FIRST_COMPLETED,
+            Future,
+            ThreadPoolExecutor,
+            wait,
+        )
+        from os import cpu_count
+
+        if isinstance(paths, str):
+            paths = cls.BASE_DIR.glob(paths)
+
+        def load(path: Path) -> Experiment:
+            experiment = cls(meta_file_path=meta_file_path)
+            experiment.load_from(path, **json_options)
+            return experiment
+
+        if max_workers is None:
+            max_workers = min(32, (cpu_count() or 1) + 4)
+        executor = ThreadPoolExecutor(max_workers)
+        max_pending = 2 * max_workers
+        pending: dict[Future[Experiment], Path] = {}
+        path_iterator = iter(paths)
+        try:
+            while True:
+                for path in path_iterator:
+                    path = Path(path)
+                    pending[executor.submit(load, path)] = path
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        experiment = future.result()
+                    except (OSError, ValueError, KeyError, TypeError) as error:
+                        if on_error is not None:
+                            on_error(path, error)
+                        continue
+                    yield experiment
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,146 @@
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from time import time
+from typing import TypedDict
+
+Event = dict[str, object]
+
+STARTED = "started"
+FINISHED = "finished"
+FAILED = "failed"
+RESERVED_FIELDS = ("event", "time")
+
+
+class JournalState(TypedDict, total=False):
+    status: str
+    start_time: float
+    end_time: float
+    exit_code: int
+    duration: float
+    error: str
+    fields: dict[str, object]
+    events: int
+
+
+class Journal:
+    """An append-only journal of events at `path`, in the JSON Lines format.
+    Each event is appended by a single `write()` in append mode, so that
+    concurrent readers never see rewritten data, only (at worst) a partially
+    written last line, which readers ignore (as well as any malformed lines).
+    """
+
+    path: Path
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+    def record(self, event: str, **fields: object) -> Event:
+        """Append an event named `event` with the current time and the given
+        fields.
+
+        Returns:
+            event (Event): The recorded event.
+        """
+        import json
+
+        record: Event = {"event": event, "time": time(), **fields}
+        line = json.dumps(record, default=str).encode() + b"\n"
+        file_descriptor = os.open(
+            self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        try:
+            os.write(file_descriptor, line)
+        finally:
+            os.close(file_descriptor)
+        return record
+
+    def read(self) -> list[Event]:
+        """Read all complete events."""
+        return read_journal(self.path)
+
+    def tail(self, count: int = 1) -> list[Event]:
+        """Read the last `count` complete events."""
+        return tail_journal(self.path, count)
+
+    def replay(self) -> JournalState:
+        """Reconstruct the current state from all events."""
+        return replay(self.read())
+
+
+def parse_lines(data: bytes) -> list[Event]:
+    """Parse complete lines of events, skipping malformed lines (e.g. lines
+    corrupted by a crash or a full disk), so that one bad line does not make
+    the whole journal unreadable.
+    """
+    import json
+
+    events: list[Event] = []
+    # The last line is incomplete (or empty) unless data ends with a newline.
+    for line in data.split(b"\n")[:-1]:
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict) and isinstance(event.get("event"), str):
+            events.append(event)
+    return events
+
+
+def read_journal(path: Path | str) -> list[Event]:
+    """Read all complete events of the journal at `path`."""
+    with open(path, "rb") as file:
+        return parse_lines(file.read())
+
+
+def tail_journal(
+    path: Path | str, count: int = 1, chunk_size: int = 4096
+) -> list[Event]:
+    """Read the last `count` complete events of the journal at `path` by
+    reading backwards from its end in chunks of `chunk_size` bytes, without
+    reading the whole file.
+    """
+    if count < 1:
+        return []
+    with open(path, "rb") as file:
+        end = file.seek(0, os.SEEK_END)
+        data = b""
+        position = end
+        # One more newline is needed to ensure the earliest line is complete.
+        while position > 0 and data.count(b"\n") <= count:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            file.seek(position)
+            data = file.read(read_size) + data
+    if position > 0:
+        data = data[data.index(b"\n") + 1 :]
+    return parse_lines(data)[-count:]
+
+
+def replay(events: Iterable[Mapping[str, object]]) -> JournalState:
+    """Reconstruct the state of a run from its journal events. Lifecycle events
+    set the status ("running", "finished" or "failed"), times, exit code and
+    duration, and fields of other events are merged into `fields`.
+    """
+    state = JournalState(status="pending", fields={}, events=0)
+    for event in events:
+        state["events"] += 1
+        name = event["event"]
+        if name == STARTED:
+            state["status"] = "running"
+            state["start_time"] = float(event["time"])  # type: ignore[arg-type]
+        elif name == FINISHED or name == FAILED:
+            state["status"] = str(name)
+            state["end_time"] = float(event["time"])  # type: ignore[arg-type]
+            for key in ("exit_code", "duration", "error"):
+                if key in event:
+                    state[key] = event[key]  # type: ignore[literal-required]
+        else:
+            state["fields"].update(
+                (key, value)
+                for key, value in event.items()
+                if key not in RESERVED_FIELDS
+            )
+    return state
@@ -0,0 +1,124 @@
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+
+
+class Layout(ABC):
+    """A strategy mapping logical experiment names to directories relative to
+    `Experiment.BASE_DIR`.
+    """
+
+    @abstractmethod
+    def locate(self, name: str) -> Path:
+        """Get the directory of the experiment named `name`, relative to the
+        base directory.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class FlatLayout(Layout):
+    """The default layout, which uses experiment names as relative paths."""
+
+    def locate(self, name: str) -> Path:
+        return Path(name)
+
+
+class HashPrefixLayout(Layout):
+    """A layout that fans experiments out into `levels` levels of directories
+    named by successive `width`-digit hex prefixes of the SHA-256 digest of
+    experiment names, e.g. `ab/cd/2002/01/02/030405-0123abcd`. Each level holds
+    at most `16 ** width` directories, so that no single directory grows too
+    large.
+    """
+
+    levels: int
+    width: int
+
+    def __init__(self, levels: int = 2, width: int = 2) -> None:
+        if levels < 1 or width < 1 or levels * width > 64:
+            raise ValueError("Invalid `levels` or `width` of hash prefixes!")
+        self.levels = levels
+        self.width = width
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(levels={self.levels}, width={self.width})"
+
+    def locate(self, name: str) -> Path:
+        from hashlib import sha256
+
+        digest = sha256(name.encode()).hexdigest()
+        width = self.width
+        prefixes = (digest[i * width : (i + 1) * width] for i in range(self.levels))
+        return Path(*prefixes, name)
+
+
+def find_archives(
+    base_dir: Path | str, meta_file_path: Path | str | None = None
+) -> Iterator[Path]:
+    """Find experiment directories (containing a meta file at `meta_file_path`,
+    or, by default, in either format) under `base_dir` in any layout.
+    Directories containing a meta file are not descended into, and hidden
+    directories (e.g. the artifact store) are skipped.
+
+    Returns:
+        paths (Iterator[Path]): Paths to the found experiment directories.
+    """
+    from .metafile import find_meta_file
+
+    for dir_path, dir_names, _file_names in os.walk(base_dir):
+        if find_meta_file(dir_path, meta_file_path) is not None:
+            dir_names.clear()
+            yield Path(dir_path)
+        else:
+            dir_names[:] = sorted(
+                dir_name for dir_name in dir_names if not dir_name.startswith(".")
+            )
+
+
+def migrate(
+    base_dir: Path | str,
+    layout: Layout,
+    *,
+    meta_file_path: Path | str | None = None,
+    dry_run: bool = False,
+) -> list[tuple[Path, Path]]:
+    """Move existing experiment directories under `base_dir` to where `layout`
+    locates them by the names recorded in their meta files, and remove
+    directories left empty. Directories are moved by renaming, so artifacts
+    stay linked. (Nothing should be writing to `base_dir` meanwhile, and
+    catalogs indexing `base_dir` should be rescanned afterwards.)
+
+    Returns:
+        moves (list[tuple[Path, Path]]): Pairs of the source and target paths
+            of moved (or, if `dry_run` is set, to-be-moved) directories.
+    """
+    from .metafile import find_meta_file, read_meta_header
+
+    base_dir = Path(base_dir)
+    moves: list[tuple[Path, Path]] = []
+    for source in find_archives(base_dir, meta_file_path):
+        meta_path = find_meta_file(source, meta_file_path)
+        assert meta_path is not None
+        name = read_meta_header(meta_path).name
+        target = base_dir / layout.locate(name)
+        if target != source:
+            if target.exists():
+                raise FileExistsError(f"Cannot move {source} to existing {target}!")
+            moves.append((source, target))
+
+    if not dry_run:
+        for source, target in moves:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(source, target)
+            for parent in source.parents:
+                if parent == base_dir or not parent.is_relative_to(base_dir):
+                    break
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+
+    return moves
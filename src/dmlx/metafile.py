@@ -0,0 +1,115 @@
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple, cast
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .experiment import Experiment
+
+MAGIC = b"DMLXMETA"
+PREFIX = struct.Struct("<8sdII")
+# Default paths of JSON and compact meta files in experiment directories.
+META_FILE_PATHS: tuple[str, ...] = ("meta.json", "meta.bin")
+
+
+class MetaHeader(NamedTuple):
+    name: str
+    birth_timestamp: float
+
+
+def encode_meta(meta: "Experiment.Meta", **json_options: Any) -> bytes:
+    """Encode experiment meta in the compact format, which consists of a fixed
+    prefix (magic, birth timestamp, name size and body size), the UTF-8 name,
+    and the whole meta as compact JSON.
+    """
+    import json
+
+    json_options.setdefault("separators", (",", ":"))
+    name = meta["name"].encode()
+    body = json.dumps(meta, **json_options).encode()
+    prefix = PREFIX.pack(MAGIC, meta["birth_timestamp"], len(name), len(body))
+    return b"".join((prefix, name, body))
+
+
+def read_prefix(file: BinaryIO) -> tuple[bytes, tuple[float, int, int] | None]:
+    """Read the fixed prefix of a meta file.
+
+    Returns:
+        A tuple of (read_bytes, fields), where `fields` is a tuple of
+        (birth_timestamp, name_size, body_size) if the file is in the compact
+        format, or None otherwise (`read_bytes` then holds the beginning of
+        the file).
+    """
+    prefix = file.read(PREFIX.size)
+    if len(prefix) < PREFIX.size or not prefix.startswith(MAGIC):
+        return prefix, None
+    _magic, birth_timestamp, name_size, body_size = PREFIX.unpack(prefix)
+    return prefix, (birth_timestamp, name_size, body_size)
+
+
+def get_meta_file_paths(meta_file_path: Path | str | None = None) -> list[Path]:
+    """Get the candidate paths of meta files in experiment directories, i.e.
+    `meta_file_path` if given, or else `META_FILE_PATHS`.
+    """
+    if meta_file_path is not None:
+        return [Path(meta_file_path)]
+    return [Path(path) for path in META_FILE_PATHS]
+
+
+def find_meta_file(
+    dir_path: Path | str, meta_file_path: Path | str | None = None
+) -> Path | None:
+    """Find the meta file of the experiment directory at `dir_path`, i.e. the
+    first existing one of `get_meta_file_paths(meta_file_path)`.
+
+    Returns:
+        path (Path | None): Path to the meta file, or None if not found.
+    """
+    for path in get_meta_file_paths(meta_file_path):
+        path = Path(dir_path, path)
+        if path.is_file():
+            return path
+    return None
+
+
+def read_meta_header(path: Path | str) -> MetaHeader:
+    """Read the name and birth timestamp from a meta file. (Only the fixed
+    prefix and the name are read from compact meta files, while JSON meta
+    files are fully parsed.)
+
+    Returns:
+        header (MetaHeader): The name and birth timestamp.
+    """
+    with open(path, "rb") as file:
+        prefix, fields = read_prefix(file)
+        if fields is None:
+            meta = read_json_body(prefix + file.read())
+            return MetaHeader(meta["name"], meta["birth_timestamp"])
+        birth_timestamp, name_size, _body_size = fields
+        return MetaHeader(file.read(name_size).decode(), birth_timestamp)
+
+
+def read_json_body(body: bytes, **json_options: Any) -> "Experiment.Meta":
+    import json
+
+    return cast("Experiment.Meta", json.loads(body, **json_options))
+
+
+def read_meta_file(file: BinaryIO, **json_options: Any) -> "Experiment.Meta":
+    """Read experiment meta from an opened binary file in either format."""
+    prefix, fields = read_prefix(file)
+    if fields is None:
+        return read_json_body(prefix + file.read(), **json_options)
+    _birth_timestamp, name_size, body_size = fields
+    file.read(name_size)
+    body = file.read(body_size)
+    if len(body) != body_size:
+        raise ValueError("Truncated compact meta file!")
+    return read_json_body(body, **json_options)
+
+
+def read_meta(path: Path | str, **json_options: Any) -> "Experiment.Meta":
+    """Read experiment meta from a meta file in either format (detected by
+    its magic).
+    """
+    with open(path, "rb") as file:
+        return read_meta_file(file, **json_options)
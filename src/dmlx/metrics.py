@@ -0,0 +1,188 @@
+import atexit
+import json
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+MAGIC = b"DMLXMTRC"
+PREFIX = struct.Struct("<8sI")
+STEP_COLUMN = "step"
+
+
+def read_header(file: BinaryIO) -> tuple[list[str], int]:
+    """Read the header of a metrics file.
+
+    Returns:
+        A tuple of (columns, data_offset).
+    """
+    magic, header_size = PREFIX.unpack(file.read(PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError("Not a metrics file!")
+    header = json.loads(file.read(header_size))
+    return header["columns"], PREFIX.size + header_size
+
+
+def write_header(file: BinaryIO, columns: Sequence[str]) -> None:
+    """Write the header of a metrics file, padded so that rows are aligned to
+    8 bytes.
+    """
+    header = json.dumps({"columns": list(columns)}).encode()
+    header += b" " * (-(PREFIX.size + len(header)) % 8)
+    file.write(PREFIX.pack(MAGIC, len(header)))
+    file.write(header)
+
+
+class MetricsWriter:
+    """An append-only writer of metrics files. Each row consists of an int64
+    step and a float64 value per column (missing values are written as NaN).
+    Rows are buffered in memory and flushed to the file when `flush_rows` rows
+    are pending or `flush_interval` seconds have passed since the last flush.
+
+    Columns are taken from the existing file, from `columns`, or from the first
+    written row, in that order. A partially written last row in the existing
+    file (e.g. left by a crash) is truncated before appending. Pending rows are
+    also flushed when the interpreter exits, in case the writer is not closed.
+    """
+
+    path: Path
+    columns: list[str] | None
+    flush_rows: int
+    flush_interval: float
+
+    __row_struct: struct.Struct | None
+    __buffer: bytearray
+    __pending_rows: int
+    __last_flush_time: float
+    __closed: bool
+
+    def __init__(
+        self,
+        path: Path | str,
+        columns: Sequence[str] | None = None,
+        *,
+        flush_rows: int = 1024,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.columns = None
+        self.__row_struct = None
+        self.__buffer = bytearray()
+        self.__pending_rows = 0
+        self.__last_flush_time = monotonic()
+        self.__closed = False
+
+        if self.path.exists():
+            with self.path.open("r+b") as file:
+                existing_columns, data_offset = read_header(file)
+                if columns is not None and list(columns) != existing_columns:
+                    raise ValueError(
+                        f"Columns {list(columns)} mismatch existing columns "
+                        f"{existing_columns} in {self.path}!"
+                    )
+                self.__set_columns(existing_columns)
+                assert self.__row_struct is not None
+                size = file.seek(0, os.SEEK_END)
+                torn_size = (size - data_offset) % self.__row_struct.size
+                if torn_size:
+                    file.truncate(size - torn_size)
+        elif columns is not None:
+            self.__set_columns(columns)
+        atexit.register(self.close)
+
+    def __enter__(self) -> "MetricsWriter":
+        return self
+
+    def __exit__(self, _exception_type, _exception, _traceback) -> None:
+        self.close()
+
+    def __set_columns(self, columns: Sequence[str]) -> None:
+        if STEP_COLUMN in columns:
+            raise ValueError(f'Column name "{STEP_COLUMN}" is reserved!')
+        self.columns = list(columns)
+        self.__row_struct = struct.Struct("<q" + "d" * len(columns))
+
+    def write(self, step: int, **values: float) -> None:
+        """Append a row of metric values at `step`."""
+        if self.__closed:
+            raise RuntimeError("The metrics writer has been closed!")
+        if self.columns is None:
+            self.__set_columns(list(values))
+        assert self.columns is not None and self.__row_struct is not None
+
+        unknown_columns = values.keys() - self.columns
+        if unknown_columns:
+            raise ValueError(f"Unknown metric columns: {sorted(unknown_columns)}")
+
+        nan = float("nan")
+        self.__buffer += self.__row_struct.pack(
+            step, *(values.get(column, nan) for column in self.columns)
+        )
+        self.__pending_rows += 1
+        if (
+            self.__pending_rows >= self.flush_rows
+            or monotonic() - self.__last_flush_time >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows to the file."""
+        self.__last_flush_time = monotonic()
+        if self.columns is None:
+            return
+        if self.path.exists():
+            with self.path.open("ab") as file:
+                file.write(self.__buffer)
+        else:
+            with self.path.open("xb") as file:
+                write_header(file, self.columns)
+                file.write(self.__buffer)
+        self.__buffer.clear()
+        self.__pending_rows = 0
+
+    def close(self) -> None:
+        """Flush pending rows and close the writer."""
+        if not self.__closed:
+            self.flush()
+            self.discard()
+
+    def discard(self) -> None:
+        """Drop pending rows and close the writer."""
+        self.__buffer.clear()
+        self.__pending_rows = 0
+        self.__closed = True
+        atexit.unregister(self.close)
+
+
+def read_metrics(
+    path: Path | str, offset: int = 0, size: int | None = None
+) -> dict[str, "numpy.ndarray"]:
+    """Read a metrics file into NumPy arrays without parsing rows. (A trailing
+    partially written row, if any, is ignored.) If the metrics file is
+    embedded in a larger file (e.g. a pack), `offset` and `size` locate it.
+
+    Returns:
+        metrics (dict[str, numpy.ndarray]): A dict mapping "step" and each
+            column to its values.
+    """
+    import numpy
+
+    path = Path(path)
+    with path.open("rb") as file:
+        file.seek(offset)
+        columns, data_offset = read_header(file)
+    dtype = numpy.dtype(
+        [(STEP_COLUMN, "<i8"), *((column, "<f8") for column in columns)]
+    )
+    if size is None:
+        size = path.stat().st_size - offset
+    count = (size - data_offset) // dtype.itemsize
+    rows = numpy.fromfile(path, dtype, count, offset=offset + data_offset)
+    return {name: rows[name] for name in dtype.names or ()}
@@ -0,0 +1,280 @@
+import os
+import struct
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from time import time
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from zipfile import ZipFile
+
+INDEX_FILE_NAME = "index.db"
+PACK_SUFFIX = ".zip"
+LOCAL_HEADER_SIZE = 30
+# Offset of the file name and extra field lengths in a local file header.
+LOCAL_HEADER_LENGTHS = struct.Struct("<HH")
+LOCAL_HEADER_LENGTHS_OFFSET = 26
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packs (
+    name TEXT PRIMARY KEY,
+    pack TEXT NOT NULL
+);
+"""
+
+
+@lru_cache(maxsize=16)
+def open_pack(path: str, _mtime_ns: int) -> "ZipFile":
+    """Open a pack for reading. (Opened packs are cached, keyed by their
+    modification times, so that the central directory of a pack is read only
+    once until the pack changes.)
+    """
+    from zipfile import ZipFile
+
+    return ZipFile(path)
+
+
+class PackedArchive:
+    """The files of an experiment named `name` packed in the uncompressed
+    (ZIP_STORED) zip file at `pack_path`, which are read by seeking into the
+    pack without extracting them.
+    """
+
+    pack_path: Path
+    name: str
+
+    def __init__(self, pack_path: Path | str, name: str) -> None:
+        self.pack_path = Path(pack_path)
+        self.name = name
+
+    @property
+    def zip_file(self) -> "ZipFile":
+        return open_pack(str(self.pack_path), self.pack_path.stat().st_mtime_ns)
+
+    def member_name(self, path: Path | str) -> str:
+        """Get the name of the member holding the file at `path` relative to
+        the experiment directory.
+        """
+        return str(PurePosixPath(self.name, PurePosixPath(Path(path).as_posix())))
+
+    def exists(self, path: Path | str) -> bool:
+        return self.member_name(path) in self.zip_file.NameToInfo
+
+    def list(self) -> list[str]:
+        """List the paths of packed files relative to the experiment directory."""
+        prefix = self.name + "/"
+        return [
+            name.removeprefix(prefix)
+            for name in self.zip_file.namelist()
+            if name.startswith(prefix)
+        ]
+
+    def open(self, path: Path | str) -> IO[bytes]:
+        """Open the packed file at `path` (relative to the experiment directory)
+        as a seekable binary file.
+        """
+        try:
+            return self.zip_file.open(self.member_name(path))
+        except KeyError:
+            raise FileNotFoundError(f"{path} is not packed in {self.pack_path}!")
+
+    def locate(self, path: Path | str) -> tuple[int, int]:
+        """Locate the data of the packed file at `path` (relative to the
+        experiment directory) in the pack, e.g. for memory-mapping it.
+
+        Returns:
+            A tuple of (offset, size) in bytes.
+        """
+        from zipfile import ZIP_STORED
+
+        try:
+            info = self.zip_file.getinfo(self.member_name(path))
+        except KeyError:
+            raise FileNotFoundError(f"{path} is not packed in {self.pack_path}!")
+        if info.compress_type != ZIP_STORED:
+            raise ValueError(f"{path} is compressed in {self.pack_path}!")
+        with self.pack_path.open("rb") as file:
+            file.seek(info.header_offset + LOCAL_HEADER_LENGTHS_OFFSET)
+            name_length, extra_length = LOCAL_HEADER_LENGTHS.unpack(
+                file.read(LOCAL_HEADER_LENGTHS.size)
+            )
+        offset = info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+        return offset, info.file_size
+
+
+def find_packed_archive(pack_dir: Path | str, name: str) -> PackedArchive | None:
+    """Find the packed archive of the experiment named `name` through the index
+    of the packs in `pack_dir`.
+    """
+    import sqlite3
+
+    index_path = Path(pack_dir, INDEX_FILE_NAME)
+    if not index_path.exists():
+        return None
+    connection = sqlite3.connect(index_path)
+    try:
+        row = connection.execute(
+            "SELECT pack FROM packs WHERE name = ?", (name,)
+        ).fetchone()
+    finally:
+        connection.close()
+    if row is None:
+        return None
+    return PackedArchive(Path(pack_dir, row[0]), name)
+
+
+def is_finished(path: Path, journal_file_path: Path | str) -> bool:
+    """Check whether the experiment at `path` has finished (or failed)
+    according to its journal. (Experiments without journals are considered
+    finished.)
+    """
+    from .journal import read_journal, replay
+
+    try:
+        status = replay(read_journal(path / journal_file_path))["status"]
+    except FileNotFoundError:
+        return True
+    return status in ("finished", "failed")
+
+
+def rebuild_pack(pack_path: Path, group: list[tuple[str, Path]]) -> None:
+    """Add the files of experiments in `group` (pairs of name and directory)
+    to a copy of the pack at `pack_path` (if any), and replace the pack with
+    the synced copy atomically, so that the pack is intact if interrupted.
+    """
+    import shutil
+    from tempfile import mkstemp
+    from zipfile import ZIP_STORED, ZipFile
+
+    from .writer import get_umask
+
+    file_descriptor, temp_path = mkstemp(
+        dir=pack_path.parent, prefix=f".{pack_path.name}.", suffix=".tmp"
+    )
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(file_descriptor, 0o666 & ~get_umask())
+        with os.fdopen(file_descriptor, "r+b") as file:
+            mode = "w"
+            if pack_path.exists():
+                with pack_path.open("rb") as pack_file:
+                    shutil.copyfileobj(pack_file, file)
+                mode = "a"
+            with ZipFile(file, mode, ZIP_STORED, strict_timestamps=False) as zip_file:
+                for name, path in group:
+                    for file_path in sorted(path.rglob("*")):
+                        if file_path.is_file():
+                            relative_path = file_path.relative_to(path).as_posix()
+                            zip_file.write(file_path, f"{name}/{relative_path}")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, pack_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename durable before source directories are removed.
+        dir_descriptor = os.open(pack_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_descriptor)
+        finally:
+            os.close(dir_descriptor)
+
+
+def pack(
+    base_dir: Path | str,
+    *,
+    pack_dir: Path | str = ".packs",
+    meta_file_path: Path | str | None = None,
+    journal_file_path: Path | str = "journal.jsonl",
+    period_format: str = "%Y-%m",
+    min_age: float = 0.0,
+    dry_run: bool = False,
+) -> dict[str, list[str]]:
+    """Pack finished experiments under `base_dir` (see `is_finished()`) whose
+    files were last modified at least `min_age` seconds ago into uncompressed
+    zip files in `pack_dir` (relative to `base_dir`), one per period of birth
+    time (formatted by `period_format`), and remove their directories. Packed
+    experiments are indexed by name in `pack_dir`, so that they can be found
+    without opening every pack. Packs are never modified in place: each one is
+    rebuilt in a temporary file which replaces it atomically, and directories
+    are only removed once their files are in the pack and indexed, so packing
+    is resumable if interrupted. (Nothing else should write to `pack_dir`
+    meanwhile.)
+
+    Returns:
+        packed (dict[str, list[str]]): A dict mapping pack file names to the
+            names of experiments packed (or, if `dry_run` is set, to be packed)
+            into them.
+    """
+    import shutil
+    import sqlite3
+    from zipfile import ZipFile
+
+    from .layout import find_archives
+    from .metafile import find_meta_file, read_meta_header
+
+    base_dir = Path(base_dir)
+    pack_dir = base_dir / pack_dir
+    now = time()
+    plan: dict[str, list[tuple[str, Path, Path]]] = {}
+    for path in find_archives(base_dir, meta_file_path):
+        if not is_finished(path, journal_file_path):
+            continue
+        file_paths = [file_path for file_path in path.rglob("*") if file_path.is_file()]
+        last_mtime = max(file_path.stat().st_mtime for file_path in file_paths)
+        if now - last_mtime < min_age:
+            continue
+        meta_path = find_meta_file(path, meta_file_path)
+        assert meta_path is not None
+        header = read_meta_header(meta_path)
+        period = datetime.fromtimestamp(header.birth_timestamp).strftime(period_format)
+        plan.setdefault(period + PACK_SUFFIX, []).append(
+            (header.name, path, meta_path.relative_to(path))
+        )
+
+    if dry_run:
+        return {
+            pack_name: [name for name, _, _ in group]
+            for pack_name, group in plan.items()
+        }
+
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(pack_dir / INDEX_FILE_NAME)
+    connection.executescript(SCHEMA)
+    packed: dict[str, list[str]] = {}
+    try:
+        for pack_name, group in plan.items():
+            pack_path = pack_dir / pack_name
+            pack_path.parent.mkdir(parents=True, exist_ok=True)
+            packed_names: set[str] = set()
+            if pack_path.exists():
+                with ZipFile(pack_path) as zip_file:
+                    packed_names.update(zip_file.namelist())
+            unpacked = [
+                (name, path)
+                for name, path, meta_path in group
+                # Skip experiments packed before an interruption.
+                if f"{name}/{meta_path.as_posix()}" not in packed_names
+            ]
+            if unpacked:
+                rebuild_pack(pack_path, unpacked)
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO packs (name, pack) VALUES (?, ?)",
+                    ((name, pack_name) for name, _, _ in group),
+                )
+            for _, path, _ in group:
+                shutil.rmtree(path)
+                for parent in path.parents:
+                    if parent == base_dir or not parent.is_relative_to(base_dir):
+                        break
+                    try:
+                        parent.rmdir()
+                    except OSError:
+                        break
+            packed[pack_name] = [name for name, _, _ in group]
+    finally:
+        connection.close()
+    return packed
@@ -0,0 +1,114 @@
+from collections.abc import Callable, Iterable, Iterator
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any
+
+ITEM = 0
+END = 1
+ERROR = 2
+
+
+class Prefetcher:
+    """An iterable wrapper that consumes the iterator of `source` in a
+    background thread, keeping at most `buffer_size` items (or batches) ready
+    ahead of the consumer, so that producing items overlaps with consuming
+    them. Each iteration starts a new background thread over a fresh iterator
+    of `source`, and errors raised by the source are re-raised to the consumer.
+
+    If `batch_size` is given, items are grouped into lists of that size (the
+    last batch may be smaller unless `drop_last` is set), which are passed to
+    `collate` (if given) in the background thread.
+    """
+
+    source: Iterable[Any]
+    buffer_size: int
+    batch_size: int | None
+    collate: Callable[[list[Any]], object] | None
+    drop_last: bool
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        buffer_size: int = 2,
+        *,
+        batch_size: int | None = None,
+        collate: Callable[[list[Any]], object] | None = None,
+        drop_last: bool = False,
+    ) -> None:
+        if buffer_size < 1:
+            raise ValueError("`buffer_size` must be positive!")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("`batch_size` must be positive!")
+        self.source = source
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.collate = collate
+        self.drop_last = drop_last
+
+    def __len__(self) -> int:
+        length = len(self.source)  # type: ignore[arg-type]
+        if self.batch_size is None:
+            return length
+        if self.drop_last:
+            return length // self.batch_size
+        return -(-length // self.batch_size)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "source":
+            raise AttributeError(name)
+        return getattr(self.source, name)
+
+    def __iter_batches(self) -> Iterator[object]:
+        batch_size = self.batch_size
+        if batch_size is None:
+            yield from self.source
+            return
+        batch: list[Any] = []
+        for item in self.source:
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield self.collate(batch) if self.collate else batch
+                batch = []
+        if batch and not self.drop_last:
+            yield self.collate(batch) if self.collate else batch
+
+    def __produce(self, queue: "Queue[tuple[int, Any]]", stop_event: Event) -> None:
+        def put(message: tuple[int, Any]) -> bool:
+            while not stop_event.is_set():
+                try:
+                    queue.put(message, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        try:
+            for item in self.__iter_batches():
+                if not put((ITEM, item)):
+                    return
+        except BaseException as error:
+            put((ERROR, error))
+        else:
+            put((END, None))
+
+    def __iter__(self) -> Iterator[Any]:
+        queue: Queue[tuple[int, Any]] = Queue(self.buffer_size)
+        stop_event = Event()
+        Thread(target=self.__produce, args=(queue, stop_event), daemon=True).start()
+        try:
+            while True:
+                kind, value = queue.get()
+                if kind == ITEM:
+                    yield value
+                elif kind == END:
+                    return
+                else:
+                    raise value
+        finally:
+            # Stop the producer if the consumer stops early.
+            stop_event.set()
+            try:
+                while True:
+                    queue.get_nowait()
+            except Empty:
+                pass
@@ -1,11 +1,17 @@
-from functools import cache
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-import click
+from . import shared
+from .cache import CacheInfo, InstanceCache
+from .context import ExperimentContext, get_current_experiment
 
-from .context import get_current_experiment
+if TYPE_CHECKING:  # pragma: no cover
+    import click
 
+    from .shared import SharedHandle
 
-def param(cls: type[click.Parameter], *args, **kwargs) -> property:
+
+def param(cls: "type[click.Parameter]", *args, **kwargs) -> property:
     """Create a param property that is to be read from the experiment command.
     (This is a helper function that invokes `experiment.param()` on the
     active experiment in current context.)
@@ -29,23 +35,102 @@ def option(*args, **kwargs) -> property:
     return get_current_experiment().option(*args, **kwargs)
 
 
-def component(locator_source: property | str, *args, **kwargs) -> property:
+class ComponentProperty(property):
+    """A property whose values are cached per instance. (Deleting the property
+    from an instance invalidates its cached value.)
+    """
+
+    cache: InstanceCache
+    get_locator: Callable[[object], str]
+    owner: type | None = None
+    name: str | None = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def get_shared_key(self, locator: str) -> str:
+        """Get the key of the component created from `locator` in the
+        registry of `dmlx.shared`.
+        """
+        from .component import normalize_locator
+
+        owner = self.owner
+        owner_name = f"{owner.__module__}.{owner.__qualname__}" if owner else ""
+        return f"{owner_name}.{self.name}:{normalize_locator(locator)}"
+
+    def share(self, instance: object) -> "SharedHandle":
+        """Publish the component of `instance` through shared memory (see
+        `dmlx.shared.share()`), so that accessing the property in this process,
+        in processes forked afterwards, or in processes where the registry is
+        installed, attaches the shared component instead of creating it again.
+        (The cached component of `instance` is replaced by the shared one.)
+
+        Returns:
+            handle (SharedHandle): The handle of the shared component.
+        """
+        assert self.fget is not None
+        key = self.get_shared_key(self.get_locator(instance))
+        handle = shared.share(key, self.fget(instance))
+        self.cache.invalidate(instance)
+        return handle
+
+    def cache_info(self) -> CacheInfo:
+        """Get cache statistics of the property."""
+        return self.cache.info()
+
+    def cache_clear(self) -> None:
+        """Drop all cached values of the property."""
+        self.cache.clear()
+
+
+def component(
+    locator_source: property | str,
+    *args,
+    maxsize: int | None = 128,
+    **kwargs,
+) -> ComponentProperty:
     """Create a component property that acts as a component factory.
     (The extra args are passed to `Component` to create the underlying factory.)
+    Created components are cached per instance in an `InstanceCache` holding
+    at most `maxsize` entries and weak references to the instances. Components
+    shared by `ComponentProperty.share()` are attached instead of being created.
     """
     from .component import Component
 
     component_factory = Component(*args, **kwargs)
+    component_cache: InstanceCache[object] = InstanceCache(maxsize)
 
-    @cache
-    def component_getter(self) -> object:
+    def get_locator(self) -> str:
         if isinstance(locator_source, property):
             assert locator_source.fget is not None, (
                 "Cannot get the component locator from the given property."
             )
-            locator = locator_source.fget(self)
+            return locator_source.fget(self)
         else:
-            locator = getattr(self, locator_source)
-        return component_factory(locator)
+            return getattr(self, locator_source)
+
+    def create_component(self) -> object:
+        locator = get_locator(self)
+        if shared.handles:
+            shared_component = shared.lookup(component_property.get_shared_key(locator))
+            if shared_component is not shared.MISSING:
+                return shared_component
+        experiment = ExperimentContext._current_experiment
+        if experiment is None:
+            return component_factory(locator)
+        with experiment.span(
+            "component", property=component_property.name, locator=locator
+        ):
+            return component_factory(locator)
+
+    def component_getter(self) -> object:
+        return component_cache.get(self, create_component)
+
+    def component_deleter(self) -> None:
+        component_cache.invalidate(self)
 
-    return property(component_getter)
+    component_property = ComponentProperty(component_getter, None, component_deleter)
+    component_property.cache = component_cache
+    component_property.get_locator = get_locator
+    return component_property
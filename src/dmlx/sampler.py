@@ -0,0 +1,197 @@
+import os
+import sys
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic
+from typing import TypedDict
+
+from .metrics import MetricsWriter
+
+COLUMNS = ("time", "cpu_time", "rss", "threads", "read_bytes", "write_bytes")
+PROC_DIR = Path("/proc/self")
+
+
+class ResourceSummary(TypedDict):
+    samples: int
+    duration: float
+    cpu_time: float
+    cpu_utilization_mean: float
+    cpu_utilization_peak: float
+    rss_mean: float
+    rss_peak: float
+    threads_peak: float
+    read_bytes: float
+    write_bytes: float
+
+
+def read_resource_usage() -> dict[str, float]:
+    """Read resource usage of the current process from `/proc/self`. (Only
+    available on Linux. I/O counters are NaN if `/proc/self/io` is unreadable.)
+
+    Returns:
+        usage (dict[str, float]): CPU time (in seconds), RSS (in bytes), thread
+            count and read/write bytes.
+    """
+    with (PROC_DIR / "stat").open("r") as file:
+        # Fields after the command name, which may contain spaces.
+        stat_fields = file.read().rpartition(")")[2].split()
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    cpu_time = (int(stat_fields[11]) + int(stat_fields[12])) / clock_ticks
+    threads = float(stat_fields[17])
+
+    with (PROC_DIR / "statm").open("r") as file:
+        rss = float(int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+
+    io_counters: dict[str, float] = {}
+    try:
+        with (PROC_DIR / "io").open("r") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                io_counters[key] = float(value)
+    except OSError:
+        pass
+
+    nan = float("nan")
+    return dict(
+        cpu_time=cpu_time,
+        rss=rss,
+        threads=threads,
+        read_bytes=io_counters.get("read_bytes", nan),
+        write_bytes=io_counters.get("write_bytes", nan),
+    )
+
+
+class ResourceSampler:
+    """A daemon thread that samples resource usage of the current process every
+    `interval` seconds and streams the samples into a metrics file at `path`
+    (see `dmlx.metrics`). Samples are kept in memory until the directory of
+    `path` exists, and are flushed every `flush_interval` seconds afterwards.
+    """
+
+    path: Path
+    interval: float
+    flush_interval: float
+
+    __writer: MetricsWriter
+    __stop_event: Event
+    __thread: Thread | None
+    __start_time: float
+    __samples: int
+    __first_usage: dict[str, float] | None
+    __last_usage: dict[str, float] | None
+    __last_time: float
+    __cpu_utilization_peak: float
+    __rss_total: float
+    __rss_peak: float
+    __threads_peak: float
+
+    def __init__(
+        self,
+        path: Path | str,
+        interval: float = 1.0,
+        *,
+        flush_interval: float = 10.0,
+    ) -> None:
+        if not (PROC_DIR / "stat").exists():
+            raise RuntimeError("Resource sampling requires `/proc/self`!")
+        self.path = Path(path)
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.__writer = MetricsWriter(
+            self.path, COLUMNS, flush_rows=sys.maxsize, flush_interval=float("inf")
+        )
+        self.__stop_event = Event()
+        self.__thread = None
+        self.__samples = 0
+        self.__first_usage = None
+        self.__last_usage = None
+        self.__cpu_utilization_peak = 0.0
+        self.__rss_total = 0.0
+        self.__rss_peak = 0.0
+        self.__threads_peak = 0.0
+
+    def __sample(self) -> None:
+        now = monotonic()
+        usage = read_resource_usage()
+        if self.__last_usage is None:
+            self.__first_usage = usage
+        else:
+            elapsed = now - self.__last_time
+            if elapsed > 0:
+                cpu_utilization = (
+                    usage["cpu_time"] - self.__last_usage["cpu_time"]
+                ) / elapsed
+                self.__cpu_utilization_peak = max(
+                    self.__cpu_utilization_peak, cpu_utilization
+                )
+        self.__last_usage = usage
+        self.__last_time = now
+        self.__rss_total += usage["rss"]
+        self.__rss_peak = max(self.__rss_peak, usage["rss"])
+        self.__threads_peak = max(self.__threads_peak, usage["threads"])
+        self.__writer.write(self.__samples, time=now - self.__start_time, **usage)
+        self.__samples += 1
+
+    def __flush(self) -> None:
+        if self.path.parent.is_dir():
+            self.__writer.flush()
+
+    def __work(self) -> None:
+        last_flush_time = monotonic()
+        while not self.__stop_event.wait(self.interval):
+            self.__sample()
+            if monotonic() - last_flush_time >= self.flush_interval:
+                self.__flush()
+                last_flush_time = monotonic()
+
+    def relocate(self, path: Path | str) -> None:
+        """Change the path of the metrics file, which must not have been
+        flushed to yet.
+        """
+        if self.path.exists():
+            raise RuntimeError(f"Samples have been flushed to {self.path}!")
+        self.path = self.__writer.path = Path(path)
+
+    def start(self) -> None:
+        """Take the first sample and start sampling in the background."""
+        if self.__thread is not None:
+            raise RuntimeError("The resource sampler has been started!")
+        self.__start_time = monotonic()
+        self.__sample()
+        self.__thread = Thread(target=self.__work, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> ResourceSummary:
+        """Take the last sample, stop sampling and flush samples (if the
+        directory of `path` exists, or discard them otherwise).
+
+        Returns:
+            summary (ResourceSummary): Summary of the samples.
+        """
+        if self.__thread is None:
+            raise RuntimeError("The resource sampler has not been started!")
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__sample()
+        if self.path.parent.is_dir():
+            self.__writer.close()
+        else:
+            self.__writer.discard()
+
+        assert self.__first_usage is not None and self.__last_usage is not None
+        duration = self.__last_time - self.__start_time
+        cpu_time = self.__last_usage["cpu_time"] - self.__first_usage["cpu_time"]
+        return ResourceSummary(
+            samples=self.__samples,
+            duration=duration,
+            cpu_time=cpu_time,
+            cpu_utilization_mean=cpu_time / duration if duration > 0 else 0.0,
+            cpu_utilization_peak=self.__cpu_utilization_peak,
+            rss_mean=self.__rss_total / self.__samples,
+            rss_peak=self.__rss_peak,
+            threads_peak=self.__threads_peak,
+            read_bytes=self.__last_usage["read_bytes"]
+            - self.__first_usage["read_bytes"],
+            write_bytes=self.__last_usage["write_bytes"]
+            - self.__first_usage["write_bytes"],
+        )
@@ -0,0 +1,257 @@
+import os
+import socket
+import struct
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import BinaryIO
+
+FRAME_PREFIX = struct.Struct("<BI")
+EXIT_CODE = struct.Struct("<i")
+
+REQUEST = 0
+STDOUT = 1
+STDERR = 2
+EXIT = 3
+
+CHUNK_SIZE = 1 << 16
+
+
+def send_frame(connection: socket.socket, kind: int, payload: bytes) -> None:
+    """Send a frame consisting of a kind byte, the payload size and the
+    payload.
+    """
+    connection.sendall(FRAME_PREFIX.pack(kind, len(payload)) + payload)
+
+
+def receive_frame(file: BinaryIO) -> tuple[int, bytes] | None:
+    """Receive a frame from a buffered file of a connection.
+
+    Returns:
+        frame (tuple[int, bytes] | None): A tuple of (kind, payload), or None
+            if the connection is closed.
+    """
+    prefix = file.read(FRAME_PREFIX.size)
+    if len(prefix) < FRAME_PREFIX.size:
+        return None
+    kind, size = FRAME_PREFIX.unpack(prefix)
+    payload = file.read(size)
+    if len(payload) < size:
+        return None
+    return kind, payload
+
+
+class ExperimentServer:
+    """A server that keeps `preload` modules (e.g. heavy model and dataset
+    modules) imported and runs an experiment script once per request received
+    over a Unix domain socket at `socket_path`. Each request is handled in a
+    forked process, which forks again to execute the script as `__main__` with
+    the requested args, working directory and environment, so that each run
+    gets a fresh `Experiment` instance and leaves no state behind. The stdout
+    and stderr of runs are streamed back, followed by their exit codes.
+    """
+
+    script: str
+    socket_path: Path
+    preload: list[str]
+
+    __listener: socket.socket | None
+
+    def __init__(
+        self,
+        script: Path | str,
+        socket_path: Path | str,
+        preload: Iterable[str] = (),
+    ) -> None:
+        self.script = str(Path(script).resolve())
+        self.socket_path = Path(socket_path)
+        self.preload = list(preload)
+        self.__listener = None
+
+    def __enter__(self) -> "ExperimentServer":
+        return self
+
+    def __exit__(self, _exception_type, _exception, _traceback) -> None:
+        self.close()
+
+    def warm_up(self) -> None:
+        """Import `preload` modules (with the directory of the script on
+        `sys.path`, as when the script is run directly).
+        """
+        from importlib import import_module
+
+        sys.path.insert(0, str(Path(self.script).parent))
+        import_module("dmlx.experiment")
+        for module_name in self.preload:
+            import_module(module_name)
+
+    def listen(self) -> None:
+        """Warm up and start listening on `socket_path`."""
+        if self.__listener is not None:
+            raise RuntimeError("The server is already listening!")
+        self.warm_up()
+        # Bind to a temporary path and move it into place once listening, so
+        # that clients never see a socket file refusing connections.
+        temp_path = self.socket_path.with_name(
+            f".{self.socket_path.name}.{os.getpid()}"
+        )
+        temp_path.unlink(missing_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(str(temp_path))
+            listener.listen()
+            os.replace(temp_path, self.socket_path)
+        except BaseException:
+            listener.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+        self.__listener = listener
+
+    def serve(self, max_requests: int | None = None) -> None:
+        """Handle requests until `max_requests` requests are accepted (or
+        forever), and wait for their handlers to finish.
+        """
+        if self.__listener is None:
+            self.listen()
+        assert self.__listener is not None
+
+        handler_pids: set[int] = set()
+        accepted_requests = 0
+        try:
+            while max_requests is None or accepted_requests < max_requests:
+                connection, _ = self.__listener.accept()
+                accepted_requests += 1
+                sys.stdout.flush()
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    exit_code = 1
+                    try:
+                        self.__listener.close()
+                        with connection:
+                            self.__handle(connection)
+                        exit_code = 0
+                    finally:
+                        os._exit(exit_code)
+                connection.close()
+                handler_pids.add(pid)
+                # Reap finished handlers.
+                for handler_pid in list(handler_pids):
+                    if os.waitpid(handler_pid, os.WNOHANG)[0]:
+                        handler_pids.discard(handler_pid)
+        finally:
+            for handler_pid in handler_pids:
+                os.waitpid(handler_pid, 0)
+
+    def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self.__listener is not None:
+            self.__listener.close()
+            self.__listener = None
+            self.socket_path.unlink(missing_ok=True)
+
+    def __handle(self, connection: socket.socket) -> None:
+        import json
+        import selectors
+
+        with connection.makefile("rb") as file:
+            frame = receive_frame(file)
+        if frame is None or frame[0] != REQUEST:
+            return
+        request = json.loads(frame[1])
+
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                connection.close()
+                os.close(stdout_read)
+                os.close(stderr_read)
+                os.dup2(stdout_write, 1)
+                os.dup2(stderr_write, 2)
+                os.close(stdout_write)
+                os.close(stderr_write)
+                exit_code = self.__run(request)
+            finally:
+                os._exit(exit_code)
+
+        os.close(stdout_write)
+        os.close(stderr_write)
+        selector = selectors.DefaultSelector()
+        selector.register(stdout_read, selectors.EVENT_READ, STDOUT)
+        selector.register(stderr_read, selectors.EVENT_READ, STDERR)
+        client_connected = True
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, CHUNK_SIZE)
+                if not data:
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                elif client_connected:
+                    try:
+                        send_frame(connection, key.data, data)
+                    except OSError:
+                        client_connected = False
+        _, status = os.waitpid(pid, 0)
+        if client_connected:
+            send_frame(
+                connection, EXIT, EXIT_CODE.pack(os.waitstatus_to_exitcode(status))
+            )
+
+    def __run(self, request: dict) -> int:
+        from .sweep import exec_script
+
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.stdout.reconfigure(line_buffering=True)  # type: ignore[union-attr]
+        exit_code, error = exec_script(self.script, request["argv"])
+        if error is not None:
+            sys.stderr.write(error)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        return exit_code
+
+
+def call(
+    socket_path: Path | str,
+    argv: Sequence[str],
+    *,
+    cwd: Path | str | None = None,
+    env: dict[str, str] | None = None,
+    stdout: BinaryIO | None = None,
+    stderr: BinaryIO | None = None,
+) -> int:
+    """Run the script of the server listening on `socket_path` with `argv` as
+    command args, in `cwd` with `env` as the environment (defaulting to those
+    of the current process), and copy its output to `stdout` and `stderr`
+    (defaulting to those of the current process) as it is streamed back.
+
+    Returns:
+        exit_code (int): The exit code of the run.
+    """
+    import json
+
+    if stdout is None:
+        stdout = sys.stdout.buffer
+    if stderr is None:
+        stderr = sys.stderr.buffer
+    request = {
+        "argv": list(argv),
+        "cwd": str(Path(cwd or os.getcwd()).resolve()),
+        "env": dict(os.environ if env is None else env),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        send_frame(connection, REQUEST, json.dumps(request).encode())
+        with connection.makefile("rb") as file:
+            while (frame := receive_frame(file)) is not None:
+                kind, payload = frame
+                if kind == EXIT:
+                    return EXIT_CODE.unpack(payload)[0]
+                output = stdout if kind == STDOUT else stderr
+                output.write(payload)
+                output.flush()
+    raise ConnectionError("The connection was closed before the run exited!")
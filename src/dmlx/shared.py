@@ -0,0 +1,182 @@
+import os
+import sys
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.shared_memory import SharedMemory
+
+ALIGNMENT = 64
+
+
+class SharedHandle(NamedTuple):
+    """A picklable handle of a shared object, consisting of the name of the
+    shared memory segment holding its out-of-band buffers (None if there are
+    none), its pickle payload, and the offsets and sizes of the buffers.
+    """
+
+    segment: str | None
+    payload: bytes
+    buffers: tuple[tuple[int, int], ...]
+
+
+MISSING = object()
+
+# Shared keys mapped to handles (inherited by forked and installed in spawned
+# processes) and to attached objects of the current process.
+handles: dict[str, SharedHandle] = {}
+objects: dict[str, object] = {}
+# Memory maps of segments, which stay valid while buffers are attached.
+segments: dict[str, memoryview] = {}
+# Segments created by the current process (tagged with its PID, as forked
+# processes inherit this list).
+owned_segments: list[tuple[int, "SharedMemory"]] = []
+
+
+def map_segment(segment: "SharedMemory") -> memoryview:
+    """Map a shared memory segment independently of the `SharedMemory` object,
+    which is closed afterwards, so that memory views exported from the map
+    never prevent closing it. (Only available on POSIX.)
+    """
+    import mmap
+
+    memory = memoryview(
+        mmap.mmap(segment._fd, segment.size)  # type: ignore[attr-defined]
+    )
+    segment.close()
+    return memory
+
+
+def publish(value: object) -> SharedHandle:
+    """Pickle `value` with protocol 5 and copy its out-of-band buffers (e.g.
+    NumPy array data) into a new shared memory segment owned by the current
+    process, which is unlinked when the process exits or `release()` is called.
+
+    Returns:
+        handle (SharedHandle): The handle for attaching the object.
+    """
+    import pickle
+    from multiprocessing.shared_memory import SharedMemory
+
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    if not buffers:
+        return SharedHandle(None, payload, ())
+
+    layout: list[tuple[int, int]] = []
+    size = 0
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    for raw_buffer in raw_buffers:
+        size += -size % ALIGNMENT
+        layout.append((size, raw_buffer.nbytes))
+        size += raw_buffer.nbytes
+
+    segment = SharedMemory(create=True, size=max(size, 1))
+    memory = map_segment(segment)
+    for (offset, nbytes), raw_buffer in zip(layout, raw_buffers):
+        memory[offset : offset + nbytes] = raw_buffer
+    if not owned_segments:
+        import atexit
+
+        atexit.register(release)
+    owned_segments.append((os.getpid(), segment))
+    segments[segment.name] = memory
+    return SharedHandle(segment.name, payload, tuple(layout))
+
+
+def attach(handle: SharedHandle) -> object:
+    """Reconstruct a published object from its handle without copying its
+    out-of-band buffers, which are exposed read-only.
+    """
+    import pickle
+
+    if handle.segment is None:
+        return pickle.loads(handle.payload)
+
+    memory = segments.get(handle.segment)
+    if memory is None:
+        memory = segments[handle.segment] = map_segment(open_segment(handle.segment))
+    memory = memory.toreadonly()
+    return pickle.loads(
+        handle.payload,
+        buffers=[memory[offset : offset + nbytes] for offset, nbytes in handle.buffers],
+    )
+
+
+def open_segment(name: str) -> "SharedMemory":
+    """Open an existing shared memory segment without registering it to the
+    resource tracker, which would otherwise unlink it when the current process
+    exits.
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+
+    from multiprocessing import resource_tracker
+
+    # Before Python 3.13, attaching registers the segment as if it were created
+    # by the current process. (Unregistering afterwards is not an option, as
+    # the resource tracker may be shared with the creator.)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None  # type: ignore[assignment]
+    try:
+        return SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def share(key: str, value: object) -> SharedHandle:
+    """Publish `value` and register it under `key`, so that `lookup(key)`
+    attaches it in the current process, in processes forked afterwards, and in
+    processes where `install(snapshot())` is called.
+
+    Returns:
+        handle (SharedHandle): The handle of the published value.
+    """
+    handle = publish(value)
+    handles[key] = handle
+    objects.pop(key, None)
+    return handle
+
+
+def lookup(key: str) -> object:
+    """Get the shared object registered under `key` (attaching it on first
+    lookup), or `MISSING` if there is none.
+    """
+    value = objects.get(key, MISSING)
+    if value is MISSING:
+        handle = handles.get(key)
+        if handle is None:
+            return MISSING
+        value = objects[key] = attach(handle)
+    return value
+
+
+def snapshot() -> dict[str, SharedHandle]:
+    """Get the registered handles, to be passed to `install()` in processes
+    that do not inherit the registry (e.g. spawned workers).
+    """
+    return dict(handles)
+
+
+def install(registered_handles: dict[str, SharedHandle]) -> None:
+    """Register the handles obtained from `snapshot()` in another process.
+    (Can be used as the initializer of worker pools.)
+    """
+    handles.update(registered_handles)
+
+
+def release() -> None:
+    """Unregister all shared objects and unlink segments owned by the current
+    process. (Objects attached from them stay valid until they are dropped.)
+    """
+    handles.clear()
+    objects.clear()
+    while owned_segments:
+        owner_pid, segment = owned_segments.pop()
+        if owner_pid != os.getpid():
+            continue
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,312 @@
+import json
+import os
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import product
+from pathlib import Path
+from time import perf_counter, time
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.sharedctypes import Synchronized
+    from types import ModuleType
+
+
+class RunSummary(TypedDict):
+    index: int
+    argv: list[str]
+    status: str
+    exit_code: int
+    error: str | None
+    start_timestamp: float
+    duration: float
+    pid: int
+    cpus: list[int]
+    experiments: list[str]
+
+
+class SweepSummary(TypedDict):
+    script: str
+    start_timestamp: float
+    duration: float
+    runs: list[RunSummary]
+
+
+def expand_grid(grid: Mapping[str, Iterable[object]]) -> list[list[str]]:
+    """Expand a parameter grid into a list of command args.
+
+    - Keys starting with "-" are treated as option names, and keys not starting
+      with "-" are treated as positional arguments (in insertion order)
+    - `True` values add the option as a flag, and `False` values omit it
+    - Other values are converted by `str()`
+
+    Returns:
+        arg_sets (list[list[str]]): The expanded command args.
+    """
+    keys = list(grid)
+    arg_sets: list[list[str]] = []
+    for values in product(*(grid[key] for key in keys)):
+        positional_args: list[str] = []
+        option_args: list[str] = []
+        for key, value in zip(keys, values):
+            if not key.startswith("-"):
+                positional_args.append(str(value))
+            elif value is True:
+                option_args.append(key)
+            elif value is not False:
+                option_args.extend((key, str(value)))
+        arg_sets.append(positional_args + option_args)
+    return arg_sets
+
+
+_baseline_modules: set[str] = set()
+# Directories of local modules (of the script and the working directory).
+_local_dirs: list[Path] = []
+INSTALL_DIR_NAMES = frozenset(("site-packages", "dist-packages"))
+
+
+def is_local_module(module: "ModuleType", local_dirs: Iterable[Path]) -> bool:
+    """Check whether a module is loaded from a file under one of `local_dirs`
+    and not from installed packages (e.g. a virtual environment there).
+    """
+    file_path = getattr(module, "__file__", None)
+    if file_path is None:
+        return False
+    path = Path(file_path).resolve()
+    return any(
+        path.is_relative_to(local_dir)
+        and INSTALL_DIR_NAMES.isdisjoint(path.relative_to(local_dir).parts)
+        for local_dir in local_dirs
+    )
+
+
+def _initialize_worker(
+    script_dir: str,
+    preload: Sequence[str],
+    worker_counter: "Synchronized[int] | None",
+    base_dir: str | None,
+) -> None:
+    from importlib import import_module
+
+    from .experiment import Experiment
+
+    sys.path.insert(0, script_dir)
+    for module_name in preload:
+        import_module(module_name)
+    _baseline_modules.update(sys.modules)
+    _local_dirs.extend({Path(script_dir).resolve(), Path.cwd().resolve()})
+
+    if base_dir is not None:
+        Experiment.BASE_DIR = Path(base_dir)
+
+    if worker_counter is not None and hasattr(os, "sched_setaffinity"):
+        with worker_counter.get_lock():
+            worker_index = worker_counter.value
+            worker_counter.value += 1
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker_index % len(cpus)]})
+
+
+def exec_script(
+    script: str, argv: Sequence[str], main_module: "ModuleType | None" = None
+) -> tuple[int, str | None]:
+    """Execute a script as `__main__` with `argv` as command args, in the
+    namespace of `main_module` (or a new module) in the current process.
+    (`sys.orig_argv` is also set as if the script were run by the current
+    interpreter, so that experiments record the command line of the run.)
+
+    Returns:
+        A tuple of (exit_code, error), where `error` is the formatted traceback
+        of the uncaught exception or the non-integer exit message, if any.
+    """
+    from traceback import format_exc
+    from types import ModuleType
+
+    if main_module is None:
+        main_module = ModuleType("__main__")
+    main_module.__file__ = script
+    original_main_module = sys.modules["__main__"]
+    original_argv = sys.argv
+    original_orig_argv = sys.orig_argv
+    sys.modules["__main__"] = main_module
+    sys.argv = [script, *argv]
+    sys.orig_argv = [sys.executable, script, *argv]
+
+    error: str | None = None
+    try:
+        with open(script, "rb") as file:
+            code = compile(file.read(), script, "exec")
+        exec(code, main_module.__dict__)
+        exit_code = 0
+    except SystemExit as exception:
+        if exception.code is None:
+            exit_code = 0
+        elif isinstance(exception.code, int):
+            exit_code = exception.code
+        else:
+            exit_code = 1
+            error = str(exception.code)
+    except BaseException:
+        exit_code = 1
+        error = format_exc()
+    finally:
+        sys.modules["__main__"] = original_main_module
+        sys.argv = original_argv
+        sys.orig_argv = original_orig_argv
+    return exit_code, error
+
+
+def _run_script(script: str, index: int, argv: list[str]) -> RunSummary:
+    from types import ModuleType
+
+    from .experiment import Experiment
+
+    main_module = ModuleType("__main__")
+    start_timestamp = time()
+    start_counter = perf_counter()
+    try:
+        exit_code, error = exec_script(script, argv, main_module)
+    finally:
+        duration = perf_counter() - start_counter
+        # Purge local modules imported by the run so that the next run gets
+        # fresh params bound to its own experiment, while installed packages
+        # (e.g. extension modules, which cannot be imported twice) are kept.
+        for module_name in set(sys.modules) - _baseline_modules:
+            if is_local_module(sys.modules[module_name], _local_dirs):
+                del sys.modules[module_name]
+        if "dmlx.component" in sys.modules:
+            sys.modules["dmlx.component"].resolve_factory.cache_clear()
+
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    experiments = [
+        str(value.path)
+        for value in vars(main_module).values()
+        if isinstance(value, Experiment) and value.path.is_dir()
+    ]
+    return RunSummary(
+        index=index,
+        argv=argv,
+        status="succeeded" if exit_code == 0 else "failed",
+        exit_code=exit_code,
+        error=error,
+        start_timestamp=start_timestamp,
+        duration=duration,
+        pid=os.getpid(),
+        cpus=cpus,
+        experiments=experiments,
+    )
+
+
+def _get_failed_run(index: int, argv: list[str], exception: Exception) -> RunSummary:
+    """Summarize a run that failed without reporting back from its worker."""
+    from traceback import format_exception_only
+
+    return RunSummary(
+        index=index,
+        argv=argv,
+        status="failed",
+        exit_code=1,
+        error="".join(format_exception_only(type(exception), exception)),
+        start_timestamp=time(),
+        duration=0.0,
+        pid=0,
+        cpus=[],
+        experiments=[],
+    )
+
+
+def sweep(
+    script: Path | str,
+    arg_sets: Iterable[Sequence[str]],
+    *,
+    max_workers: int | None = None,
+    preload: Iterable[str] = (),
+    base_dir: Path | str | None = None,
+    pin_cpus: bool = True,
+    summary_path: Path | str | None = None,
+    mp_context: str | None = None,
+) -> SweepSummary:
+    """Run an experiment script once per arg set on a bounded process pool.
+    Each worker imports `preload` modules once and pins itself to a single CPU
+    (if `pin_cpus` is set and supported), and each run executes the script as
+    `__main__` with its own args, so it creates its own experiment directory.
+    Local modules (under the directory of the script or the working directory)
+    imported by a run are purged afterwards, so runs stay independent, while
+    installed packages stay imported for later runs.
+    Runs that cannot report back (e.g. as a worker was killed by a signal or
+    the OOM killer, which breaks the pool) are summarized as failed.
+
+    Args:
+        arg_sets: Command args for each run, e.g. from `expand_grid()`.
+        base_dir: Overrides `Experiment.BASE_DIR` in workers if given.
+        summary_path: Where to dump the sweep summary as JSON if given.
+        mp_context: Multiprocessing start method (defaults to "forkserver"
+            where available, otherwise "spawn").
+
+    Returns:
+        summary (SweepSummary): Statuses and timings of the runs.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from multiprocessing import get_all_start_methods, get_context
+
+    script = str(Path(script).resolve())
+    if mp_context is None:
+        if "forkserver" in get_all_start_methods():
+            mp_context = "forkserver"
+        else:
+            mp_context = "spawn"
+    context = get_context(mp_context)
+    worker_counter = context.Value("i", 0) if pin_cpus else None
+
+    start_timestamp = time()
+    start_counter = perf_counter()
+    runs: list[RunSummary] = []
+    with ProcessPoolExecutor(
+        max_workers,
+        mp_context=context,
+        initializer=_initialize_worker,
+        initargs=(
+            str(Path(script).parent),
+            list(preload),
+            worker_counter,
+            None if base_dir is None else str(Path(base_dir).resolve()),
+        ),
+    ) as executor:
+        futures = {
+            executor.submit(_run_script, script, index, list(argv)): (index, argv)
+            for index, argv in enumerate(arg_sets)
+        }
+        for future in as_completed(futures):
+            try:
+                runs.append(future.result())
+            except Exception as exception:
+                # e.g. `BrokenProcessPool` if a worker was killed by a signal,
+                # which fails all runs left in the pool.
+                index, argv = futures[future]
+                runs.append(_get_failed_run(index, list(argv), exception))
+    runs.sort(key=lambda run: run["index"])
+
+    summary = SweepSummary(
+        script=script,
+        start_timestamp=start_timestamp,
+        duration=perf_counter() - start_counter,
+        runs=runs,
+    )
+    if summary_path is not None:
+        with Path(summary_path).open("w") as file:
+            json.dump(summary, file, indent=4)
+    return summary
+
+
+def load_arg_sets(grids: Iterable[str], arg_strings: Iterable[str]) -> list[list[str]]:
+    """Load arg sets from JSON grids (see `expand_grid()`) and shell-like arg
+    strings (split by `shlex.split()`).
+    """
+    from shlex import split
+
+    arg_sets: list[list[str]] = []
+    for grid in grids:
+        arg_sets.extend(expand_grid(json.loads(grid)))
+    for arg_string in arg_strings:
+        arg_sets.append(split(arg_string))
+    return arg_sets
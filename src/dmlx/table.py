@@ -0,0 +1,279 @@
+import os
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .experiment import Experiment
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+    import pandas
+
+Row = dict[str, object]
+Signature = tuple[tuple[str, int, int], ...]
+
+METRIC_STATS: dict[str, Callable[["numpy.ndarray"], float]] = {
+    "last": lambda values: float(values[-1]),
+    "min": lambda values: float(values.min()),
+    "max": lambda values: float(values.max()),
+    "mean": lambda values: float(values.mean()),
+}
+
+
+class EncodedColumn(NamedTuple):
+    """A dictionary-encoded column, where `codes` index into `categories`
+    (-1 for missing values).
+    """
+
+    codes: "numpy.ndarray"
+    categories: list[str]
+
+    def decode(self) -> "numpy.ndarray":
+        """Decode the column into an object array (with None for missing
+        values).
+        """
+        import numpy
+
+        lookup = numpy.array([*self.categories, None], dtype=object)
+        return lookup[self.codes]
+
+
+def flatten(mapping: Mapping[str, object], prefix: str = "") -> Row:
+    """Flatten nested mappings into a dict with dot-separated keys."""
+    flattened: Row = {}
+    for key, value in mapping.items():
+        if isinstance(value, Mapping):
+            flattened.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flattened[prefix + str(key)] = value
+    return flattened
+
+
+def encode_column(values: Sequence[object]) -> "numpy.ndarray | EncodedColumn":
+    """Encode column values as a NumPy array if they are all numbers (booleans
+    included) or missing (None), or as an `EncodedColumn` of strings otherwise.
+    (Non-string values in string columns are encoded as JSON.)
+    """
+    import numpy
+
+    if all(isinstance(value, bool) for value in values):
+        return numpy.array(values, dtype=bool)
+    if all(value is None or isinstance(value, (int, float)) for value in values):
+        return numpy.array(
+            [numpy.nan if value is None else value for value in values],
+            dtype=numpy.float64,
+        )
+
+    import json
+
+    category_codes: dict[str, int] = {}
+    codes = numpy.empty(len(values), dtype=numpy.int32)
+    for index, value in enumerate(values):
+        if value is None:
+            codes[index] = -1
+            continue
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        codes[index] = category_codes.setdefault(value, len(category_codes))
+    return EncodedColumn(codes, list(category_codes))
+
+
+class ResultsTable:
+    """A columnar table of experiment results, with a row per archive."""
+
+    paths: list[Path]
+    columns: dict[str, "numpy.ndarray | EncodedColumn"]
+
+    def __init__(
+        self, paths: list[Path], columns: dict[str, "numpy.ndarray | EncodedColumn"]
+    ) -> None:
+        self.paths = paths
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, name: str) -> "numpy.ndarray | EncodedColumn":
+        return self.columns[name]
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        """Convert the table into a pandas data frame, with encoded columns
+        converted into categoricals without decoding.
+        """
+        import pandas
+
+        return pandas.DataFrame(
+            {
+                name: (
+                    pandas.Categorical.from_codes(column.codes, column.categories)
+                    if isinstance(column, EncodedColumn)
+                    else column
+                )
+                for name, column in self.columns.items()
+            }
+        )
+
+
+def get_archive_signature(
+    path: Path, meta_file_path: Path | str | None, metrics_file_suffix: str
+) -> Signature:
+    """Get the modification times and sizes of the meta file (at
+    `meta_file_path`, or, if it is None, in either format) and metrics files
+    of the archive at `path`, which identify a version of its results.
+    """
+    from .metafile import get_meta_file_paths
+
+    meta_file_names = {
+        str(meta_path) for meta_path in get_meta_file_paths(meta_file_path)
+    }
+    signature = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name in meta_file_names or entry.name.endswith(
+                metrics_file_suffix
+            ):
+                stat = entry.stat()
+                signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    if not any(name in meta_file_names for name, _, _ in signature):
+        raise FileNotFoundError(f"Meta file not found in {path}!")
+    return tuple(sorted(signature))
+
+
+def read_row(
+    path: Path,
+    *,
+    experiment_type: type[Experiment] = Experiment,
+    meta_file_path: Path | str | None = None,
+    metric_stats: Sequence[str] = ("last",),
+) -> Row:
+    """Read a row of the results table from the archive at `path`, containing
+    "name", "birth_timestamp", flattened args (prefixed with "args.") and
+    statistics of the non-NaN values of each metric column (named like
+    "metrics.<name>.<column>.<stat>").
+    """
+    import numpy
+
+    from .metrics import read_metrics
+
+    experiment = experiment_type(meta_file_path=meta_file_path)
+    experiment.load_from(path)
+    row: Row = {
+        "name": experiment.name,
+        "birth_timestamp": experiment.meta["birth_timestamp"],
+    }
+    row.update(flatten(experiment.args, "args."))
+
+    suffix = experiment.METRICS_FILE_SUFFIX
+    for metrics_path in sorted(path.glob("*" + suffix)):
+        metrics_name = metrics_path.name[: -len(suffix)]
+        for column, values in read_metrics(metrics_path).items():
+            if values.dtype.kind == "f":
+                values = values[~numpy.isnan(values)]
+            for stat in metric_stats:
+                row[f"metrics.{metrics_name}.{column}.{stat}"] = (
+                    METRIC_STATS[stat](values) if len(values) else None
+                )
+    return row
+
+
+def build_table(
+    paths: Iterable[Path | str] | str,
+    *,
+    experiment_type: type[Experiment] = Experiment,
+    meta_file_path: Path | str | None = None,
+    metric_stats: Sequence[str] = ("last",),
+    cache_path: Path | str | None = None,
+    max_workers: int | None = None,
+    on_error: Callable[[Path, Exception], None] | None = None,
+) -> ResultsTable:
+    """Build a results table from experiment archives (see `read_row()` for
+    columns). Archives are read by a thread pool, and archives that cannot be
+    read are skipped and reported to `on_error`. If `cache_path` is given,
+    rows are cached in that file and only read again from archives whose meta
+    or metrics files have changed.
+
+    Args:
+        paths: Paths to experiment directories, or a glob pattern relative to
+            `experiment_type.BASE_DIR` matching experiment directories.
+        metric_stats: Names of statistics of metric columns to include, out of
+            "last", "min", "max" and "mean".
+
+    Returns:
+        table (ResultsTable): The results table.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    unknown_stats = set(metric_stats) - METRIC_STATS.keys()
+    if unknown_stats:
+        raise ValueError(f"Unknown metric stats: {sorted(unknown_stats)}")
+    if isinstance(paths, str):
+        paths = experiment_type.BASE_DIR.glob(paths)
+    paths = [Path(path) for path in paths]
+
+    cache: dict[str, tuple[Signature, Row]] = {}
+    cache_key = (experiment_type.METRICS_FILE_SUFFIX, tuple(metric_stats))
+    if cache_path is not None:
+        cache = _load_cache(Path(cache_path), cache_key)
+
+    def read(path: Path) -> tuple[Signature, Row]:
+        signature = get_archive_signature(
+            path, meta_file_path, experiment_type.METRICS_FILE_SUFFIX
+        )
+        cached = cache.get(str(path))
+        if cached is not None and cached[0] == signature:
+            return cached
+        row = read_row(
+            path,
+            experiment_type=experiment_type,
+            meta_file_path=meta_file_path,
+            metric_stats=metric_stats,
+        )
+        return signature, row
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(read, path) for path in paths]
+        new_cache: dict[str, tuple[Signature, Row]] = {}
+        table_paths: list[Path] = []
+        rows: list[Row] = []
+        for path, future in zip(paths, futures):
+            try:
+                entry = future.result()
+            except (OSError, ValueError, KeyError, TypeError) as error:
+                if on_error is not None:
+                    on_error(path, error)
+                continue
+            new_cache[str(path)] = entry
+            table_paths.append(path)
+            rows.append(entry[1])
+
+    if cache_path is not None and new_cache != cache:
+        _dump_cache(Path(cache_path), cache_key, new_cache)
+
+    column_names = dict.fromkeys(name for row in rows for name in row)
+    columns = {
+        name: encode_column([row.get(name) for row in rows]) for name in column_names
+    }
+    return ResultsTable(table_paths, columns)
+
+
+def _load_cache(
+    cache_path: Path, cache_key: object
+) -> dict[str, tuple[Signature, Row]]:
+    import pickle
+
+    try:
+        with cache_path.open("rb") as file:
+            key, cache = pickle.load(file)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return {}
+    return cache if key == cache_key else {}
+
+
+def _dump_cache(
+    cache_path: Path, cache_key: object, cache: dict[str, tuple[Signature, Row]]
+) -> None:
+    import pickle
+
+    from .writer import write_atomically
+
+    write_atomically(cache_path, pickle.dumps((cache_key, cache)))
@@ -0,0 +1,102 @@
+import os
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter_ns
+from typing import NamedTuple, TypedDict
+
+NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class Span(NamedTuple):
+    name: str
+    start_ns: int
+    end_ns: int
+    thread_id: int
+    args: dict[str, object]
+
+
+class SpanSummary(TypedDict):
+    count: int
+    total: float
+    max: float
+
+
+class ActiveSpan:
+    tracer: "Tracer"
+    name: str
+    args: dict[str, object]
+    start_ns: int
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict[str, object]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> None:
+        self.start_ns = perf_counter_ns()
+
+    def __exit__(self, _exception_type, _exception, _traceback) -> None:
+        self.tracer.record(self.name, self.start_ns, perf_counter_ns(), **self.args)
+
+
+class Tracer:
+    """A recorder of timing spans, which can be exported as a Chrome trace
+    event file. (When disabled, `span()` returns a shared no-op context.)
+    """
+
+    enabled: bool
+    spans: list[Span]
+    origin_ns: int
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.spans = []
+        self.origin_ns = perf_counter_ns()
+
+    def span(self, name: str, **args: object) -> AbstractContextManager[None]:
+        """Get a context that records a span named `name` around its body."""
+        if not self.enabled:
+            return NULL_SPAN
+        return ActiveSpan(self, name, args)
+
+    def record(self, name: str, start_ns: int, end_ns: int, **args: object) -> None:
+        """Record a span with the given `time.perf_counter_ns()` bounds."""
+        if self.enabled:
+            self.spans.append(Span(name, start_ns, end_ns, get_ident(), args))
+
+    def summarize(self) -> dict[str, SpanSummary]:
+        """Summarize the recorded spans by name, in seconds."""
+        summary: dict[str, SpanSummary] = {}
+        for span in self.spans:
+            duration = (span.end_ns - span.start_ns) / 1e9
+            span_summary = summary.setdefault(
+                span.name, SpanSummary(count=0, total=0.0, max=0.0)
+            )
+            span_summary["count"] += 1
+            span_summary["total"] += duration
+            span_summary["max"] = max(span_summary["max"], duration)
+        return summary
+
+    def export(self, path: Path | str) -> None:
+        """Export the recorded spans to a Chrome trace event file."""
+        import json
+
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "dmlx",
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1e3,
+                "dur": (span.end_ns - span.start_ns) / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+        with Path(path).open("w") as file:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, file, default=str
+            )
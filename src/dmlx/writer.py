@@ -0,0 +1,153 @@
+import os
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from queue import Queue
+from threading import Semaphore, Thread
+from typing import BinaryIO
+
+Snapshot = bytes | bytearray | memoryview | Callable[[BinaryIO], object]
+
+
+@cache
+def get_umask() -> int:
+    """Get the file mode creation mask of the current process. (Read once,
+    from `/proc/self/status` where available, or otherwise by setting and
+    restoring it, which is first done when this module is imported, so that
+    no other threads create files with the temporary mask.)
+    """
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+get_umask()
+
+
+def write_atomically(path: Path | str, snapshot: Snapshot) -> None:
+    """Write a snapshot to `path` atomically, i.e. into a temporary file in the
+    same directory, which is synced and then renamed to `path`. (The snapshot
+    can be either bytes or a function that writes to the given binary file.)
+    The file gets the default mode of new files (respecting the umask), like
+    files written directly.
+    """
+    from tempfile import mkstemp
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_path = mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        if hasattr(os, "fchmod"):
+            # Temporary files are created as owner-only.
+            os.fchmod(file_descriptor, 0o666 & ~get_umask())
+        with os.fdopen(file_descriptor, "wb") as file:
+            if callable(snapshot):
+                snapshot(file)
+            else:
+                file.write(snapshot)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class BackgroundWriter:
+    """A writer that writes snapshots atomically in a background thread.
+    At most `max_pending` snapshots (including the one being written) can be
+    pending, and `submit()` blocks when the limit is reached. If a write fails,
+    snapshots pending at that time are discarded, and the error is re-raised by
+    the next call to `submit()`, `flush()` or `close()`.
+
+    Buffers are copied on submission, but functions are called later in the
+    background thread, so they must only write state that is not modified
+    afterwards (e.g. a copy of the state to save).
+    """
+
+    max_pending: int
+
+    __queue: "Queue[tuple[Path, Snapshot] | None]"
+    __slots: Semaphore
+    __thread: Thread | None
+    __error: BaseException | None
+    __closed: bool
+
+    def __init__(self, max_pending: int = 2) -> None:
+        if max_pending < 1:
+            raise ValueError("`max_pending` must be positive!")
+        self.max_pending = max_pending
+        self.__queue = Queue()
+        self.__slots = Semaphore(max_pending)
+        self.__thread = None
+        self.__error = None
+        self.__closed = False
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exception_type, _exception, _traceback) -> None:
+        try:
+            self.close()
+        except Exception:
+            if exception_type is None:
+                raise
+
+    def __work(self) -> None:
+        while True:
+            task = self.__queue.get()
+            try:
+                if task is None:
+                    return
+                if self.__error is None:
+                    write_atomically(*task)
+            except BaseException as error:
+                self.__error = error
+            finally:
+                if task is not None:
+                    self.__slots.release()
+                self.__queue.task_done()
+
+    def __raise_error(self) -> None:
+        error = self.__error
+        if error is not None:
+            self.__error = None
+            raise error
+
+    def submit(self, path: Path | str, snapshot: Snapshot) -> None:
+        """Schedule writing `snapshot` to `path`. (Blocks while `max_pending`
+        snapshots are pending. Buffers are copied, see the class docstring.)
+        """
+        if self.__closed:
+            raise RuntimeError("The background writer has been closed!")
+        self.__raise_error()
+        if self.__thread is None:
+            self.__thread = Thread(target=self.__work, daemon=True)
+            self.__thread.start()
+        if isinstance(snapshot, (bytearray, memoryview)):
+            snapshot = bytes(snapshot)
+        self.__slots.acquire()
+        self.__queue.put((Path(path), snapshot))
+
+    def flush(self) -> None:
+        """Wait until all pending snapshots are written."""
+        self.__queue.join()
+        self.__raise_error()
+
+    def close(self) -> None:
+        """Flush pending snapshots and stop the background thread."""
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+        self.__raise_error()
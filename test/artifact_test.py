@@ -0,0 +1,96 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dmlx.artifact import ArtifactStore, hash_file
+from dmlx.experiment import Experiment
+
+
+def test_artifact_store(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "store")
+
+    with store.open(tmp_path / "a" / "model.bin") as file:
+        file.write(b"weights")
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"weights")
+    digest = store.add(source, tmp_path / "b" / "model.bin")
+
+    object_path = store.object_path(digest)
+    assert digest == hash_file(source)
+    assert object_path.read_bytes() == b"weights"
+    assert object_path.stat().st_nlink == 3
+    assert (tmp_path / "a" / "model.bin").samefile(object_path)
+    assert (tmp_path / "b" / "model.bin").samefile(object_path)
+
+    with store.open(tmp_path / "c" / "seeked.bin") as file:
+        file.write(b"xxxx")
+        file.seek(0)
+        file.write(b"data")
+    assert hash_file(tmp_path / "c" / "seeked.bin") == hash_file(
+        store.object_path(hash_file(tmp_path / "c" / "seeked.bin"))
+    )
+
+    with store.open(tmp_path / "c" / "lines.bin") as file:
+        file.writelines([b"hello", b" ", b"world"])
+    with store.open(tmp_path / "c" / "truncated.bin") as file:
+        file.write(b"hello world")
+        file.truncate(5)
+    with store.open(tmp_path / "c" / "descriptor.bin") as file:
+        file.write(b"hello")
+        file.flush()
+        os.write(file.fileno(), b" world")
+    for name, content in [
+        ("lines.bin", b"hello world"),
+        ("truncated.bin", b"hello"),
+        ("descriptor.bin", b"hello world"),
+    ]:
+        path = tmp_path / "c" / name
+        assert path.read_bytes() == content
+        assert path.samefile(store.object_path(hash_file(path)))
+
+    with pytest.raises(ValueError):
+        with store.open(tmp_path / "d" / "failed.bin") as file:
+            file.write(b"partial")
+            raise ValueError()
+    assert not (tmp_path / "d" / "failed.bin").exists()
+    assert list((tmp_path / "store" / "tmp").iterdir()) == []
+
+    assert store.collect_garbage() == (0, 0)
+    shutil.rmtree(tmp_path / "a")
+    assert store.collect_garbage() == (0, 0)
+    shutil.rmtree(tmp_path / "b")
+    assert store.collect_garbage() == (1, len(b"weights"))
+    assert not object_path.exists()
+
+    assert store.add(source) == digest
+    assert source.samefile(store.object_path(digest))
+
+
+def test_experiment_artifacts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    paths: list[Path] = []
+    for _ in range(2):
+        experiment = Experiment()
+
+        @experiment.main()
+        def main(**args) -> None:
+            experiment.init()
+            with experiment.open_artifact("checkpoints/model.bin") as file:
+                file.write(b"shared checkpoint")
+
+        assert experiment.command is not None
+        experiment.command.main([], standalone_mode=False)
+        paths.append(experiment.path / "checkpoints" / "model.bin")
+
+    assert paths[0] != paths[1]
+    assert paths[0].samefile(paths[1])
+    assert paths[0].read_bytes() == b"shared checkpoint"
+    assert (tmp_path / "experiments" / ".artifacts").is_dir()
+
+    source = tmp_path / "split.json"
+    source.write_text("[1, 2, 3]")
+    digest = experiment.add_artifact("split.json", source)
+    assert experiment.artifact_store.object_path(digest).stat().st_nlink == 2
@@ -0,0 +1,123 @@
+import gc
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from dmlx.cache import CacheInfo, DiskCache, InstanceCache
+
+
+class Key:
+    pass
+
+
+def test_instance_cache() -> None:
+    cache: InstanceCache[int] = InstanceCache(2)
+    a, b, c = Key(), Key(), Key()
+
+    assert cache.get(a, lambda _: 1) == 1
+    assert cache.get(a, lambda _: 2) == 1
+    assert cache.get(b, lambda _: 3) == 3
+    assert cache.get(a, lambda _: 4) == 1
+    assert cache.get(c, lambda _: 5) == 5
+    assert cache.info() == CacheInfo(hits=2, misses=3, maxsize=2, currsize=2)
+
+    assert cache.get(a, lambda _: 6) == 6  # evicted as least recently cached
+    assert cache.get(c, lambda _: 7) == 5
+    assert cache.invalidate(c)
+    assert not cache.invalidate(c)
+    assert cache.get(c, lambda _: 8) == 8
+
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_instance_cache_weak_keys() -> None:
+    cache: InstanceCache[list[int]] = InstanceCache(None)
+    keys = [Key() for _ in range(10)]
+    for key in keys:
+        cache.get(key, lambda _: [0] * 100)
+    assert len(cache) == 10
+
+    del keys, key
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_instance_cache_collection_during_get() -> None:
+    cache: InstanceCache[int] = InstanceCache(None)
+
+    def run() -> None:
+        previous_keys: list[Key] = []
+
+        def compute(_key: Key) -> int:
+            # Leave the previous key as cyclic garbage, which is collected
+            # (calling its weakref callback) once `get()` allocates again.
+            previous_keys.clear()
+            return 0
+
+        for _ in range(1000):
+            key = Key()
+            key.cycle = key  # type: ignore[attr-defined]
+            cache.get(key, compute)
+            previous_keys.append(key)
+            del key
+
+    threshold = gc.get_threshold()
+    gc.set_threshold(1)
+    try:
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(10)
+    finally:
+        gc.set_threshold(*threshold)
+    assert not thread.is_alive()  # not deadlocked
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_instance_cache_size() -> None:
+    with pytest.raises(ValueError):
+        InstanceCache(-1)
+
+    cache: InstanceCache[int] = InstanceCache(0)
+    key = Key()
+    assert cache.get(key, lambda _: 1) == 1
+    assert cache.get(key, lambda _: 2) == 2
+    assert len(cache) == 0
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    key = DiskCache.make_key("a", "b")
+    assert key != DiskCache.make_key("ab")
+
+    assert cache.get(key, lambda: [1, 2, 3]) == [1, 2, 3]
+    assert cache.get(key, lambda: pytest.fail("Cached value expected.")) == [1, 2, 3]
+
+    (tmp_path / "cache" / (key + DiskCache.SUFFIX)).write_bytes(b"corrupt")
+    assert cache.get(key, lambda: "recreated") == "recreated"
+    assert cache.get(key, lambda: "unexpected") == "recreated"
+
+    cache.clear()
+    assert cache.get(key, lambda: "cleared") == "cleared"
+
+
+def test_disk_cache_eviction(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=2500, max_age=3600)
+    for index in range(3):
+        cache.get(str(index), lambda: bytes(1000))
+        os.utime(tmp_path / f"{index}{DiskCache.SUFFIX}", (index, 1000 + index))
+    cache.evict()
+    assert sorted(path.name for path in tmp_path.iterdir()) == []
+
+    cache.max_age = None
+    for index in range(3):
+        cache.get(str(index), lambda: bytes(1000))
+        os.utime(tmp_path / f"{index}{DiskCache.SUFFIX}", (index, 1000 + index))
+    cache.evict()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"1{DiskCache.SUFFIX}",
+        f"2{DiskCache.SUFFIX}",
+    ]
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+import pytest
+
+import dmlx.catalog
+from dmlx.catalog import Catalog
+from dmlx.experiment import Experiment
+
+PARAMS = (click.option("--epochs", type=int), click.option("--model"))
+
+
+def test_catalog_dump_meta(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Experiment, "CATALOG_FILE_PATH", "catalog.sqlite3")
+
+    run_experiment("a/1", ["--epochs", "500", "--model", "foo?x=1"], params=PARAMS)
+    run_experiment("a/2", ["--epochs", "800", "--model", "foo?x=1"], params=PARAMS)
+    run_experiment("b/1", ["--epochs", "500", "--model", "bar"], params=PARAMS)
+
+    with Catalog(Experiment.BASE_DIR / "catalog.sqlite3") as catalog:
+        names = [entry.name for entry in catalog.query(args={"epochs": 500})]
+        assert names == ["a/1", "b/1"]
+
+        entries = list(catalog.query(name="a/*", args={"model": "foo?x=1"}))
+        assert [entry.name for entry in entries] == ["a/1", "a/2"]
+        assert entries[1].meta["args"]["epochs"] == 800
+        assert entries[1].path == (Experiment.BASE_DIR / "a/2").resolve()
+
+        first, *_ = catalog.query()
+        assert list(catalog.query(born_before=first.birth_timestamp)) == [first]
+        assert list(catalog.query(args={"epochs": 1})) == []
+
+
+def test_catalog_scan(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    run_experiment("a/1", ["--epochs", "500"], params=PARAMS)
+    experiment = run_experiment("a/2", ["--epochs", "800"], params=PARAMS)
+    (tmp_path / "experiments" / "broken").mkdir()
+    (tmp_path / "experiments" / "broken" / "meta.json").write_text("{")
+
+    with Catalog(tmp_path / "catalog.sqlite3") as catalog:
+        assert catalog.scan(Experiment.BASE_DIR) == 2
+        read_paths: list[Path] = []
+        original_read_meta = dmlx.catalog.read_meta
+
+        def read_meta(path: Path) -> Experiment.Meta:
+            read_paths.append(path)
+            return original_read_meta(path)
+
+        with monkeypatch.context() as patch:
+            patch.setattr("dmlx.catalog.read_meta", read_meta)
+            assert catalog.scan(Experiment.BASE_DIR) == 0
+        assert read_paths == []  # not even the unreadable meta file
+
+        broken_meta_path = tmp_path / "experiments" / "broken" / "meta.json"
+        broken_meta_path.write_text(json.dumps({**experiment.meta, "name": "c"}))
+        os.utime(broken_meta_path, (1, 1))
+        assert catalog.scan(Experiment.BASE_DIR) == 1
+        shutil.rmtree(broken_meta_path.parent)
+
+        meta_path = experiment.path / experiment.meta_file_path
+        meta = json.loads(meta_path.read_text())
+        meta["args"]["epochs"] = 500
+        meta_path.write_text(json.dumps(meta))
+        os.utime(meta_path, (0, 0))
+        assert catalog.scan(Experiment.BASE_DIR) == 1
+        assert len(list(catalog.query(args={"epochs": 500}))) == 2
+
+        meta_path.unlink()
+        assert catalog.scan(Experiment.BASE_DIR) == 0
+        assert [entry.name for entry in catalog.query()] == ["a/1"]
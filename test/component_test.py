@@ -1,7 +1,20 @@
+import os
+from functools import partial
+from pathlib import Path
+
 import pytest
 
-from dmlx.component import Component, parse_locator
+from dmlx.cache import DiskCache
+from dmlx.component import (
+    Component,
+    compile_locator,
+    normalize_locator,
+    parse_locator,
+    resolve_factory,
+    resolve_locators,
+)
 from dmlx.property import component
+from dmlx.writer import get_umask
 
 
 def test_parse_locator() -> None:
@@ -35,6 +48,48 @@ def test_parse_locator_multiline() -> None:
     assert kwargs == {"y": "1", "z": [2.0, True]}
 
 
+def test_compile_locator() -> None:
+    locator = compile_locator('a.b:c?x=[1, {"y": [2]}];z="3"')
+    assert locator is compile_locator('a.b:c?x=[1, {"y": [2]}];z="3"')
+    assert locator.path == "a.b:c"
+    assert locator.params["x"] == [1, {"y": [2]}]
+    with pytest.raises(TypeError):
+        locator.params["z"] = "4"  # type: ignore
+
+    kwargs = locator.kwargs()
+    assert kwargs == {"x": [1, {"y": [2]}], "z": "3"}
+    kwargs["x"].append(5)  # type: ignore
+    assert parse_locator('a.b:c?x=[1, {"y": [2]}];z="3"')[1]["x"] == [1, {"y": [2]}]
+
+
+def test_normalize_locator() -> None:
+    assert normalize_locator("  a.b:c  ") == "a.b:c"
+    assert normalize_locator("a.b:c?") == "a.b:c"
+    assert normalize_locator('a?z = {"b": 1, "a": 2}; #y=0; x=1') == (
+        'a?x=1;z={"a": 2, "b": 1}'
+    )
+
+
+def test_resolve_locators(test_module: None) -> None:
+    from test_module.model import bar, foo
+
+    factories = resolve_locators(
+        ["foo?threshold=1", "foo?threshold=2", "bar", "foo:Model"],
+        "test_module.model",
+        "Model",
+    )
+    assert factories == {
+        "foo?threshold=1": foo.Model,
+        "foo?threshold=2": foo.Model,
+        "bar": bar.Model,
+        "foo:Model": foo.Model,
+    }
+    assert resolve_factory("test_module.model.bar", "Model") is bar.Model
+
+    with pytest.raises(RuntimeError):
+        resolve_factory("test_module.model.bar")
+
+
 def test_load_simple(test_module: None) -> None:
     from test_module.model.foo import Model
 
@@ -65,6 +120,61 @@ def test_load_complex(test_module: None) -> None:
     assert model.predict([0.1, 1.0, 10.0]) == [0.0, 1.0, 1.0]
 
 
+def test_load_disk_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, test_module: None
+) -> None:
+    from test_module.model.foo import Model
+
+    init_count = 0
+    init = Model.__init__
+
+    def counting_init(self, threshold: float) -> None:
+        nonlocal init_count
+        init_count += 1
+        init(self, threshold)
+
+    monkeypatch.setattr(Model, "__init__", counting_init)
+
+    model_component = Component(
+        "test_module.model", "Model", disk_cache=DiskCache(tmp_path)
+    )
+    assert model_component("foo?threshold=5").threshold == 5
+    assert model_component("foo? threshold = 5 ;").threshold == 5
+    assert init_count == 1
+    assert model_component("foo?threshold=6").threshold == 6
+    assert init_count == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_load_disk_cached_anonymous(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, test_module: None
+) -> None:
+    from test_module.model import foo
+
+    # Partials and lambdas are keyed by their paths, not qualified names.
+    monkeypatch.setattr(foo, "low", partial(foo.Model, 1.0), raising=False)
+    monkeypatch.setattr(foo, "high", partial(foo.Model, 9.0), raising=False)
+    monkeypatch.setattr(foo, "mid", lambda: foo.Model(5.0), raising=False)
+    monkeypatch.setattr(foo, "half", lambda: foo.Model(0.5), raising=False)
+    model_component = Component("test_module.model", disk_cache=DiskCache(tmp_path))
+    for name, threshold in [("low", 1), ("high", 9), ("mid", 5), ("half", 0.5)]:
+        assert model_component(f"foo:{name}").threshold == threshold
+    assert len(list(tmp_path.iterdir())) == 4
+
+    umask = os.umask(0o027)
+    try:
+        get_umask.cache_clear()
+        model_component = Component(
+            "test_module.model", disk_cache=DiskCache(tmp_path / "shared")
+        )
+        model_component("foo:low")
+    finally:
+        os.umask(umask)
+        get_umask.cache_clear()
+    (entry_path,) = (tmp_path / "shared").iterdir()
+    assert entry_path.stat().st_mode & 0o777 == 0o640
+
+
 def test_component_cache(test_module: None) -> None:
     class C:
         LOCATOR = "test_module.model.bar:Model"
@@ -72,3 +182,14 @@ def test_component_cache(test_module: None) -> None:
 
     c = C()
     assert c.component is c.component
+
+    component_property = C.__dict__["component"]
+    assert component_property.cache_info().hits == 1
+    assert component_property.cache_info().currsize == 1
+
+    old_component = c.component
+    del c.component
+    assert c.component is not old_component
+
+    del c
+    assert component_property.cache_info().currsize == 0
@@ -1,11 +1,47 @@
 import sys
+from collections.abc import Callable, Sequence
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from dmlx.experiment import Experiment
+
 TEST_MODULE_PATH = str(Path(__file__).parent.parent.resolve())
 
+RunExperiment = Callable[..., Experiment]
+
 
 @pytest.fixture()
 def test_module() -> None:
     sys.path.append(TEST_MODULE_PATH)
+
+
+def run_new_experiment(
+    name_template: str | None = None,
+    cli_args: Sequence[str] = (),
+    *,
+    params: Sequence[Callable[[Callable], Callable]] = (),
+    body: Callable[[Experiment, dict[str, Any]], None] | None = None,
+) -> Experiment:
+    """Run a new experiment through its command with `cli_args`, declaring
+    `params` (click decorators, outermost first) and calling
+    `body(experiment, args)` after `experiment.init()`.
+    """
+    experiment = Experiment(name_template)
+
+    def main(**args: Any) -> None:
+        experiment.init()
+        if body is not None:
+            body(experiment, args)
+
+    for param in reversed(params):
+        main = param(main)
+    command = experiment.main()(main)
+    command.main(list(cli_args), standalone_mode=False)
+    return experiment
+
+
+@pytest.fixture()
+def run_experiment() -> RunExperiment:
+    return run_new_experiment
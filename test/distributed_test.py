@@ -0,0 +1,124 @@
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from dmlx.distributed import DistributedInfo, get_distributed_info, wait_for_path
+from dmlx.experiment import Experiment
+from dmlx.layout import find_archives
+
+
+def test_get_distributed_info(tmp_path: Path) -> None:
+    assert get_distributed_info({}) == DistributedInfo(0, 1, None)
+    assert get_distributed_info(
+        {"RANK": "2", "WORLD_SIZE": "4", "SLURM_JOB_ID": "42", "DMLX_RUN_ID": ""}
+    ) == DistributedInfo(2, 4, "42")
+    assert get_distributed_info(
+        {
+            "RANK": "1",
+            "WORLD_SIZE": "2",
+            "SLURM_JOB_ID": "42",
+            "SLURM_RESTART_COUNT": "3",
+        }
+    ) == DistributedInfo(1, 2, "42", 3)
+    with pytest.raises(ValueError):
+        get_distributed_info({"RANK": "4", "WORLD_SIZE": "4"})
+    assert not wait_for_path(tmp_path / "missing", 0.05)
+
+
+def _run_rank(base_dir: str, rank: int, world_size: int) -> None:
+    os.environ.update(
+        RANK=str(rank),
+        WORLD_SIZE=str(world_size),
+        DMLX_RUN_ID="test-run",
+        TORCHELASTIC_RESTART_COUNT="1",
+    )
+    Experiment.BASE_DIR = Path(base_dir)
+    experiment = Experiment(tracing=True)
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+        experiment.metrics(columns=["loss"]).write(0, loss=float(rank))
+
+    assert experiment.command is not None
+    experiment.command.main([], standalone_mode=False)
+
+
+def test_distributed_experiment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_dir = tmp_path / "experiments"
+    monkeypatch.setattr(Experiment, "BASE_DIR", base_dir)
+    world_size = 3
+    # A rendezvous file left by a crashed previous attempt of the run.
+    (base_dir / ".rendezvous").mkdir(parents=True)
+    stale_rendezvous_path = base_dir / ".rendezvous" / "test-run.0"
+    stale_rendezvous_path.write_text(
+        json.dumps({"name": "previous", "world_size": world_size})
+    )
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_rank, args=(str(base_dir), rank, world_size))
+        for rank in reversed(range(world_size))
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    assert list((base_dir / ".rendezvous").iterdir()) == [stale_rendezvous_path]
+    (path,) = find_archives(base_dir, "meta.json")
+    experiment = Experiment()
+    experiment.load_from(path)
+    assert sorted(path.name for path in experiment.path.iterdir()) == [
+        "journal.jsonl",
+        "meta.json",
+        "rank0",
+        "rank1",
+        "rank2",
+    ]
+    assert experiment.meta["world_size"] == world_size
+    assert sorted(experiment.meta["ranks"]) == ["1", "2"]
+    for rank, rank_meta in experiment.meta["ranks"].items():
+        assert rank_meta["rank"] == int(rank)
+        assert "main" in rank_meta["spans"]  # type: ignore[operator]
+    for rank in range(world_size):
+        assert experiment.read_metrics(rank=rank)["loss"].tolist() == [rank]
+        assert (experiment.path / f"rank{rank}" / "trace.json").is_file()
+    assert experiment.read_metrics()["loss"].tolist() == [0.0]
+
+
+def test_distributed_experiment_requires_run_id(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    experiment = Experiment(distributed=DistributedInfo(0, 2, None))
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+
+    assert experiment.command is not None
+    with pytest.raises(RuntimeError, match="run ID"):
+        experiment.command.main([], standalone_mode=False)
+
+
+def test_distributed_info_resolved_lazily(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "experiments" / "test").mkdir(parents=True)
+    meta = {"name": "test", "birth_timestamp": 0.0, "args": {}}
+    (tmp_path / "experiments" / "test" / "meta.json").write_text(json.dumps(meta))
+
+    monkeypatch.setenv("RANK", "1")
+    monkeypatch.delenv("WORLD_SIZE", raising=False)
+    experiment = Experiment("test")
+    experiment.load()
+    assert experiment.rank == 0 and experiment.world_size == 1
+    with pytest.raises(ValueError):
+        Experiment("test").rank
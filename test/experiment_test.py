@@ -1,6 +1,8 @@
 import json
 import os
+from collections.abc import Callable
 from datetime import datetime
+from itertools import chain, repeat
 from pathlib import Path
 from typing import cast
 
@@ -181,3 +183,236 @@ def test_experiment_cli_and_load(
         experiment.name = "not_allowed"
     with pytest.raises(RuntimeError):
         experiment.load()
+
+
+def test_experiment_load_many(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    for index in range(10):
+        experiment = Experiment(f"runs/{index}")
+
+        @experiment.main()
+        @click.option("--index", type=int)
+        def main(**args) -> None:
+            experiment.init()
+
+        assert experiment.command is not None
+        experiment.command.main(["--index", str(index)], standalone_mode=False)
+
+    (Experiment.BASE_DIR / "runs" / "corrupt").mkdir()
+    (Experiment.BASE_DIR / "runs" / "corrupt" / "meta.json").write_text("{")
+    (Experiment.BASE_DIR / "runs" / "empty").mkdir()
+
+    errors: list[Path] = []
+    experiments = list(
+        Experiment.load_many(
+            "runs/*",
+            max_workers=2,
+            on_error=lambda path, error: errors.append(path),
+        )
+    )
+    assert sorted(experiment.args["index"] for experiment in experiments) == list(
+        range(10)
+    )
+    assert sorted(experiment.name for experiment in experiments) == sorted(
+        f"runs/{index}" for index in range(10)
+    )
+    assert sorted(path.name for path in errors) == ["corrupt", "empty"]
+
+    paths = [tmp_path / "experiments" / "runs" / "3"]
+    (experiment,) = Experiment.load_many(paths)
+    assert experiment.args == {"index": 3}
+    assert experiment.path == paths[0]
+
+
+def test_experiment_arrays(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment()
+    embeddings = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+    path = experiment.save_array("outputs/embeddings", embeddings)
+    assert path == experiment.path / "outputs" / "embeddings.npy"
+    experiment.save_array("labels", [1, 2, 3])
+
+    loaded = experiment.open_array("outputs/embeddings")
+    assert isinstance(loaded, numpy.memmap)
+    assert loaded.dtype == numpy.float32
+    assert loaded[1].tolist() == [4.0, 5.0, 6.0, 7.0]
+    assert not loaded.flags.writeable
+    assert experiment.open_array("labels").tolist() == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        experiment.save_array("objects", numpy.array([object()]))
+
+
+def test_experiment_memoize(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    call_count = 0
+
+    def run(cli_args: list[str]) -> Experiment:
+        experiment = Experiment()
+
+        @experiment.main(memoize=True)
+        @click.argument("model_locator")
+        @click.option("--epochs", type=int)
+        @click.option("--fail", is_flag=True)
+        def main(**args) -> None:
+            nonlocal call_count
+            call_count += 1
+            experiment.init()
+            if args["fail"]:
+                raise ValueError("Failed on purpose.")
+
+        assert experiment.command is not None
+        experiment.command.main(cli_args, standalone_mode=False)
+        return experiment
+
+    first = run(["foo?x=1;y=[1, 2]", "--epochs", "5"])
+    assert not first.memoized
+    assert (first.path / "COMPLETED").is_file()
+
+    second = run(["foo? y = [1,2]; # z = 0; x = 1", "--epochs", "5"])
+    assert second.memoized
+    assert second.path == first.path
+    assert second.args == first.args
+    assert second.meta == first.meta
+    assert call_count == 1
+
+    assert not run(["foo?x=2;y=[1, 2]", "--epochs", "5"]).memoized
+    assert not run(["foo?x=1;y=[1, 2]", "--epochs", "6"]).memoized
+    assert call_count == 3
+
+    with pytest.raises(ValueError):
+        run(["bar", "--fail"])
+    with pytest.raises(ValueError):
+        run(["bar", "--fail"])
+    assert call_count == 5
+
+    assert Experiment.get_args_digest({"a": "x?b=1;c=2"}) == (
+        Experiment.get_args_digest({"a": "x? c = 2; b = 1"})
+    )
+    assert Experiment.get_args_digest({"a": "not=a?locator"}) != (
+        Experiment.get_args_digest({"a": "not=a"})
+    )
+
+
+def test_experiment_memoize_scripts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import runpy
+
+    monkeypatch.chdir(tmp_path)
+    script = """
+from dmlx.experiment import Experiment
+
+experiment = Experiment()
+
+
+@experiment.main(memoize=True)
+def main(**args) -> None:
+    experiment.init()
+    (experiment.path / "output.txt").write_text({output!r})
+
+
+experiment.command.main([], standalone_mode=False)
+"""
+    for name in ("train", "evaluate"):
+        (tmp_path / f"{name}.py").write_text(script.format(output=name))
+
+    def run(name: str) -> Experiment:
+        module_globals = runpy.run_path(
+            str(tmp_path / f"{name}.py"), run_name="__main__"
+        )
+        return module_globals["experiment"]
+
+    train = run("train")
+    evaluate = run("evaluate")
+    assert not train.memoized and not evaluate.memoized
+    assert evaluate.path != train.path
+    assert (evaluate.path / "output.txt").read_text() == "evaluate"
+
+    memoized = run("evaluate")
+    assert memoized.memoized
+    assert memoized.path == evaluate.path
+
+
+def test_experiment_name_collision(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    random_bytes = chain([b"\0" * 4, b"\0" * 4], repeat(b"\1" * 4))
+    monkeypatch.setattr("dmlx.experiment.urandom", lambda _: next(random_bytes))
+
+    first = run_experiment("run-{hex}")
+    second = run_experiment("run-{hex}")
+    assert first.name == "run-00000000"
+    assert second.name == "run-01010101"
+    assert json.loads((second.path / "meta.json").read_text())["name"] == second.name
+
+    run_experiment("fixed")
+    generate_count = 0
+    get_name_template_variables = Experiment.get_name_template_variables
+
+    def count_generation(now: datetime) -> Experiment.NameTemplateVariables:
+        nonlocal generate_count
+        generate_count += 1
+        return get_name_template_variables(now)
+
+    monkeypatch.setattr(
+        Experiment, "get_name_template_variables", staticmethod(count_generation)
+    )
+    with pytest.raises(FileExistsError):
+        run_experiment("fixed")
+    assert generate_count == 2  # not retried with the same name
+
+
+def test_experiment_sequence_allocated_lazily(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert run_experiment("run-{seq:04}").name == "run-0000"
+
+    for _ in range(2):
+        (experiment,) = Experiment.load_many("run-*")
+        assert experiment.name == "run-0000"
+    Experiment("run-{seq:04}")
+    assert run_experiment("run-{seq:04}").name == "run-0001"
+
+
+def _create_experiments(
+    run_experiment: Callable[..., Experiment], base_dir: str, count: int
+) -> list[str]:
+    Experiment.BASE_DIR = Path(base_dir)
+    return [
+        run_experiment("run-{seq:05}" if index % 2 else None).name
+        for index in range(count)
+    ]
+
+
+def test_experiment_concurrent_creation(
+    tmp_path: Path, run_experiment: Callable[..., Experiment]
+) -> None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    base_dir = tmp_path / "experiments"
+    with ProcessPoolExecutor(4) as executor:
+        futures = [
+            executor.submit(_create_experiments, run_experiment, str(base_dir), 20)
+            for _ in range(4)
+        ]
+        names = [name for future in futures for name in future.result()]
+
+    assert len(set(names)) == len(names) == 80
+    sequence_numbers = sorted(
+        int(name.removeprefix("run-")) for name in names if name.startswith("run-")
+    )
+    assert sequence_numbers == list(range(40))
+    for name in names:
+        meta = json.loads((base_dir / name / "meta.json").read_text())
+        assert meta["name"] == name
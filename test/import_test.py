@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+import pytest
+
+DEFERRED_MODULES = {
+    "click",
+    "json",
+    "secrets",
+    "pkgutil",
+    "inspect",
+    "pickle",
+    "sqlite3",
+    "tempfile",
+}
+
+# Generous upper bounds (in microseconds) that only catch gross regressions.
+IMPORT_TIME_BUDGETS = {
+    "dmlx": 50_000,
+    "dmlx.experiment": 100_000,
+    "dmlx.property": 100_000,
+}
+
+
+def measure_import(module_name: str) -> dict[str, int]:
+    """Import `module_name` in a fresh interpreter with `-X importtime` and
+    return the cumulative import time (in microseconds) of each module.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        cumulative_times[name.strip()] = int(cumulative_time)
+    return cumulative_times
+
+
+@pytest.mark.parametrize("module_name", list(IMPORT_TIME_BUDGETS))
+def test_import_time(module_name: str) -> None:
+    cumulative_times = measure_import(module_name)
+    assert DEFERRED_MODULES.isdisjoint(cumulative_times)
+    assert cumulative_times[module_name] < IMPORT_TIME_BUDGETS[module_name]
+
+
+def test_lazy_submodules() -> None:
+    cumulative_times = measure_import("dmlx")
+    assert "dmlx.experiment" not in cumulative_times
+
+    import dmlx
+
+    assert dmlx.experiment.Experiment is not None
+    assert "experiment" in dir(dmlx)
+    with pytest.raises(AttributeError):
+        dmlx.blah  # type: ignore
@@ -0,0 +1,116 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+import pytest
+
+from dmlx.experiment import Experiment
+from dmlx.journal import Journal, read_journal, replay, tail_journal
+
+
+def test_journal(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record("started")
+    for step in range(100):
+        journal.record("progress", step=step, note="x" * step)
+    journal.record("finished", exit_code=0, duration=1.5)
+    with journal.path.open("ab") as file:
+        file.write(b'{"event": "partial')
+
+    events = journal.read()
+    assert len(events) == 102
+    assert tail_journal(journal.path, 3, chunk_size=16) == events[-3:]
+    assert journal.tail(200) == events
+    assert journal.tail(0) == []
+
+    state = replay(events)
+    assert state["status"] == "finished"
+    assert state["exit_code"] == 0 and state["duration"] == 1.5
+    assert state["fields"] == {"step": 99, "note": "x" * 99}
+    assert state["events"] == 102
+    assert replay([])["status"] == "pending"
+
+
+def test_journal_malformed_lines(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record("started")
+    with journal.path.open("ab") as file:
+        file.write(b'{"event": "progr\x00\x00\n[1, 2]\n{"step": 1}\n')
+    journal.record("progress", step=2)
+    journal.record("finished", exit_code=0)
+
+    events = journal.read()
+    assert [event["event"] for event in events] == ["started", "progress", "finished"]
+    assert journal.tail(2) == events[-2:]
+    state = journal.replay()
+    assert state["status"] == "finished"
+    assert state["fields"] == {"step": 2}
+
+
+PARAMS = (
+    click.option("--fail", is_flag=True),
+    click.option("--exit-code", type=int, default=0),
+)
+
+
+def record_progress(experiment: Experiment, args: dict[str, Any]) -> None:
+    experiment.record("progress", epoch=1)
+    assert experiment.state is not None
+    assert experiment.state["status"] == "running"
+    if args["fail"]:
+        raise RuntimeError("Failed on purpose.")
+    if args["exit_code"]:
+        raise SystemExit(args["exit_code"])
+
+
+def test_experiment_journal(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    finished = run_experiment("finished", params=PARAMS, body=record_progress)
+    with pytest.raises(RuntimeError):
+        run_experiment("failed", ["--fail"], params=PARAMS, body=record_progress)
+    with pytest.raises(SystemExit):
+        run_experiment(
+            "exited", ["--exit-code", "3"], params=PARAMS, body=record_progress
+        )
+
+    events = read_journal(finished.path / "journal.jsonl")
+    assert [event["event"] for event in events] == ["started", "progress", "finished"]
+
+    loaded = Experiment(finished.name)
+    loaded.load()
+    # The journal is replayed on first access and only once.
+    finished.journal.record("note", epoch=2)
+    assert loaded.state is not None
+    finished.journal.record("note", epoch=3)
+    assert loaded.state["status"] == "finished"
+    assert loaded.state["exit_code"] == 0
+    assert loaded.state["fields"] == {"epoch": 2}
+
+    # A corrupt line in the middle does not make the archive unloadable.
+    journal_path = finished.path / "journal.jsonl"
+    lines = journal_path.read_bytes().splitlines(keepends=True)
+    journal_path.write_bytes(b"".join([lines[0], b"\x00garbage\n", *lines[1:]]))
+    loaded = Experiment(finished.name)
+    loaded.load()
+    assert loaded.state is not None
+    assert loaded.state["status"] == "finished"
+    assert loaded.state["events"] == 5
+
+    loaded = Experiment("failed")
+    loaded.load()
+    assert loaded.state is not None
+    assert loaded.state["status"] == "failed"
+    assert loaded.state["exit_code"] == 1
+    assert loaded.state["error"] == "RuntimeError: Failed on purpose."
+
+    exited = Experiment("exited")
+    exited.load()
+    assert exited.state is not None
+    assert exited.state["status"] == "failed"
+    assert exited.state["exit_code"] == 3
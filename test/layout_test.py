@@ -0,0 +1,76 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from dmlx.__main__ import cli
+from dmlx.experiment import Experiment
+from dmlx.layout import (
+    FlatLayout,
+    HashPrefixLayout,
+    Layout,
+    find_archives,
+    migrate,
+)
+
+PARAMS = (click.option("--tag"),)
+
+
+def test_hash_prefix_layout() -> None:
+    layout = HashPrefixLayout(levels=2, width=3)
+    path = layout.locate("2002/01/02/030405-0123abcd")
+    assert len(path.parts) == 6
+    assert all(len(part) == 3 for part in path.parts[:2])
+    assert path.parts[2:] == ("2002", "01", "02", "030405-0123abcd")
+    assert layout.locate("2002/01/02/030405-0123abcd") == path
+    assert FlatLayout().locate("a/b") == Path("a/b")
+    with pytest.raises(ValueError):
+        HashPrefixLayout(levels=0)
+
+    class IncompleteLayout(Layout):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteLayout()  # type: ignore[abstract]
+
+
+def test_layout_migration(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    names = [f"2002/01/02/{index:06}" for index in range(5)]
+    for name in names:
+        run_experiment(name, ["--tag", name], params=PARAMS)
+    (Experiment.BASE_DIR / ".artifacts" / "tmp").mkdir(parents=True)
+    assert len(list(find_archives(Experiment.BASE_DIR))) == 5
+
+    layout = HashPrefixLayout()
+    moves = migrate(Experiment.BASE_DIR, layout, dry_run=True)
+    assert len(moves) == 5
+    assert (Experiment.BASE_DIR / names[0]).is_dir()
+
+    result = CliRunner().invoke(cli, ["migrate", str(Experiment.BASE_DIR)])
+    assert result.exit_code == 0, result.output
+    assert "Moved 5 archive(s)." in result.output
+    assert sorted(os.listdir(Experiment.BASE_DIR))[0] == ".artifacts"
+    assert not (Experiment.BASE_DIR / "2002").exists()
+    assert migrate(Experiment.BASE_DIR, layout) == []
+
+    monkeypatch.setattr(Experiment, "LAYOUT", layout)
+    experiment = Experiment(names[3])
+    experiment.load()
+    assert experiment.path == Experiment.BASE_DIR / layout.locate(names[3])
+    assert experiment.args == {"tag": names[3]}
+    loaded = Experiment.load_many(find_archives(Experiment.BASE_DIR))
+    assert sorted(experiment.name for experiment in loaded) == names
+
+    new_experiment = run_experiment("new", ["--tag", "new"], params=PARAMS)
+    assert new_experiment.path == Experiment.BASE_DIR / layout.locate("new")
+
+    migrate(Experiment.BASE_DIR, FlatLayout())
+    assert sorted(os.listdir(Experiment.BASE_DIR)) == [".artifacts", "2002", "new"]
@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+import click
+import pytest
+
+from dmlx.catalog import Catalog
+from dmlx.component import parse_locator
+from dmlx.experiment import Experiment
+from dmlx.layout import HashPrefixLayout, find_archives, migrate
+from dmlx.metafile import (
+    MAGIC,
+    encode_meta,
+    read_meta,
+    read_meta_header,
+)
+from dmlx.pack import pack
+
+
+def test_compact_meta(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Experiment, "COMPACT_META", True)
+    monkeypatch.setattr(Experiment, "CATALOG_FILE_PATH", "catalog.db")
+
+    experiment = Experiment("compact")
+
+    @experiment.main()
+    @click.option(
+        "--locator", default="model?" + ";".join(f"p{i}={i}" for i in range(99))
+    )
+    def main(**args) -> None:
+        experiment.init()
+
+    assert experiment.command is not None
+    experiment.command.main([], standalone_mode=False)
+
+    meta_path = experiment.path / "meta.bin"
+    assert not (experiment.path / "meta.json").exists()
+    data = meta_path.read_bytes()
+    assert data.startswith(MAGIC)
+    assert read_meta_header(meta_path) == (
+        "compact",
+        experiment.meta["birth_timestamp"],
+    )
+    assert read_meta(meta_path) == experiment.meta
+
+    loaded = Experiment("compact")
+    loaded.load()
+    assert loaded.args == experiment.args
+    assert parse_locator(str(loaded.args["locator"]))[1]["p98"] == 98
+
+    with Catalog(Experiment.BASE_DIR / "catalog.db") as catalog:
+        (entry,) = catalog.query(name="compact")
+        assert entry.meta == experiment.meta
+
+    json_path = tmp_path / "meta.json"
+    json_path.write_text(json.dumps(experiment.meta, indent=4))
+    assert read_meta(json_path) == experiment.meta
+    assert read_meta_header(json_path).name == "compact"
+
+    truncated_path = tmp_path / "truncated"
+    truncated_path.write_bytes(encode_meta(experiment.meta)[:-1])
+    with pytest.raises(ValueError):
+        read_meta(truncated_path)
+
+
+def test_compact_meta_json_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Experiment, "COMPACT_META", True)
+
+    experiment = Experiment("mismatch", meta_file_path="meta.json")
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+
+    assert experiment.command is not None
+    with pytest.raises(ValueError):
+        experiment.command.main([], standalone_mode=False)
+    assert not Experiment.BASE_DIR.exists()
+
+
+def test_compact_meta_detected(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    with monkeypatch.context() as context:
+        context.setattr(Experiment, "COMPACT_META", True)
+        experiment = Experiment("compact")
+
+        @experiment.main()
+        @click.option("--seed", type=int, default=7)
+        def main(**args) -> None:
+            experiment.init()
+
+        assert experiment.command is not None
+        experiment.command.main([], standalone_mode=False)
+    assert (experiment.path / "meta.bin").is_file()
+
+    # Compact meta is detected without `COMPACT_META` set.
+    loaded = Experiment("compact")
+    loaded.load()
+    assert loaded.args == {"seed": 7}
+    assert loaded.meta_file_path == Path("meta.bin")
+    base_dir = Experiment.BASE_DIR
+    assert list(find_archives(base_dir)) == [experiment.path]
+    (loaded,) = Experiment.load_many([experiment.path])
+    assert loaded.meta == experiment.meta
+    with Catalog(tmp_path / "catalog.db") as catalog:
+        assert catalog.scan(base_dir) == 1
+        (entry,) = catalog.query(name="compact")
+        assert entry.meta == experiment.meta
+
+    (_, target), *_ = migrate(base_dir, HashPrefixLayout())
+    assert (target / "meta.bin").is_file()
+    monkeypatch.setattr(Experiment, "LAYOUT", HashPrefixLayout())
+    assert sum(map(len, pack(base_dir).values())) == 1
+    loaded = Experiment("compact")
+    loaded.load()
+    assert loaded.packed_archive is not None
+    assert loaded.args == {"seed": 7}
@@ -0,0 +1,106 @@
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+import dmlx
+from dmlx.experiment import Experiment
+from dmlx.metrics import MetricsWriter, read_metrics
+
+numpy = pytest.importorskip("numpy")
+
+
+def test_metrics_writer(tmp_path: Path) -> None:
+    path = tmp_path / "train.metrics"
+
+    with MetricsWriter(path, flush_rows=4, flush_interval=3600) as writer:
+        for step in range(10):
+            writer.write(step, loss=1.0 / (step + 1), accuracy=step / 10)
+            if step == 4:
+                assert len(read_metrics(path)["step"]) == 4
+        assert writer.columns == ["loss", "accuracy"]
+        writer.write(10, loss=0.0)
+        with pytest.raises(ValueError):
+            writer.write(11, blah=0.0)
+
+    with pytest.raises(RuntimeError):
+        writer.write(12, loss=0.0)
+
+    with MetricsWriter(path) as writer:
+        assert writer.columns == ["loss", "accuracy"]
+        writer.write(11, accuracy=1.0)
+    with pytest.raises(ValueError):
+        MetricsWriter(path, ["accuracy"])
+
+    with path.open("ab") as file:
+        file.write(b"torn")
+    # The torn row is truncated before appending.
+    with MetricsWriter(path) as writer:
+        writer.write(12, loss=0.5)
+    with path.open("ab") as file:
+        file.write(b"torn")
+
+    metrics = read_metrics(path)
+    assert list(metrics) == ["step", "loss", "accuracy"]
+    assert metrics["step"].tolist() == list(range(13))
+    assert metrics["loss"][12] == 0.5
+    assert metrics["loss"][:10].tolist() == [1.0 / (step + 1) for step in range(10)]
+    assert math.isnan(metrics["loss"][11])
+    assert math.isnan(metrics["accuracy"][10])
+    assert metrics["accuracy"][11] == 1.0
+
+
+def test_metrics_writer_columns(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        MetricsWriter(tmp_path / "a.metrics", ["step"])
+
+    with MetricsWriter(tmp_path / "b.metrics", ["x"]):
+        pass
+    assert read_metrics(tmp_path / "b.metrics")["x"].tolist() == []
+
+    with MetricsWriter(tmp_path / "c.metrics"):
+        pass
+    assert not (tmp_path / "c.metrics").exists()
+
+
+def test_experiment_metrics(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment()
+
+    @experiment.main()
+    @click.option("--steps", type=int)
+    def main(**args) -> None:
+        experiment.init()
+        for step in range(args["steps"]):
+            experiment.metrics().write(step, loss=float(step))
+        assert experiment.metrics() is experiment.metrics()
+        experiment.metrics("eval", flush_interval=0).write(0, score=1.0)
+        assert experiment.read_metrics("eval")["score"].tolist() == [1.0]
+
+    assert experiment.command is not None
+    experiment.command.main(["--steps", "100"], standalone_mode=False)
+
+    metrics = experiment.read_metrics()
+    assert metrics["loss"].tolist() == [float(step) for step in range(100)]
+    assert (experiment.path / "metrics.metrics").is_file()
+
+
+def test_metrics_writer_flushed_at_exit(tmp_path: Path) -> None:
+    path = tmp_path / "train.metrics"
+    script = (
+        "import sys\n"
+        "from dmlx.metrics import MetricsWriter\n"
+        "writer = MetricsWriter(sys.argv[1], flush_interval=3600)\n"
+        "writer.write(0, loss=1.0)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script, str(path)],
+        env={**os.environ, "PYTHONPATH": str(Path(dmlx.__file__).parent.parent)},
+        check=True,
+    )
+    assert read_metrics(path)["loss"].tolist() == [1.0]
@@ -0,0 +1,202 @@
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from inspect import cleandoc
+from pathlib import Path
+from typing import Any
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import dmlx
+from dmlx.__main__ import cli
+from dmlx.experiment import Experiment
+from dmlx.journal import Journal
+from dmlx.pack import PackedArchive, find_packed_archive, pack
+
+PARAMS = (click.option("--index", type=int),)
+
+# Pack experiments, but crash while writing files of the second one.
+CRASHING_PACK_SCRIPT = cleandoc(
+    """
+    import os
+    from zipfile import ZipFile
+
+    from dmlx.pack import pack
+
+    write = ZipFile.write
+    write_count = 0
+
+
+    def write_and_crash(self, *args, **kwargs):
+        global write_count
+        write(self, *args, **kwargs)
+        write_count += 1
+        if write_count == 6:
+            os._exit(17)
+
+
+    ZipFile.write = write_and_crash
+    pack("experiments", period_format="%Y")
+    """
+)
+
+
+def write_outputs(experiment: Experiment, args: dict[str, Any]) -> None:
+    numpy = pytest.importorskip("numpy")
+    index = args["index"]
+    for step in range(10):
+        experiment.metrics().write(step, loss=step * index)
+    experiment.save_array("weights", numpy.arange(12.0).reshape(3, 4) * index)
+    (experiment.path / "notes").mkdir()
+    (experiment.path / "notes" / "summary.txt").write_text(f"run {index}")
+
+
+def test_pack(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    experiments = [
+        run_experiment(
+            cli_args=["--index", str(index)], params=PARAMS, body=write_outputs
+        )
+        for index in range(3)
+    ]
+    # The last experiment looks unfinished.
+    Journal(experiments[2].journal.path).record("started")
+    base_dir = Experiment.BASE_DIR
+    pack_name = experiments[0].birth.strftime("%Y-%m") + ".zip"
+
+    assert pack(base_dir, min_age=3600) == {}
+    names = [experiment.name for experiment in experiments[:2]]
+    planned = pack(base_dir, dry_run=True)
+    assert {key: sorted(value) for key, value in planned.items()} == {
+        pack_name: sorted(names)
+    }
+    assert all(experiment.path.exists() for experiment in experiments)
+
+    packed = pack(base_dir)
+    assert {key: sorted(value) for key, value in packed.items()} == {
+        pack_name: sorted(names)
+    }
+    assert not experiments[0].path.exists() and not experiments[1].path.exists()
+    assert experiments[2].path.exists()
+    assert find_packed_archive(base_dir / ".packs", experiments[2].name) is None
+    # Packing again is a no-op.
+    assert pack(base_dir) == {}
+
+    archive = find_packed_archive(base_dir / ".packs", names[1])
+    assert isinstance(archive, PackedArchive)
+    assert archive.pack_path == base_dir / ".packs" / pack_name
+    assert sorted(archive.list()) == [
+        "journal.jsonl",
+        "meta.json",
+        "metrics.metrics",
+        "notes/summary.txt",
+        "weights.npy",
+    ]
+    assert archive.exists("notes/summary.txt") and not archive.exists("missing")
+    with pytest.raises(FileNotFoundError):
+        archive.open("missing")
+
+    for index, name in enumerate(names):
+        loaded = Experiment(name)
+        loaded.load()
+        assert loaded.packed_archive is not None
+        assert loaded.args == {"index": index}
+        assert loaded.state is not None and loaded.state["status"] == "finished"
+        metrics = loaded.read_metrics()
+        assert metrics["step"].tolist() == list(range(10))
+        assert metrics["loss"].tolist() == [step * index for step in range(10)]
+        weights = loaded.open_array("weights")
+        assert isinstance(weights, numpy.memmap)
+        assert weights[2].tolist() == [(8.0 + i) * index for i in range(4)]
+        with loaded.open_file("notes/summary.txt") as file:
+            file.seek(4)
+            assert file.read() == str(index).encode()
+
+    unpacked = Experiment(experiments[2].name)
+    unpacked.load()
+    assert unpacked.packed_archive is None
+    assert unpacked.open_array("weights")[2].tolist() == [16.0, 18.0, 20.0, 22.0]
+
+
+def test_pack_command(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    experiment = run_experiment(
+        cli_args=["--index", "1"], params=PARAMS, body=write_outputs
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["pack", "experiments", "-p", "%Y", "-n"])
+    assert result.exit_code == 0, result.output
+    pack_name = experiment.birth.strftime("%Y") + ".zip"
+    assert f"{experiment.name} -> {pack_name}" in result.output
+    assert "Planned 1 archive(s)." in result.output
+
+    result = runner.invoke(cli, ["pack", "experiments", "-p", "%Y"])
+    assert result.exit_code == 0, result.output
+    assert "Packed 1 archive(s)." in result.output
+    assert not experiment.path.exists()
+
+    loaded = Experiment(experiment.name)
+    loaded.load()
+    assert loaded.args == {"index": 1}
+
+
+def test_pack_interrupted(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    base_dir = Experiment.BASE_DIR
+    old_names = [
+        run_experiment(
+            cli_args=["--index", str(index)], params=PARAMS, body=write_outputs
+        ).name
+        for index in range(2)
+    ]
+    pack(base_dir, period_format="%Y")
+    new_names = [
+        run_experiment(
+            cli_args=["--index", str(index)], params=PARAMS, body=write_outputs
+        ).name
+        for index in range(2, 4)
+    ]
+
+    result = subprocess.run(
+        [sys.executable, "-c", CRASHING_PACK_SCRIPT],
+        env={**os.environ, "PYTHONPATH": str(Path(dmlx.__file__).parent.parent)},
+    )
+    assert result.returncode == 17
+    # Packed experiments are intact and the others are not removed.
+    for index, name in enumerate(old_names):
+        loaded = Experiment(name)
+        loaded.load()
+        assert loaded.packed_archive is not None
+        assert loaded.args == {"index": index}
+    for name in new_names:
+        assert Experiment(name).path.exists()
+
+    packed = pack(base_dir, period_format="%Y")
+    assert sorted(*packed.values()) == sorted(new_names)
+    for index, name in enumerate(old_names + new_names):
+        loaded = Experiment(name)
+        loaded.load()
+        assert loaded.packed_archive is not None
+        assert loaded.args == {"index": index}
+        assert loaded.open_array("weights")[1].tolist() == [
+            (4.0 + i) * index for i in range(4)
+        ]
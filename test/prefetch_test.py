@@ -0,0 +1,79 @@
+import threading
+from collections.abc import Callable, Iterator
+
+import pytest
+
+from dmlx.component import Component
+from dmlx.prefetch import Prefetcher
+
+
+def test_prefetcher() -> None:
+    prefetcher = Prefetcher(range(10), 3)
+    assert list(prefetcher) == list(range(10))
+    assert list(prefetcher) == list(range(10))
+    assert len(prefetcher) == 10
+    assert prefetcher.start == 0
+
+    batched = Prefetcher(range(7), batch_size=3)
+    assert list(batched) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert len(batched) == 3
+    dropped = Prefetcher(range(7), batch_size=3, collate=sum, drop_last=True)
+    assert list(dropped) == [3, 12]
+    assert len(dropped) == 2
+
+    with pytest.raises(ValueError):
+        Prefetcher([], 0)
+
+
+class Source:
+    def __init__(self, generator_function: Callable[[], Iterator[int]]) -> None:
+        self.generator_function = generator_function
+
+    def __iter__(self) -> Iterator[int]:
+        return self.generator_function()
+
+
+def test_prefetcher_background() -> None:
+    produced: list[int] = []
+    ready = threading.Event()
+
+    def produce() -> Iterator[int]:
+        for item in range(100):
+            produced.append(item)
+            if len(produced) == 4:
+                ready.set()
+            yield item
+
+    iterator = iter(Prefetcher(Source(produce), 2))
+    assert next(iterator) == 0
+    # Items are produced ahead while the consumer is idle.
+    assert ready.wait(5)
+    iterator.close()
+    assert len(produced) < 100
+
+    def fail() -> Iterator[int]:
+        yield 1
+        raise KeyError("Failed on purpose.")
+
+    iterator = iter(Prefetcher(Source(fail)))
+    assert next(iterator) == 1
+    with pytest.raises(KeyError, match="Failed on purpose."):
+        next(iterator)
+
+
+def test_prefetching_component(test_module: None) -> None:
+    dataset_component = Component(
+        "test_module.dataset", postprocessor=lambda dataset: dataset(5)
+    )
+    dataset = dataset_component("blah:BlahDataset?offset=1;@prefetch=2;@batch_size=2")
+    assert isinstance(dataset, Prefetcher)
+    assert list(dataset) == [[1.0, 2.0], [3.0, 4.0], [5.0]]
+    assert dataset_component("blah:BlahDataset?offset=1") == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    prefetched_component = Component(
+        "test_module.dataset", postprocessor=lambda dataset: dataset(3), prefetch=4
+    )
+    dataset = prefetched_component("blah:BlahDataset")
+    assert isinstance(dataset, Prefetcher) and dataset.buffer_size == 4
+    assert list(dataset) == [0.0, 1.0, 2.0]
+    assert prefetched_component("blah:BlahDataset?@prefetch=0") == [0.0, 1.0, 2.0]
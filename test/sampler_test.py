@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+from time import sleep
+
+import pytest
+
+from dmlx.experiment import Experiment
+from dmlx.sampler import PROC_DIR, ResourceSampler, read_resource_usage
+
+pytestmark = pytest.mark.skipif(
+    not (PROC_DIR / "stat").exists(), reason="`/proc/self` is unavailable."
+)
+
+
+def test_read_resource_usage() -> None:
+    usage = read_resource_usage()
+    assert usage["cpu_time"] > 0
+    assert usage["rss"] > 0
+    assert usage["threads"] >= 1
+
+
+def test_resource_sampler(tmp_path: Path) -> None:
+    path = tmp_path / "pending" / "resources.metrics"
+    sampler = ResourceSampler(path, 0.01, flush_interval=0)
+    with pytest.raises(RuntimeError):
+        sampler.stop()
+    sampler.start()
+    with pytest.raises(RuntimeError):
+        sampler.start()
+    sleep(0.05)
+    assert not path.exists()  # kept in memory until the directory exists
+    path.parent.mkdir()
+    data = bytearray(32 << 20)
+    sleep(0.05)
+    summary = sampler.stop()
+    del data
+
+    assert summary["samples"] >= 4
+    assert summary["rss_peak"] >= summary["rss_mean"] > 0
+    assert summary["threads_peak"] >= 2
+    assert summary["duration"] >= 0.1
+
+    numpy = pytest.importorskip("numpy")
+    from dmlx.metrics import read_metrics
+
+    samples = read_metrics(path)
+    assert len(samples["step"]) == summary["samples"]
+    assert numpy.all(numpy.diff(samples["time"]) > 0)
+    assert samples["rss"].max() == summary["rss_peak"]
+
+
+def test_experiment_resource_sampling(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment(resource_sampling_interval=0.01)
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+        sleep(0.05)
+
+    experiment.run([], standalone_mode=False)
+
+    meta = json.loads((experiment.path / "meta.json").read_text())
+    assert meta["resources"]["samples"] >= 2
+    assert (experiment.path / "resources.metrics").is_file()
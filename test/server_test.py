@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from inspect import cleandoc
+from pathlib import Path
+from time import monotonic, sleep
+
+import pytest
+
+from dmlx.server import call
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="`os.fork()` is unavailable."
+)
+
+SCRIPT = cleandoc(
+    """
+    import sys
+
+    import click
+
+    from dmlx.experiment import Experiment
+
+    experiment = Experiment()
+
+
+    @experiment.main()
+    @click.argument("tag")
+    @click.option("--exit-code", type=int, default=0)
+    def main(**args) -> None:
+        experiment.init()
+        print("running", args["tag"], experiment.name)
+        print("warning", file=sys.stderr)
+        if args["exit_code"]:
+            raise SystemExit(args["exit_code"])
+
+
+    experiment.run()
+    """
+)
+
+
+def test_server(tmp_path: Path) -> None:
+    script_path = tmp_path / "evaluate.py"
+    script_path.write_text(SCRIPT)
+    socket_path = tmp_path / "dmlx.sock"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "dmlx", "serve", str(script_path)]
+        + ["-s", str(socket_path), "-p", "click"],
+        stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = monotonic() + 30
+        while not socket_path.exists():
+            assert server.poll() is None and monotonic() < deadline
+            sleep(0.01)
+
+        names = []
+        for index in range(3):
+            stdout = io.BytesIO()
+            stderr = io.BytesIO()
+            exit_code = call(
+                socket_path,
+                [f"run{index}", "--exit-code", str(index)],
+                cwd=tmp_path,
+                stdout=stdout,
+                stderr=stderr,
+            )
+            assert exit_code == index
+            words = stdout.getvalue().decode().split()
+            assert words[:2] == ["running", f"run{index}"]
+            names.append(words[2])
+            assert stderr.getvalue() == b"warning\n"
+
+        assert len(set(names)) == 3
+        for index, name in enumerate(names):
+            meta_path = tmp_path / "experiments" / name / "meta.json"
+            assert json.loads(meta_path.read_text())["orig_argv"][1:] == [
+                str(script_path.resolve()),
+                f"run{index}",
+                "--exit-code",
+                str(index),
+            ]
+    finally:
+        server.terminate()
+        server.wait(10)
+    assert not socket_path.exists()
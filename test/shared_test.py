@@ -0,0 +1,65 @@
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from dmlx import shared
+from dmlx.property import component
+
+numpy = pytest.importorskip("numpy")
+
+
+class Evaluator:
+    weights_locator = "numpy:full?shape=1000;fill_value=0.5"
+    weights = component("weights_locator")
+
+
+@pytest.fixture()
+def registry() -> Iterator[None]:
+    yield
+    shared.release()
+
+
+def _inspect_weights() -> tuple[float, bool, bool]:
+    weights = Evaluator().weights
+    return float(weights.sum()), weights.flags.writeable, weights.flags.owndata
+
+
+def test_publish_and_attach(registry: None) -> None:
+    value = {"array": numpy.arange(10), "matrix": numpy.eye(3), "tag": "x"}
+    handle = shared.publish(value)
+    assert handle.segment is not None and len(handle.buffers) == 2
+    assert all(offset % shared.ALIGNMENT == 0 for offset, _ in handle.buffers)
+    attached = shared.attach(handle)
+    assert attached["tag"] == "x"
+    assert numpy.array_equal(attached["array"], value["array"])
+    assert numpy.array_equal(attached["matrix"], value["matrix"])
+    assert not attached["array"].flags.writeable
+
+    assert shared.publish([1, 2]).segment is None
+    assert shared.lookup("missing") is shared.MISSING
+    shared.share("key", value)
+    assert shared.lookup("key") is shared.lookup("key")
+
+
+def test_shared_component(registry: None) -> None:
+    evaluator = Evaluator()
+    assert evaluator.weights.flags.owndata
+    Evaluator.weights.share(evaluator)
+    # The cached component is replaced by the shared one.
+    assert not evaluator.weights.flags.owndata
+    assert not evaluator.weights.flags.writeable
+    assert Evaluator().weights is evaluator.weights
+
+    for method in ("fork", "spawn"):
+        with ProcessPoolExecutor(
+            2,
+            multiprocessing.get_context(method),
+            initializer=shared.install,
+            initargs=(shared.snapshot(),),
+        ) as executor:
+            futures = [executor.submit(_inspect_weights) for _ in range(2)]
+            assert [future.result() for future in futures] == [
+                (500.0, False, False)
+            ] * 2
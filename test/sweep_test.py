@@ -0,0 +1,136 @@
+import json
+import sys
+from inspect import cleandoc
+from pathlib import Path
+
+import pytest
+
+from dmlx.sweep import expand_grid, load_arg_sets, sweep
+
+SCRIPT = cleandoc(
+    """
+    import os
+    import signal
+
+    import click
+
+    from dmlx.experiment import Experiment
+
+    experiment = Experiment()
+
+
+    @experiment.main()
+    @click.argument("model_locator")
+    @click.option("--epochs", type=int)
+    @click.option("--fail", is_flag=True)
+    @click.option("--crash", is_flag=True)
+    def main(**args) -> None:
+        experiment.init()
+        if args["fail"]:
+            raise RuntimeError("Failed on purpose.")
+        if args["crash"]:
+            os.kill(os.getpid(), signal.SIGKILL)
+
+
+    experiment.run()
+    """
+)
+
+
+def test_expand_grid() -> None:
+    assert expand_grid(
+        {"--epochs": [1, 2], "model_locator": ["foo?x=1"], "--flag": [True, False]}
+    ) == [
+        ["foo?x=1", "--epochs", "1", "--flag"],
+        ["foo?x=1", "--epochs", "1"],
+        ["foo?x=1", "--epochs", "2", "--flag"],
+        ["foo?x=1", "--epochs", "2"],
+    ]
+    assert load_arg_sets(['{"-e": [3]}'], ["'bar?y = 2' -e 4"]) == [
+        ["-e", "3"],
+        ["bar?y = 2", "-e", "4"],
+    ]
+
+
+def test_sweep(tmp_path: Path) -> None:
+    script_path = tmp_path / "train.py"
+    script_path.write_text(SCRIPT)
+    base_dir = tmp_path / "experiments"
+    summary_path = tmp_path / "sweep.json"
+
+    arg_sets = expand_grid({"model_locator": ["foo", "bar"], "--epochs": [1, 2, 3]})
+    arg_sets.append(["foo", "--fail"])
+    summary = sweep(
+        script_path,
+        arg_sets,
+        max_workers=2,
+        base_dir=base_dir,
+        summary_path=summary_path,
+    )
+
+    assert json.loads(summary_path.read_text()) == summary
+    runs = summary["runs"]
+    assert [run["argv"] for run in runs] == arg_sets
+    assert [run["status"] for run in runs] == ["succeeded"] * 6 + ["failed"]
+    assert runs[-1]["exit_code"] == 1
+    assert "Failed on purpose." in str(runs[-1]["error"])
+
+    experiment_paths = [Path(run["experiments"][0]) for run in runs]
+    assert len(set(experiment_paths)) == len(runs)
+    for run, experiment_path in zip(runs, experiment_paths):
+        assert experiment_path.is_relative_to(base_dir)
+        meta = json.loads((experiment_path / "meta.json").read_text())
+        assert meta["orig_argv"] == [sys.executable, str(script_path), *run["argv"]]
+        assert meta["args"]["model_locator"] == run["argv"][0]
+
+
+def test_sweep_broken_pool(tmp_path: Path) -> None:
+    script_path = tmp_path / "train.py"
+    script_path.write_text(SCRIPT)
+    summary_path = tmp_path / "sweep.json"
+
+    arg_sets = [["foo", "--crash"], ["bar"]]
+    summary = sweep(
+        script_path,
+        arg_sets,
+        max_workers=1,
+        base_dir=tmp_path / "experiments",
+        summary_path=summary_path,
+    )
+
+    assert json.loads(summary_path.read_text()) == summary
+    runs = summary["runs"]
+    assert [run["argv"] for run in runs] == arg_sets
+    # The pool breaks when the worker is killed, failing the pending run too.
+    assert [run["status"] for run in runs] == ["failed", "failed"]
+    assert all("BrokenProcessPool" in str(run["error"]) for run in runs)
+
+
+EXTENSION_SCRIPT = cleandoc(
+    """
+    import sys
+    import warnings
+
+    warnings.simplefilter("error")
+    import numpy
+
+    import helper
+
+    helper.imports.append(sys.argv[1])
+    if helper.imports != [sys.argv[1]]:
+        raise RuntimeError("The local module was not purged.")
+    """
+)
+
+
+def test_sweep_keeps_extension_modules(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    script_path = tmp_path / "train.py"
+    script_path.write_text(EXTENSION_SCRIPT)
+    (tmp_path / "helper.py").write_text("imports = []\n")
+
+    arg_sets = [[str(index)] for index in range(3)]
+    summary = sweep(script_path, arg_sets, max_workers=1)
+    # Reimporting numpy would warn (and fail) in later runs in the worker.
+    assert [run["error"] for run in summary["runs"]] == [None] * 3
+    assert len({run["pid"] for run in summary["runs"]}) == 1
@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+import pytest
+
+from dmlx.experiment import Experiment
+from dmlx.table import EncodedColumn, build_table, encode_column, flatten
+
+PARAMS = (
+    click.argument("model_locator"),
+    click.option("--lr", type=float),
+    click.option("--seed", type=int),
+)
+
+
+def write_metrics(experiment: Experiment, args: dict[str, Any]) -> None:
+    with experiment.metrics(columns=["loss", "accuracy"]) as metrics:
+        for step in range(3):
+            metrics.write(step, loss=args["lr"] * (3 - step))
+        metrics.write(3, accuracy=0.5 + args["seed"])
+
+
+def test_flatten_and_encode() -> None:
+    assert flatten({"a": 1, "b": {"c": "x", "d": {"e": [1]}}}) == {
+        "a": 1,
+        "b.c": "x",
+        "b.d.e": [1],
+    }
+    numpy = pytest.importorskip("numpy")
+    assert encode_column([True, False]).dtype == numpy.bool_
+    numbers = encode_column([1, None, 2.5])
+    assert isinstance(numbers, numpy.ndarray)
+    assert numpy.isnan(numbers[1]) and numbers[2] == 2.5
+    strings = encode_column(["a", None, "b", "a", [1]])
+    assert isinstance(strings, EncodedColumn)
+    assert strings.codes.tolist() == [0, -1, 1, 0, 2]
+    assert strings.categories == ["a", "b", "[1]"]
+    assert strings.decode().tolist() == ["a", None, "b", "a", "[1]"]
+
+
+def test_build_table(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    run_experiment: Callable[..., Experiment],
+) -> None:
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    for index in range(6):
+        with monkeypatch.context() as context:
+            # Meta files in either format are read.
+            context.setattr(Experiment, "COMPACT_META", index == 5)
+            run_experiment(
+                f"runs/{index}",
+                [f"model{index % 2}", "--lr", str(index / 10), "--seed", str(index)],
+                params=PARAMS,
+                body=write_metrics,
+            )
+    assert (Experiment.BASE_DIR / "runs" / "5" / "meta.bin").is_file()
+    (Experiment.BASE_DIR / "runs" / "broken").mkdir()
+
+    errors: list[Path] = []
+    cache_path = tmp_path / "table.cache"
+    table = build_table(
+        "runs/*",
+        metric_stats=("last", "min"),
+        cache_path=cache_path,
+        max_workers=3,
+        on_error=lambda path, error: errors.append(path),
+    )
+    assert [path.name for path in errors] == ["broken"]
+    assert len(table) == 6
+    order = numpy.argsort(table["args.seed"])
+    assert table["args.seed"][order].tolist() == list(range(6))
+    model_locators = table["args.model_locator"]
+    assert isinstance(model_locators, EncodedColumn)
+    assert sorted(model_locators.categories) == ["model0", "model1"]
+    assert numpy.allclose(
+        table["metrics.metrics.loss.last"][order], numpy.arange(6) / 10
+    )
+    assert numpy.allclose(
+        table["metrics.metrics.accuracy.min"][order], numpy.arange(6) + 0.5
+    )
+    assert table["metrics.metrics.step.last"].tolist() == [3.0] * 6
+
+    monkeypatch.setattr(
+        "dmlx.table.read_row", lambda *args, **kwargs: pytest.fail("Cache missed!")
+    )
+    cached_table = build_table(
+        "runs/*", metric_stats=("last", "min"), cache_path=cache_path
+    )
+    assert cached_table["args.seed"].tolist() == table["args.seed"].tolist()
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    experiment = Experiment("runs/2")
+    experiment.load()
+    metrics_path = experiment.path / "metrics.metrics"
+    with open(metrics_path, "ab") as file:
+        file.write(numpy.array([(9, 0.0, 1.0)], "<i8,<f8,<f8").tobytes())
+    updated_table = build_table(
+        "runs/*", metric_stats=("last", "min"), cache_path=cache_path
+    )
+    index = updated_table.paths.index(experiment.path)
+    assert updated_table["metrics.metrics.loss.last"][index] == 0.0
+
+    with pytest.raises(ValueError):
+        build_table("runs/*", metric_stats=("median",))
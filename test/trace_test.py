@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import click
+import pytest
+
+from dmlx.experiment import Experiment
+from dmlx.property import component
+from dmlx.trace import NULL_SPAN, Tracer
+
+
+def test_tracer(tmp_path: Path) -> None:
+    tracer = Tracer()
+    assert tracer.span("disabled") is NULL_SPAN
+    with tracer.span("disabled"):
+        pass
+    assert tracer.spans == []
+
+    tracer.enabled = True
+    for _ in range(3):
+        with tracer.span("step", index=0):
+            pass
+    tracer.record("manual", 0, 2_000_000_000)
+    summary = tracer.summarize()
+    assert summary["step"]["count"] == 3
+    assert summary["manual"] == {"count": 1, "total": 2.0, "max": 2.0}
+
+    tracer.export(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert [event["name"] for event in trace["traceEvents"]] == ["step"] * 3 + [
+        "manual"
+    ]
+    assert trace["traceEvents"][0]["ph"] == "X"
+    assert trace["traceEvents"][0]["args"] == {"index": 0}
+
+
+def test_experiment_tracing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, test_module: None
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment(tracing=True)
+
+    class Approach:
+        model = component("model_locator", "test_module.model", "Model")
+
+        def __init__(self, model_locator: str) -> None:
+            self.model_locator = model_locator
+
+    @experiment.before_main()
+    def before_main(**args) -> None:
+        pass
+
+    @experiment.main()
+    @click.option("--model")
+    def main(**args) -> None:
+        experiment.init()
+        with experiment.span("train", epochs=1):
+            Approach(args["model"]).model
+
+    experiment.run(["--model", "bar"], standalone_mode=False)
+
+    trace = json.loads((experiment.path / "trace.json").read_text())
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert names == [
+        "parse_args",
+        "hook_before_main",
+        "init",
+        "component",
+        "train",
+        "main",
+    ]
+    assert trace["traceEvents"][3]["args"] == {"property": "model", "locator": "bar"}
+
+    meta = json.loads((experiment.path / "meta.json").read_text())
+    assert list(meta["spans"]) == names
+    assert meta["spans"]["main"]["count"] == 1
+
+
+def test_experiment_tracing_disabled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment()
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+
+    experiment.run([], standalone_mode=False)
+    assert not (experiment.path / "trace.json").exists()
+    assert "spans" not in json.loads((experiment.path / "meta.json").read_text())
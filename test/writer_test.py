@@ -0,0 +1,121 @@
+import os
+import stat
+from pathlib import Path
+from threading import Event, Thread
+from typing import BinaryIO
+
+import pytest
+
+from dmlx.experiment import Experiment
+from dmlx.writer import BackgroundWriter, get_umask, write_atomically
+
+
+def test_write_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoints" / "model.bin"
+    write_atomically(path, b"first")
+    assert path.read_bytes() == b"first"
+
+    def failing_snapshot(file: BinaryIO) -> None:
+        file.write(b"partial")
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        write_atomically(path, failing_snapshot)
+    assert path.read_bytes() == b"first"
+    assert list(path.parent.iterdir()) == [path]
+
+    umask = os.umask(0o027)
+    try:
+        get_umask.cache_clear()
+        write_atomically(path, b"second")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    finally:
+        os.umask(umask)
+        get_umask.cache_clear()
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/status").exists(), reason="requires /proc/self/status"
+)
+def test_get_umask_without_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    umask = os.umask(0o027)
+    try:
+        get_umask.cache_clear()
+        with monkeypatch.context() as context:
+            # Setting the umask would race with threads creating files.
+            context.setattr(os, "umask", lambda mask: pytest.fail("umask set"))
+            assert get_umask() == 0o027
+    finally:
+        os.umask(umask)
+        get_umask.cache_clear()
+
+
+def test_background_writer(tmp_path: Path) -> None:
+    release = Event()
+
+    def blocking_snapshot(file: BinaryIO) -> None:
+        release.wait()
+        file.write(b"0")
+
+    with BackgroundWriter(max_pending=2) as writer:
+        writer.submit(tmp_path / "0.bin", blocking_snapshot)
+        buffer = bytearray(b"1")
+        writer.submit(tmp_path / "1.bin", buffer)  # queued while 0 is written
+        buffer[:] = b"x"  # buffers are copied on submission
+        submitted = Event()
+
+        def submit() -> None:
+            writer.submit(tmp_path / "2.bin", b"2")
+            submitted.set()
+
+        thread = Thread(target=submit)
+        thread.start()
+        assert not submitted.wait(0.1)  # blocked while 2 snapshots are pending
+        assert not (tmp_path / "0.bin").exists()
+        release.set()
+        thread.join()
+    assert [(tmp_path / f"{i}.bin").read_bytes() for i in range(3)] == [
+        b"0",
+        b"1",
+        b"2",
+    ]
+
+    with pytest.raises(RuntimeError):
+        writer.submit(tmp_path / "3.bin", b"3")
+    with pytest.raises(ValueError):
+        BackgroundWriter(0)
+
+
+def test_background_writer_error(tmp_path: Path) -> None:
+    def failing_snapshot(file: BinaryIO) -> None:
+        raise OSError("Disk full.")
+
+    writer = BackgroundWriter()
+    writer.submit(tmp_path / "a.bin", failing_snapshot)
+    with pytest.raises(OSError, match="Disk full."):
+        writer.flush()
+    writer.submit(tmp_path / "b.bin", b"b")
+    writer.close()
+    assert (tmp_path / "b.bin").read_bytes() == b"b"
+
+
+def test_experiment_write_async(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    experiment = Experiment()
+
+    @experiment.main()
+    def main(**args) -> None:
+        experiment.init()
+        for epoch in range(5):
+            experiment.write_async(f"checkpoints/{epoch}.bin", bytes([epoch]))
+        raise ValueError("Training diverged.")
+
+    assert experiment.command is not None
+    with pytest.raises(ValueError):
+        experiment.command.main([], standalone_mode=False)
+    for epoch in range(5):
+        path = experiment.path / "checkpoints" / f"{epoch}.bin"
+        assert path.read_bytes() == bytes([epoch])